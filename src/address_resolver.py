@@ -0,0 +1,188 @@
+"""
+Module for resolving address expressions in commands.
+
+This module defines the AddressResolver class, which evaluates the address arguments of commands like `bp`, `dis`,
+`rmem` and `wmem`. Besides plain hexadecimal numbers, an expression may contain registers (`rip`, `$rsp`) and
+symbol names (`main`), joined with `+` and `-`, e.g. `main+0x10` or `rsp-8`. Registers are taken from the registers
+of the current stop and symbols from the session's SymbolIndex, so the CoreMiner is only asked on a cache miss.
+"""
+
+import re
+from typing import Callable
+
+# Names of the registers dumped by the CoreMiner (the fields of user_regs_struct)
+REGISTER_NAMES = (
+    "r15", "r14", "r13", "r12", "rbp", "rbx", "r11", "r10", "r9", "r8", "rax", "rcx", "rdx", "rsi", "rdi",
+    "orig_rax", "rip", "cs", "eflags", "rsp", "ss", "fs_base", "gs_base", "ds", "es", "fs", "gs",
+)
+
+ADDRESS_MASK = 0xffffffffffffffff
+
+# Splits an expression into its terms, keeping the operators
+TERM_PATTERN = re.compile(r"([+-])")
+
+# Characters that end the name being completed
+NAME_DELIMITERS = re.compile(r"[\s+\-]")
+
+
+class UnresolvedName(Exception):
+    """
+    Raised when a name in an expression can not be resolved from the cached information.
+
+    This is not a ValueError on purpose, so argparse does not turn it into a usage error and the caller can fetch
+    the missing information and parse the command again.
+
+    Attributes:
+        kind (str): Either "register" or "symbol".
+        name (str): The name that could not be resolved.
+        fetch (bool): True if asking the CoreMiner may resolve the name, False if it is known to be unresolvable.
+    """
+
+    def __init__(self, kind: str, name: str, fetch: bool = True):
+        super().__init__(f"Unknown {kind}: {name}")
+        self.kind = kind
+        self.name = name
+        self.fetch = fetch
+
+
+class AddressResolver:
+    """
+    Evaluates address expressions from the cached registers and symbols.
+
+    Symbols the CoreMiner did not know are remembered as well, until the symbol index changes, so a misspelled
+    name does not cause a round trip every time.
+    """
+
+    def __init__(self, data_store, registers_fresh: Callable[[], bool]):
+        """
+        Initialize the AddressResolver.
+
+        Args:
+            data_store: The data store providing `get_register_values` and `get_symbols`.
+            registers_fresh (Callable[[], bool]): Returns True if the registers in the data store belong to the
+                current stop of the debuggee.
+        """
+        self.data_store = data_store
+        self.registers_fresh = registers_fresh
+        self._missing_symbols: set[str] = set()
+        self._missing_generation = 0
+
+    def evaluate(self, expression: str) -> int:
+        """
+        Evaluate an address expression.
+
+        Numbers are hexadecimal (with or without 0x) and take precedence over symbols with the same name.
+        Registers can be written with or without a leading `$`.
+
+        Args:
+            expression (str): The expression, e.g. "main+0x10", "rip+8" or "$rsp".
+
+        Returns:
+            int: The address.
+
+        Raises:
+            ValueError: If the expression is malformed.
+            UnresolvedName: If a register or symbol is not cached.
+        """
+        parts = TERM_PATTERN.split(expression.strip())
+        if parts[0] == "":
+            # A leading sign applies to the first term
+            parts[0] = "0"
+        value = self._term(parts[0])
+        for operator, term in zip(parts[1::2], parts[2::2]):
+            if operator == "+":
+                value += self._term(term)
+            else:
+                value -= self._term(term)
+        return value & ADDRESS_MASK
+
+    def _term(self, term: str) -> int:
+        if not term:
+            raise ValueError("Empty term in address expression")
+        try:
+            return int(term, 16)
+        except ValueError:
+            pass
+        if term.startswith("$"):
+            return self._register(term[1:])
+        if term in REGISTER_NAMES:
+            return self._register(term)
+        return self._symbol(term)
+
+    def _register(self, name: str) -> int:
+        registers = self.data_store.get_register_values()
+        if name in registers and self.registers_fresh():
+            return registers[name]
+        # Registers of an older stop are fetched again; a name missing from current registers does not exist
+        raise UnresolvedName("register", name, fetch=not self.registers_fresh())
+
+    def _symbol(self, name: str) -> int:
+        symbols = self.data_store.get_symbols()
+        address = symbols.address_of(name)
+        if address is not None:
+            return address
+        raise UnresolvedName("symbol", name, fetch=name not in self._missing())
+
+    def symbol_address(self, name: str) -> int:
+        """
+        Get the address of a symbol from the session's SymbolIndex.
+
+        Args:
+            name (str): The name of the symbol.
+
+        Returns:
+            int: The address.
+
+        Raises:
+            UnresolvedName: If the symbol is not cached.
+        """
+        return self._symbol(name)
+
+    def mark_missing(self, name: str) -> None:
+        """
+        Remember that the CoreMiner does not know a symbol.
+
+        Args:
+            name (str): The name of the symbol.
+        """
+        self._missing().add(name)
+
+    def _missing(self) -> set[str]:
+        # Any change of the symbol index may add a symbol that was missing before
+        generation = self.data_store.get_symbols().generation
+        if self._missing_generation != generation:
+            self._missing_symbols.clear()
+            self._missing_generation = generation
+        return self._missing_symbols
+
+    def complete(self, prefix: str) -> list[str]:
+        """
+        Get the known symbol and register names starting with a prefix.
+
+        A prefix starting with `$` is completed with register names only.
+
+        Args:
+            prefix (str): The beginning of the name.
+
+        Returns:
+            list[str]: The sorted candidates, registers with the `$` if it was given.
+        """
+        if prefix.startswith("$"):
+            return sorted(f"${name}" for name in REGISTER_NAMES if name.startswith(prefix[1:]))
+        candidates = self.data_store.get_symbols().complete(prefix)
+        if prefix:
+            candidates = sorted(candidates + [name for name in REGISTER_NAMES if name.startswith(prefix)])
+        return candidates
+
+
+def completion_prefix(text: str) -> str:
+    """
+    Get the name at the end of a command line that is being completed.
+
+    Args:
+        text (str): The command line, e.g. "bp main+ma".
+
+    Returns:
+        str: The name after the last space or operator, e.g. "ma".
+    """
+    return NAME_DELIMITERS.split(text)[-1]
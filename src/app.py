@@ -1,6 +1,8 @@
+import argparse
 from textual.app import App, ComposeResult, SystemCommand
 from textual.screen import Screen
 from typing import Iterable
+from coreminer_interface import PIPELINE_WINDOW, TRANSPORTS, TRANSPORT_ASYNCIO
 from views.help_menu import HelpMenu
 from views.main_view import MainView
 
@@ -12,20 +14,33 @@ class HardHat(App):
     It also extends the system command palette with a custom command to open the help screen.
 
     Methods:
+        __init__(transport: str, pipeline_window: int): Stores how to communicate with the CoreMiner.
         on_mount(): Called when the application is mounted to the screen; it pushes the main view.
         get_system_commands(screen: Screen) -> Iterable[SystemCommand]:
             Yields both default and custom system commands for the current screen.
         show_commands_help():
             Handler for the custom "Help Menue" command that opens the help screen.
     """
-    
+
+    def __init__(self, transport: str = TRANSPORT_ASYNCIO, pipeline_window: int = PIPELINE_WINDOW):
+        """
+        Initialize the application.
+
+        Args:
+            transport (str): The transport used to communicate with the CoreMiner ("asyncio" or "thread").
+            pipeline_window (int): The number of read-only commands that may be in flight at once.
+        """
+        super().__init__()
+        self.transport = transport
+        self.pipeline_window = pipeline_window
+
     def on_mount(self):
         """
         Called when the application is mounted.
 
         This method pushes the main view screen (MainView) onto the screen stack to initialize the user interface.
         """
-        self.push_screen(MainView())
+        self.push_screen(MainView(transport=self.transport, pipeline_window=self.pipeline_window))
 
     def get_system_commands(self, screen: Screen) -> Iterable[SystemCommand]:
         """
@@ -60,4 +75,15 @@ class HardHat(App):
         self.push_screen(HelpMenu())
 
 if __name__ == "__main__":
-    HardHat().run()
+    arg_parser = argparse.ArgumentParser(prog="HardHat")
+    arg_parser.add_argument(
+        "--transport", choices=TRANSPORTS, default=TRANSPORT_ASYNCIO,
+        help="how to communicate with the CoreMiner: event driven asyncio (default) or polling threads")
+    arg_parser.add_argument(
+        "--window", type=int, default=PIPELINE_WINDOW,
+        help=f"read-only commands (e.g. memory reads) in flight at once, 1 disables pipelining "
+             f"(default {PIPELINE_WINDOW})")
+    cli_args = arg_parser.parse_args()
+    if cli_args.window < 1:
+        arg_parser.error("--window must be at least 1")
+    HardHat(transport=cli_args.transport, pipeline_window=cli_args.window).run()
@@ -0,0 +1,212 @@
+"""
+Module for continuing the debuggee until a conditional breakpoint triggers.
+
+This module defines the AutoContinue class, which replaces a Continue command while conditional or hit-count
+breakpoints are set. After every stop it dumps the registers to find the breakpoint that was hit, evaluates its
+condition and reads the memory words the condition needs. If the breakpoint does not trigger, the debuggee is
+continued again right away: the feedback is handled quietly and neither the widgets nor the basic information are
+reloaded in between. Only the final stop is shown, together with the hit rate and the auto-continue throughput.
+"""
+
+import json
+import time
+from functools import partial
+
+from breakpoint_condition import ConditionalBreakpoint, MissingWord
+from feedback_decoder import Feedback, OkFeedback, RegistersFeedback, WordFeedback
+from memory_cache import WORD_MASK
+
+CONTINUE_COMMAND = json.dumps({"status": "Continue"})
+DUMP_REGISTERS_COMMAND = json.dumps({"status": "DumpRegisters"})
+
+# Seconds between two progress reports
+PROGRESS_INTERVAL = 1.0
+
+
+class AutoContinue:
+    """
+    Continues the debuggee until it stops anywhere but at a conditional breakpoint that does not trigger.
+
+    Attributes:
+        process: The CoreMinerProcess used to send the commands.
+        continues (int): The number of Continue commands sent.
+        words_read (int): The number of memory words read for conditions.
+        running (bool): True until the debuggee stays stopped.
+    """
+
+    def __init__(self, process):
+        """
+        Initialize the AutoContinue.
+
+        Args:
+            process: The CoreMinerProcess used to send the commands; the breakpoint table of its data store
+                holds the ConditionalBreakpoint objects.
+        """
+        self.process = process
+        self.continues = 0
+        self.words_read = 0
+        self.running = False
+        self._registers: dict[str, int] = {}
+        self._memory: dict[int, int] = {}
+        self._started_at = 0.0
+        self._reported_at = 0.0
+
+    def start(self) -> None:
+        """
+        Send the first Continue command.
+        """
+        self.running = True
+        self._started_at = self._reported_at = time.perf_counter()
+        self._send_continue()
+
+    def cancel(self) -> None:
+        """
+        Keep the debuggee stopped at the next stop.
+        """
+        self.running = False
+
+    def _send_continue(self) -> None:
+        self.continues += 1
+        self.process.command_scheduler.put_user(
+            CONTINUE_COMMAND, state_changing=True, on_feedback=self._on_continue, quiet=True,
+            on_dropped=partial(self._on_dropped, None))
+
+    def _on_continue(self, feedback: Feedback) -> bool:
+        """
+        Dump the registers after the debuggee stopped, to find out where it stopped.
+
+        Args:
+            feedback (Feedback): The feedback of the Continue command.
+
+        Returns:
+            bool: True if the debuggee stopped, False if the command failed.
+        """
+        if not isinstance(feedback, OkFeedback):
+            # An error or the exit of the debuggee is reported to the user
+            executed_successfull = self.process.feedback_parser.parse_feedback(feedback)
+            self._finish(None, reload_basic_info=executed_successfull)
+            return executed_successfull
+        # Memory and registers read for the user belong to the stop before
+        self.process.state_changed()
+        if not self.running:
+            self._finish(None, reload_basic_info=True, reason="cancelled")
+            return True
+        self.process.command_scheduler.put_user(
+            DUMP_REGISTERS_COMMAND, on_feedback=self._on_registers, quiet=True,
+            on_dropped=partial(self._on_dropped, None))
+        return True
+
+    def _on_registers(self, feedback: Feedback) -> bool:
+        """
+        Check the conditional breakpoint the debuggee stopped at, if any.
+
+        Args:
+            feedback (Feedback): The feedback of the DumpRegisters command.
+
+        Returns:
+            bool: True if the registers were dumped, False otherwise.
+        """
+        if not isinstance(feedback, RegistersFeedback):
+            executed_successfull = self.process.feedback_parser.parse_feedback(feedback)
+            self._finish(None, reload_basic_info=executed_successfull)
+            return executed_successfull
+        self._registers = feedback.registers
+        self._memory = {}
+        conditional = self.process.data_store.get_breakpoints().conditional_at(self._registers.get("rip"))
+        if conditional is None:
+            # An unconditional breakpoint or any other reason to stop
+            self._finish(None, reload_basic_info=True)
+            return True
+        conditional.reached += 1
+        self._check(conditional)
+        return True
+
+    def _check(self, conditional: ConditionalBreakpoint) -> None:
+        """
+        Evaluate the condition of a breakpoint and either stay stopped or continue.
+
+        Args:
+            conditional (ConditionalBreakpoint): The breakpoint the debuggee stopped at.
+        """
+        holds = True
+        if conditional.condition is not None:
+            try:
+                holds = conditional.condition.evaluate(self._registers, self._memory)
+            except MissingWord as e:
+                self.words_read += 1
+                self.process.command_scheduler.put_user(
+                    json.dumps({"status": {"ReadMem": e.address}}),
+                    on_feedback=partial(self._on_word, conditional, e.address), quiet=True,
+                    on_dropped=partial(self._on_dropped, conditional))
+                return
+            except ZeroDivisionError:
+                self._finish(conditional, reload_basic_info=True, reason="the condition divides by 0")
+                return
+
+        if holds:
+            conditional.hit_count += 1
+            if conditional.hit_count >= conditional.hits:
+                self._finish(conditional, reload_basic_info=True)
+                return
+        if not self.running:
+            self._finish(conditional, reload_basic_info=True, reason="cancelled")
+            return
+        now = time.perf_counter()
+        if now - self._reported_at >= PROGRESS_INTERVAL:
+            self._reported_at = now
+            self.process.data_store.set_output(f"[hh]: Auto-continuing, {self._rate_text()}")
+            self.process.request_update()
+        self._send_continue()
+
+    def _on_word(self, conditional: ConditionalBreakpoint, address: int, feedback: Feedback) -> bool:
+        """
+        Store a word read for a condition and evaluate the condition again.
+
+        Args:
+            conditional (ConditionalBreakpoint): The breakpoint the debuggee stopped at.
+            address (int): The address of the word.
+            feedback (Feedback): The feedback of the ReadMem command.
+
+        Returns:
+            bool: Always True; an unreadable word keeps the debuggee stopped.
+        """
+        if not isinstance(feedback, WordFeedback):
+            self.process.feedback_parser.parse_feedback(feedback)
+            self._finish(conditional, reload_basic_info=True, reason=f"the condition reads {address:#x}")
+            return True
+        self._memory[address] = feedback.word & WORD_MASK
+        self._check(conditional)
+        return True
+
+    def _on_dropped(self, conditional) -> None:
+        # The queued command was flushed, the debuggee stays stopped where it is
+        self._finish(conditional, reload_basic_info=True, reason="the next command was dropped")
+
+    def _rate_text(self) -> str:
+        elapsed = time.perf_counter() - self._started_at
+        rate = self.continues / elapsed if elapsed > 0 else 0.0
+        return f"{self.continues} continues in {elapsed:.3f}s ({rate:.0f} continues/s)"
+
+    def _finish(self, conditional, reload_basic_info: bool, reason: str = "") -> None:
+        """
+        Report where the debuggee stayed stopped and reload the basic information once.
+
+        Args:
+            conditional (Optional[ConditionalBreakpoint]): The conditional breakpoint it stopped at, if any.
+            reload_basic_info (bool): True if the debuggee is still alive and its state should be reloaded.
+            reason (str): Why the debuggee stayed stopped if the breakpoint did not trigger.
+        """
+        self.running = False
+        if conditional is None:
+            stop = reason or "stopped"
+        else:
+            description = conditional.describe()
+            stop = (f"{'stopped' if reason else 'triggered'} at {conditional.address:#x}"
+                    f"{f' ({description})' if description else ''}, "
+                    f"hit {conditional.hit_count} of {conditional.reached} times")
+            if reason:
+                stop += f", {reason}"
+        words = f", {self.words_read} words read" if self.words_read else ""
+        self.process.data_store.set_output(f"[hh]: Continue {stop}; {self._rate_text()}{words}")
+        if reload_basic_info:
+            self.process.reload_basic_info()
@@ -0,0 +1,136 @@
+"""
+Module for setting and deleting many breakpoints at once.
+
+This module defines the BreakpointBatch class, which queues the SetBreakpoint or DelBreakpoint commands for a
+list of addresses in one go. The CoreMiner answers them back to back; the feedback is handled quietly and the
+breakpoint table is updated as the answers arrive, but the widgets are refreshed only once, after the last answer.
+"""
+
+import json
+import time
+from functools import partial
+from typing import Callable
+
+from feedback_decoder import ErrorFeedback, Feedback, OkFeedback
+
+
+class BreakpointBatch:
+    """
+    Sends one breakpoint command for every address of a list and reports the result once all are answered.
+
+    Attributes:
+        process: The CoreMinerProcess used to send the commands.
+        keyword (str): Either "SetBreakpoint" or "DelBreakpoint".
+        addresses (list[int]): The addresses to send the command for.
+        description (str): What the batch does, e.g. "Set" or "Disabled", used in the report.
+        details (str): Appended to the report of a single breakpoint, e.g. its condition.
+        done (int): The number of commands that succeeded.
+        failed (int): The number of commands that failed.
+    """
+
+    def __init__(self, process, keyword: str, addresses: list[int], description: str,
+                 on_success: Callable[[int], None], details: str = ""):
+        """
+        Initialize the BreakpointBatch.
+
+        Args:
+            process: The CoreMinerProcess used to send the commands.
+            keyword (str): Either "SetBreakpoint" or "DelBreakpoint".
+            addresses (list[int]): The addresses to send the command for.
+            description (str): What the batch does, used in the report.
+            on_success (Callable[[int], None]): Called with the address of every command that succeeded, to
+                update the breakpoint table.
+            details (str): Appended to the report of a single breakpoint.
+        """
+        self.process = process
+        self.keyword = keyword
+        self.addresses = addresses
+        self.description = description
+        self.on_success = on_success
+        self.details = details
+        self.done = 0
+        self.failed = 0
+        self._pending = 0
+        self._first_error = ""
+        self._started_at = 0.0
+
+    def start(self) -> None:
+        """
+        Queue the commands for all addresses.
+
+        A single command is recorded in the raw responses like any command of the user, the commands of a
+        larger batch are not.
+        """
+        self._started_at = time.perf_counter()
+        self._pending = len(self.addresses)
+        quiet = len(self.addresses) > 1
+        for address in self.addresses:
+            self.process.command_scheduler.put_user(
+                json.dumps({"status": {self.keyword: address}}),
+                on_feedback=partial(self._on_feedback, address), quiet=quiet,
+                on_dropped=partial(self._on_dropped, address))
+        if not self.addresses:
+            self._finish()
+
+    def _on_feedback(self, address: int, feedback: Feedback) -> bool:
+        """
+        Count the answer of one command and update the table.
+
+        Args:
+            address (int): The address of the command.
+            feedback (Feedback): The feedback of the command.
+
+        Returns:
+            bool: Always True; a failed command does not stop the commands queued after it.
+        """
+        if isinstance(feedback, OkFeedback):
+            self._pending -= 1
+            self.done += 1
+            self.on_success(address)
+            if self._pending == 0:
+                self._finish()
+        else:
+            error = feedback.error if isinstance(feedback, ErrorFeedback) else None
+            self._fail(address, error.get("message", feedback.raw) if isinstance(error, dict) else feedback.raw)
+        return True
+
+    def _on_dropped(self, address: int) -> None:
+        self._fail(address, "dropped before it was sent")
+
+    def _fail(self, address: int, message: str) -> None:
+        """
+        Count a command that failed or was dropped and report the batch once all commands are done.
+
+        Args:
+            address (int): The address of the command.
+            message (str): Why the command failed.
+        """
+        self._pending -= 1
+        self.failed += 1
+        if not self._first_error:
+            self._first_error = f"{address:#x}: {message}"
+        if self._pending == 0:
+            self._finish()
+
+    def _finish(self) -> None:
+        """
+        Report how many commands succeeded and refresh the widgets once.
+        """
+        elapsed = time.perf_counter() - self._started_at
+        if len(self.addresses) == 1:
+            address = self.addresses[0]
+            if self.done:
+                details = f" {self.details}" if self.details else ""
+                self.process.data_store.set_output(f"[hh]: {self.description} breakpoint at {address:#x}{details}")
+            else:
+                self.process.data_store.set_output(f"[hh][!]: Breakpoint at {self._first_error}")
+        else:
+            rate = len(self.addresses) / elapsed if elapsed > 0 else 0.0
+            report = (f"{self.description} {self.done} of {len(self.addresses)} breakpoints in {elapsed:.3f}s "
+                      f"({rate:.0f}/s)")
+            if self.failed:
+                self.process.data_store.set_output(
+                    f"[hh][!]: {report}, {self.failed} failed, first {self._first_error}")
+            else:
+                self.process.data_store.set_output(f"[hh]: {report}")
+        self.process.request_update()
@@ -0,0 +1,249 @@
+"""
+Module for the conditions and hit counts of breakpoints that are evaluated by HardHat.
+
+The CoreMiner only knows unconditional breakpoints. This module defines the Condition class, which compiles a
+condition like `rax == 5 && [rsp+8] != 0` once into nested closures, and the ConditionalBreakpoint class, which
+holds the condition, the hit count and the statistics of a breakpoint. Numbers are hexadecimal like every address
+in HardHat. Names are registers (with or without `$`) or symbols; symbols are resolved when the breakpoint is set.
+`[expr]` reads the 8 byte word at an address. All arithmetic wraps at 64 bits and comparisons are unsigned.
+"""
+
+import operator
+import re
+from typing import Callable, Optional
+
+from address_resolver import ADDRESS_MASK, REGISTER_NAMES
+
+TOKEN_PATTERN = re.compile(r"\s*(0[xX][0-9a-fA-F]+|\$?[A-Za-z_.][\w.@]*|[0-9a-fA-F]+|&&|\|\||==|!=|<=|>=|<<|>>|"
+                           r"[-+*/%&|^~!<>()\[\]])")
+
+# Binary operators by precedence, lowest first, as in C
+BINARY_OPERATORS = (
+    {"||": None, "or": None},
+    {"&&": None, "and": None},
+    {"|": operator.or_},
+    {"^": operator.xor},
+    {"&": operator.and_},
+    {"==": operator.eq, "!=": operator.ne},
+    {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge},
+    {"<<": operator.lshift, ">>": operator.rshift},
+    {"+": operator.add, "-": operator.sub},
+    {"*": operator.mul, "/": operator.floordiv, "%": operator.mod},
+)
+
+# A compiled expression: takes the registers and the memory words read so far and returns a value
+Node = Callable[[dict, dict], int]
+
+
+class MissingWord(Exception):
+    """
+    Raised while evaluating a condition that reads a word that was not fetched yet.
+
+    Attributes:
+        address (int): The address of the missing word.
+    """
+
+    def __init__(self, address: int):
+        super().__init__(f"Missing word at {address:#x}")
+        self.address = address
+
+
+class Condition:
+    """
+    A compiled breakpoint condition.
+
+    Attributes:
+        text (str): The condition as it was entered.
+        registers (set[str]): The registers the condition reads.
+        reads_memory (bool): True if the condition reads words from memory.
+    """
+
+    def __init__(self, text: str, resolve_symbol: Optional[Callable[[str], int]] = None):
+        """
+        Compile a condition.
+
+        Args:
+            text (str): The condition, e.g. "rax == 5 && [rsp+8] != 0".
+            resolve_symbol (Optional[Callable[[str], int]]): Returns the address of a symbol. It may raise
+                UnresolvedName, which is passed on so the symbol can be fetched.
+
+        Raises:
+            ValueError: If the condition is malformed or uses a symbol without a resolver.
+        """
+        self.text = text
+        self.registers: set[str] = set()
+        self.reads_memory = False
+        self._resolve_symbol = resolve_symbol
+        self._tokens = self._tokenize(text)
+        self._position = 0
+        self._root = self._binary(0)
+        if self._position != len(self._tokens):
+            raise ValueError(f"Unexpected {self._tokens[self._position]!r} in condition")
+        del self._tokens
+
+    def evaluate(self, registers: dict[str, int], memory: dict[int, int]) -> bool:
+        """
+        Evaluate the condition.
+
+        Args:
+            registers (dict[str, int]): The registers of the current stop.
+            memory (dict[int, int]): The words read during the current stop by their address.
+
+        Returns:
+            bool: True if the condition holds, i.e. evaluates to a value other than 0.
+
+        Raises:
+            MissingWord: If a word has to be read first; evaluate again once it is in `memory`.
+            ZeroDivisionError: If the condition divides by 0.
+        """
+        return self._root(registers, memory) != 0
+
+    @staticmethod
+    def _tokenize(text: str) -> list[str]:
+        tokens = []
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = TOKEN_PATTERN.match(text, position)
+            if match is None:
+                raise ValueError(f"Unexpected {text[position:].strip()[:1]!r} in condition")
+            tokens.append(match.group(1))
+            position = match.end()
+        if not tokens:
+            raise ValueError("Empty condition")
+        return tokens
+
+    def _peek(self) -> Optional[str]:
+        return self._tokens[self._position] if self._position < len(self._tokens) else None
+
+    def _take(self, expected: Optional[str] = None) -> str:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Unexpected end of condition")
+        if expected is not None and token != expected:
+            raise ValueError(f"Expected {expected!r} instead of {token!r} in condition")
+        self._position += 1
+        return token
+
+    def _binary(self, level: int) -> Node:
+        """
+        Compile the binary operators of a precedence level, left associative.
+
+        Args:
+            level (int): The index into BINARY_OPERATORS.
+        """
+        if level == len(BINARY_OPERATORS):
+            return self._unary()
+        operators = BINARY_OPERATORS[level]
+        left = self._binary(level + 1)
+        while self._peek() in operators:
+            symbol = self._take()
+            right = self._binary(level + 1)
+            left = self._combine(symbol, operators[symbol], left, right)
+        return left
+
+    @staticmethod
+    def _combine(symbol: str, function, left: Node, right: Node) -> Node:
+        if symbol in ("||", "or"):
+            return lambda registers, memory: int(left(registers, memory) != 0 or right(registers, memory) != 0)
+        if symbol in ("&&", "and"):
+            return lambda registers, memory: int(left(registers, memory) != 0 and right(registers, memory) != 0)
+        return lambda registers, memory: int(function(left(registers, memory), right(registers, memory))) \
+            & ADDRESS_MASK
+
+    def _unary(self) -> Node:
+        token = self._peek()
+        if token in ("-", "~", "!", "not"):
+            self._take()
+            operand = self._unary()
+            if token == "-":
+                return lambda registers, memory: -operand(registers, memory) & ADDRESS_MASK
+            if token == "~":
+                return lambda registers, memory: ~operand(registers, memory) & ADDRESS_MASK
+            return lambda registers, memory: int(operand(registers, memory) == 0)
+        return self._primary()
+
+    def _primary(self) -> Node:
+        token = self._take()
+        if token == "(":
+            node = self._binary(0)
+            self._take(")")
+            return node
+        if token == "[":
+            address = self._binary(0)
+            self._take("]")
+            self.reads_memory = True
+            return lambda registers, memory: self._read(address(registers, memory), memory)
+        try:
+            value = int(token, 16) & ADDRESS_MASK
+        except ValueError:
+            return self._name(token)
+        return lambda registers, memory: value
+
+    @staticmethod
+    def _read(address: int, memory: dict[int, int]) -> int:
+        word = memory.get(address)
+        if word is None:
+            raise MissingWord(address)
+        return word
+
+    def _name(self, token: str) -> Node:
+        name = token[1:] if token.startswith("$") else token
+        if name in REGISTER_NAMES:
+            self.registers.add(name)
+            return lambda registers, memory: registers[name]
+        if token.startswith("$"):
+            raise ValueError(f"Unknown register in condition: {token}")
+        if self._resolve_symbol is None:
+            raise ValueError(f"Unknown name in condition: {token}")
+        value = self._resolve_symbol(name)
+        return lambda registers, memory: value
+
+
+class ConditionalBreakpoint:
+    """
+    A breakpoint that only stops the debuggee if its condition holds and it was hit often enough.
+
+    A hit is a stop at the breakpoint where the condition holds (every stop, without a condition). The debuggee
+    stays stopped from the `hits`-th hit on; on every other stop HardHat continues it right away.
+
+    Attributes:
+        address (int): The address of the breakpoint.
+        condition (Optional[Condition]): The condition, or None.
+        hits (int): The hit that stops the debuggee, 1 for the first one.
+        reached (int): How often the debuggee stopped at the breakpoint.
+        hit_count (int): How often the condition held.
+    """
+
+    def __init__(self, address: int, condition: Optional[Condition] = None, hits: int = 1):
+        """
+        Initialize the ConditionalBreakpoint.
+
+        Args:
+            address (int): The address of the breakpoint.
+            condition (Optional[Condition]): The condition, or None.
+            hits (int): The hit that stops the debuggee.
+        """
+        self.address = address
+        self.condition = condition
+        self.hits = hits
+        self.reached = 0
+        self.hit_count = 0
+
+    def describe(self) -> str:
+        """
+        Format the condition and the hit count, e.g. "if rax == 5, hits 3".
+        """
+        parts = []
+        if self.condition is not None:
+            parts.append(f"if {self.condition.text}")
+        if self.hits > 1:
+            parts.append(f"hits {self.hits}")
+        return ", ".join(parts)
+
+    def reset(self) -> None:
+        """
+        Reset the statistics, e.g. when a new debuggee is run.
+        """
+        self.reached = 0
+        self.hit_count = 0
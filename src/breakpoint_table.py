@@ -0,0 +1,173 @@
+"""
+Module for keeping track of the breakpoints of the debuggee.
+
+This module defines the BreakpointTable class, HardHat's record of every breakpoint it set in the CoreMiner. The
+table is the source of the breakpoint markers in the disassembly, so setting or deleting a breakpoint does not
+require disassembling again. A disabled breakpoint is deleted in the CoreMiner but kept in the table, together
+with its condition, so it can be enabled again.
+"""
+
+from typing import Iterator, Optional
+
+from breakpoint_condition import ConditionalBreakpoint
+
+
+class Breakpoint:
+    """
+    An entry of the breakpoint table.
+
+    Attributes:
+        address (int): The address of the breakpoint.
+        enabled (bool): True if the breakpoint is set in the CoreMiner.
+        origin (str): Where the address came from, e.g. the symbol name matched by `bpre`.
+        conditional (Optional[ConditionalBreakpoint]): The condition and hit count checked by HardHat, if any.
+    """
+
+    __slots__ = ("address", "enabled", "origin", "conditional")
+
+    def __init__(self, address: int, origin: str = "", conditional: Optional[ConditionalBreakpoint] = None):
+        self.address = address
+        self.enabled = True
+        self.origin = origin
+        self.conditional = conditional
+
+
+class BreakpointTable:
+    """
+    The breakpoints by their address.
+
+    Attributes:
+        generation (int): Incremented whenever the table changed.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty BreakpointTable.
+        """
+        self._entries: dict[int, Breakpoint] = {}
+        self._conditional_count = 0
+        self._sorted: list[Breakpoint] = []
+        self._sorted_generation = 0
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Breakpoint]:
+        return iter(self.sorted_entries())
+
+    def sorted_entries(self) -> list[Breakpoint]:
+        """
+        Get the breakpoints in ascending address order. The list is sorted again only after the table changed.
+        """
+        if self._sorted_generation != self.generation:
+            self._sorted = sorted(self._entries.values(), key=lambda entry: entry.address)
+            self._sorted_generation = self.generation
+        return self._sorted
+
+    def __contains__(self, address: int) -> bool:
+        return address in self._entries
+
+    def add(self, address: int, origin: str = "", conditional: Optional[ConditionalBreakpoint] = None) -> Breakpoint:
+        """
+        Add an enabled breakpoint, replacing the breakpoint at the same address.
+
+        Args:
+            address (int): The address of the breakpoint.
+            origin (str): Where the address came from.
+            conditional (Optional[ConditionalBreakpoint]): The condition and hit count, if any.
+
+        Returns:
+            Breakpoint: The new entry.
+        """
+        self.remove(address)
+        entry = Breakpoint(address, origin, conditional)
+        self._entries[address] = entry
+        if conditional is not None:
+            self._conditional_count += 1
+        self.generation += 1
+        return entry
+
+    def remove(self, address: int) -> Optional[Breakpoint]:
+        """
+        Remove a breakpoint.
+
+        Args:
+            address (int): The address of the breakpoint.
+
+        Returns:
+            Optional[Breakpoint]: The removed entry, or None if there was no breakpoint.
+        """
+        entry = self._entries.pop(address, None)
+        if entry is not None:
+            if entry.conditional is not None and entry.enabled:
+                self._conditional_count -= 1
+            self.generation += 1
+        return entry
+
+    def set_enabled(self, address: int, enabled: bool) -> None:
+        """
+        Enable or disable a breakpoint that is in the table.
+
+        Args:
+            address (int): The address of the breakpoint.
+            enabled (bool): True if the breakpoint is set in the CoreMiner.
+        """
+        entry = self._entries.get(address)
+        if entry is not None and entry.enabled != enabled:
+            entry.enabled = enabled
+            if entry.conditional is not None:
+                self._conditional_count += 1 if enabled else -1
+            self.generation += 1
+
+    def get(self, address: int) -> Optional[Breakpoint]:
+        return self._entries.get(address)
+
+    def is_active(self, address: int) -> bool:
+        """
+        Check whether an enabled breakpoint is set at an address.
+
+        Args:
+            address (int): The address to check.
+        """
+        entry = self._entries.get(address)
+        return entry is not None and entry.enabled
+
+    def conditional_at(self, address: int) -> Optional[ConditionalBreakpoint]:
+        """
+        Get the condition and hit count of the enabled breakpoint at an address.
+
+        Args:
+            address (int): The address of the breakpoint.
+
+        Returns:
+            Optional[ConditionalBreakpoint]: The condition, or None for an unconditional or disabled breakpoint.
+        """
+        entry = self._entries.get(address)
+        if entry is None or not entry.enabled:
+            return None
+        return entry.conditional
+
+    def has_conditions(self) -> bool:
+        """
+        Check whether any enabled breakpoint has a condition or a hit count.
+        """
+        return self._conditional_count > 0
+
+    def addresses(self, enabled: Optional[bool] = None) -> list[int]:
+        """
+        Get the addresses of the breakpoints in ascending order.
+
+        Args:
+            enabled (Optional[bool]): Only the enabled (True) or disabled (False) breakpoints, None for all.
+        """
+        return sorted(address for address, entry in self._entries.items()
+                      if enabled is None or entry.enabled == enabled)
+
+    def reset_statistics(self) -> None:
+        """
+        Reset the hit counts of the conditional breakpoints, e.g. when a new debuggee is run.
+        """
+        for entry in self._entries.values():
+            if entry.conditional is not None:
+                entry.conditional.reset()
@@ -9,8 +9,16 @@ to boolean values.
 """
 
 import argparse
+import re
 import shlex
 import subprocess
+from typing import Optional
+
+from address_resolver import REGISTER_NAMES, AddressResolver, UnresolvedName
+from breakpoint_condition import Condition
+
+# Largest range shown by the hexdump command; larger ranges are dumped to a file
+MAX_HEXDUMP_LENGTH = 0x10000
 
 
 class CommandParser():
@@ -24,14 +32,19 @@ class CommandParser():
     handler methods.
     """
 
-    def __init__(self):
+    def __init__(self, resolver: Optional[AddressResolver] = None):
         """
         Initialize the CommandParser.
 
         Creates the main argument parser and configures subparsers for each supported command,
         along with their arguments and help messages. Also, stores the formatted help text and
         sets up a dictionary mapping command names to their respective handler methods.
+
+        Args:
+            resolver (Optional[AddressResolver]): Evaluates address expressions like "main+0x10" or "$rsp".
+                Without a resolver, addresses have to be plain hexadecimal numbers.
         """
+        self.resolver = resolver
 
         # Create the main (top-level) parser
         self.parser = argparse.ArgumentParser(prog="HardHat")
@@ -54,18 +67,26 @@ class CommandParser():
         # Step over
         step_over_parser = subparsers.add_parser(
             "stepover", aliases=["sov"], help="Performs step over")
+        step_over_parser.add_argument(
+            "count", nargs="?", type=int, default=1, help="how often to step over")
 
         # Step out
         step_out_parser = subparsers.add_parser(
             "stepout", aliases=["so"], help="Performs step out")
+        step_out_parser.add_argument(
+            "count", nargs="?", type=int, default=1, help="how often to step out")
 
         # Step into
         step_into_parser = subparsers.add_parser(
             "stepinto", aliases=["si"], help="Performs step into")
+        step_into_parser.add_argument(
+            "count", nargs="?", type=int, default=1, help="how often to step into")
 
         # Step single
         step_single_parser = subparsers.add_parser(
             "step", aliases=["s"], help="Performs single step")
+        step_single_parser.add_argument(
+            "count", nargs="?", type=int, default=1, help="how many single steps to perform")
 
         # Get Stack
         get_stack_parser = subparsers.add_parser(
@@ -90,25 +111,58 @@ class CommandParser():
         set_breakpoint_parser = subparsers.add_parser(
             "break", aliases=["bp"], help="Set a breakpoint")
         set_breakpoint_parser.add_argument(
-            "addr", type=parse_hex, help="address where to set the breakpoint")
+            "addr", type=self.parse_address, help="address where to set the breakpoint")
+        set_breakpoint_parser.add_argument(
+            "options", nargs=argparse.REMAINDER,
+            help="'if CONDITION' and/or 'hits N', checked by HardHat whenever the breakpoint is hit")
 
         # Del breakepoint
         set_breakpoint_parser = subparsers.add_parser(
             "delbreak", aliases=["dbp"], help="Deletes a breakpoint")
         set_breakpoint_parser.add_argument(
-            "addr", type=parse_hex, help="address where to delete the breakpoint")
+            "addr", type=self.parse_address, help="address where to delete the breakpoint")
+
+        # List breakpoints
+        list_breakpoints_parser = subparsers.add_parser(
+            "breakpoints", aliases=["bl"], help="Lists the breakpoints with their conditions and hits")
+
+        # Enable & disable breakpoints
+        enable_breakpoint_parser = subparsers.add_parser(
+            "enablebreak", aliases=["bpon"], help="Sets a disabled breakpoint again")
+        enable_breakpoint_parser.add_argument(
+            "target", type=str, help="address of the breakpoint or 'all'")
+        disable_breakpoint_parser = subparsers.add_parser(
+            "disablebreak", aliases=["bpoff"], help="Deletes a breakpoint but keeps it in the list")
+        disable_breakpoint_parser.add_argument(
+            "target", type=str, help="address of the breakpoint or 'all'")
+
+        # Clear breakpoints
+        clear_breakpoints_parser = subparsers.add_parser(
+            "clearbreaks", aliases=["bpclear"], help="Deletes all breakpoints")
+
+        # Set breakpoints by pattern
+        regex_breakpoint_parser = subparsers.add_parser(
+            "breakregex", aliases=["bpre"], help="Sets a breakpoint on every known symbol matching a regex")
+        regex_breakpoint_parser.add_argument(
+            "pattern", type=str, help="regular expression searched in the symbol names")
+
+        # Set breakpoints from a file
+        file_breakpoint_parser = subparsers.add_parser(
+            "breakfile", aliases=["bpfile"], help="Sets a breakpoint on every address listed in a file")
+        file_breakpoint_parser.add_argument(
+            "path", type=str, help="file with one address expression per line, # starts a comment")
 
         # Read memory
         read_memory_parser = subparsers.add_parser(
             "rmem", aliases=[], help="Read a word at addr")
         read_memory_parser.add_argument(
-            "addr", type=parse_hex, help="address where you want to read a word")
+            "addr", type=self.parse_address, help="address where you want to read a word")
 
         # Write memory
         write_memory_parser = subparsers.add_parser(
             "wmem", aliases=[], help="Write a word at addr")
         write_memory_parser.add_argument(
-            "addr", type=parse_hex, help="address where you want to write a word")
+            "addr", type=self.parse_address, help="address where you want to write a word")
         write_memory_parser.add_argument(
             "value", type=parse_hex, help="value you want to write")
 
@@ -130,10 +184,46 @@ class CommandParser():
         get_disassembly_parser = subparsers.add_parser(
             "dis", aliases=["d"], help="Disassemble at address")
         get_disassembly_parser.add_argument(
-            "addr", type=parse_hex, help="address where you want to disassemble")
+            "addr", type=self.parse_address, help="address where you want to disassemble")
         get_disassembly_parser.add_argument(
             "length", type=parse_hex, help="bytes you want to disassemble")
 
+        # Hexdump
+        hexdump_parser = subparsers.add_parser(
+            "hexdump", aliases=["x"], help="Show a hexdump of memory")
+        hexdump_parser.add_argument(
+            "addr", type=self.parse_address, help="address of the first byte")
+        hexdump_parser.add_argument(
+            "length", type=parse_hex, help="bytes you want to read")
+
+        # Dump memory
+        dump_parser = subparsers.add_parser(
+            "dump", aliases=[], help="Dump a region or a range of memory into a file")
+        dump_parser.add_argument(
+            "target", nargs="+", help="name of a region (e.g. [heap]) or start and end address")
+        dump_parser.add_argument(
+            "path", type=str, help="file to write, an interrupted dump into the same file is resumed")
+
+        # Search memory
+        search_parser = subparsers.add_parser(
+            "search", aliases=[], help="Search the readable memory for a string, bytes or a pointer")
+        search_parser.add_argument(
+            "-x", "--hex", action="store_true", help="the pattern are hex bytes, e.g. 4889e5")
+        search_parser.add_argument(
+            "-p", "--pointer", action="store_true", help="the pattern is an address, searched as 8 byte word")
+        search_parser.add_argument(
+            "pattern", type=str, help="the string to search for")
+        search_parser.add_argument(
+            "region", nargs="?", default=None, help="only search the regions with this name, e.g. [heap]")
+
+        # Cancel
+        cancel_parser = subparsers.add_parser(
+            "cancel", aliases=[],
+            help="Cancel the running search, dump, conditional continue, step batch and trace and interrupt a "
+                 "running Continue")
+        cancel_parser.add_argument(
+            "-f", "--flush", action="store_true", help="also drop the commands waiting to be sent")
+
         # Set variable
         set_variable_parser = subparsers.add_parser(
             "vars", aliases=[], help="Set a variable by name")
@@ -148,6 +238,28 @@ class CommandParser():
         get_variable_parser.add_argument(
             "name", type=str, help="name of the variable")
 
+        # Trace
+        trace_parser = subparsers.add_parser(
+            "trace", aliases=[], help="Records the executed instructions")
+        trace_parser.add_argument(
+            "count", type=int, help="maximum number of instructions to trace")
+        trace_parser.add_argument(
+            "-u", "--until", type=self.parse_address, default=None, help="address where the trace stops")
+        trace_parser.add_argument(
+            "-r", "--regs", type=str, default="", help="comma separated registers to record with each instruction")
+
+        # Save trace
+        save_trace_parser = subparsers.add_parser(
+            "tracesave", aliases=["tsave"], help="Saves the last trace as binary file or as csv")
+        save_trace_parser.add_argument(
+            "path", type=str, help="file to write, a .csv suffix selects the csv format")
+
+        # Follow RIP
+        follow_parser = subparsers.add_parser(
+            "follow", aliases=[], help="Let the disassembly follow RIP after every stop")
+        follow_parser.add_argument(
+            "value", type=str2bool, help="bool to enable or disable following RIP")
+
         # Get plugins
         get_plugins_parser = subparsers.add_parser(
             "plugins", aliases=[], help="Get all available plugins")
@@ -191,6 +303,18 @@ class CommandParser():
             "delbreakpoint": self.handle_delete_breakpoint,
             "delbreak": self.handle_delete_breakpoint,
             "dbp": self.handle_delete_breakpoint,
+            "breakpoints": self.handle_list_breakpoints,
+            "bl": self.handle_list_breakpoints,
+            "enablebreak": self.handle_enable_breakpoint,
+            "bpon": self.handle_enable_breakpoint,
+            "disablebreak": self.handle_disable_breakpoint,
+            "bpoff": self.handle_disable_breakpoint,
+            "clearbreaks": self.handle_clear_breakpoints,
+            "bpclear": self.handle_clear_breakpoints,
+            "breakregex": self.handle_regex_breakpoint,
+            "bpre": self.handle_regex_breakpoint,
+            "breakfile": self.handle_file_breakpoint,
+            "bpfile": self.handle_file_breakpoint,
             "rmem": self.handle_read_memory,
             "wmem": self.handle_write_memory,
             "regs": self.handle_get_set_registers,
@@ -198,8 +322,17 @@ class CommandParser():
             "gsym": self.handle_get_symbol,
             "dis": self.handle_get_disassembly,
             "d": self.handle_get_disassembly,
+            "hexdump": self.handle_hexdump,
+            "x": self.handle_hexdump,
+            "dump": self.handle_dump,
+            "search": self.handle_search,
+            "cancel": self.handle_cancel,
             "vars": self.handle_set_variable,
             "var": self.handle_get_variable,
+            "trace": self.handle_trace,
+            "tracesave": self.handle_save_trace,
+            "tsave": self.handle_save_trace,
+            "follow": self.handle_follow,
             "plugins": self.handle_get_plugins,
             "plugin": self.handle_enable_disable_plugin,
             "version": self.handle_version
@@ -208,7 +341,7 @@ class CommandParser():
     def get_help_text(self):
         return self.help_text
 
-    def parse(self, input_string: str):
+    def parse(self, input_string: str, looked_up: frozenset = frozenset()):
         """
         Parse an input command string and dispatch it to the appropriate handler.
 
@@ -216,9 +349,12 @@ class CommandParser():
         from hexadecimal to decimal when applicable, and parses the tokens using argparse. If the parsing
         fails due to an unknown command, it returns an error feedback. Otherwise, the method calls the
         associated command handler and returns its result.
+        If an address expression contains a register or symbol that is not cached, a "Resolve" command is
+        returned instead, which fetches the name and parses the command again.
 
         Args:
             input_string (str): The raw command string entered by the user.
+            looked_up (frozenset): The (kind, name) pairs that were already fetched for this command.
 
         Returns:
             tuple: A tuple containing a dictionary with the command status or error feedback, and a boolean
@@ -238,9 +374,15 @@ class CommandParser():
                 }
             }, False)
             return result_dict
+        except UnresolvedName as e:
+            return self.handle_unresolved(e, input_string, looked_up)
 
         handler = self.command_handlers.get(args.command, self.handle_unknown)
-        return handler(args, optional_args)
+        try:
+            return handler(args, optional_args)
+        except UnresolvedName as e:
+            # Raised by handlers that evaluate address expressions themselves
+            return self.handle_unresolved(e, input_string, looked_up)
 
     def handle_procmap(self, args, optional_args):
         return ({"status": "ProcMap"}, False)
@@ -252,16 +394,43 @@ class CommandParser():
         return ({"status": "Continue"}, True)
 
     def handle_step_over(self, args, optional_args):
-        return ({"status": "StepOver"}, True)
+        return self.repeat_step({"status": "StepOver"}, args.count)
 
     def handle_step_out(self, args, optional_args):
-        return ({"status": "StepOut"}, True)
+        return self.repeat_step({"status": "StepOut"}, args.count)
 
     def handle_step_into(self, args, optional_args):
-        return ({"status": "StepInto"}, True)
+        return self.repeat_step({"status": "StepInto"}, args.count)
 
     def handle_step_single(self, args, optional_args):
-        return ({"status": "StepSingle"}, True)
+        return self.repeat_step({"status": "StepSingle"}, args.count)
+
+    def repeat_step(self, command, count):
+        """
+        Build the result for a stepping command with an optional repeat count.
+
+        A single step is sent to the CoreMiner as it is. Several steps are executed by HardHat as one batch
+        without reloading the basic information in between, so the reload flag is False in that case.
+
+        Args:
+            command (dict): The JSON stepping command.
+            count (int): How often the command should be executed.
+
+        Returns:
+            tuple: The command or the batch and the reload flag.
+        """
+        if count < 1:
+            return ({
+                "feedback": {
+                    "Error": {
+                        "error_type": "command",
+                        "message": f"Invalid repeat count: {count}"
+                    }
+                }
+            }, False)
+        if count == 1:
+            return (command, True)
+        return ({"hardhat": {"Repeat": [command, count]}}, False)
 
     def handle_get_stack(self, args, optional_args):
         return ({"status": "GetStack"}, False)
@@ -278,10 +447,102 @@ class CommandParser():
         return ({"status": {"Run": [f"{args.path}", add_args]}}, True)
 
     def handle_set_breakpoint(self, args, optional_args):
-        return ({"status": {"SetBreakpoint": args.addr}}, True)
+        options = args.options + optional_args
+        try:
+            condition, hits = self.parse_breakpoint_options(options)
+        except ValueError as e:
+            return ({
+                "feedback": {
+                    "Error": {
+                        "error_type": "command",
+                        "message": f"Invalid breakpoint: {e}"
+                    }
+                }
+            }, False)
+        return ({"hardhat": {"Breakpoint": {"address": args.addr, "condition": condition, "hits": hits}}}, False)
+
+    def parse_breakpoint_options(self, options: list[str]) -> tuple[Optional[Condition], int]:
+        """
+        Parse the options of a conditional breakpoint, e.g. ["if", "rax", "==", "5", "hits", "3"].
+
+        Args:
+            options (list[str]): The tokens after the address.
+
+        Returns:
+            tuple[Optional[Condition], int]: The compiled condition (None without `if`) and the hit that stops
+                the debuggee.
+
+        Raises:
+            ValueError: If the options or the condition are malformed.
+            UnresolvedName: If the condition contains a symbol that is not cached.
+        """
+        condition_tokens: list[str] = []
+        hits = 1
+        index = 0
+        while index < len(options):
+            keyword = options[index]
+            if keyword == "if" and not condition_tokens:
+                index += 1
+                while index < len(options) and options[index] != "hits":
+                    condition_tokens.append(options[index])
+                    index += 1
+                if not condition_tokens:
+                    raise ValueError("missing condition after 'if'")
+            elif keyword == "hits" and index + 1 < len(options):
+                try:
+                    hits = int(options[index + 1])
+                except ValueError:
+                    hits = 0
+                if hits < 1:
+                    raise ValueError(f"invalid hit count {options[index + 1]!r}")
+                index += 2
+            else:
+                raise ValueError(f"unexpected {keyword!r}, expected 'if CONDITION' or 'hits N'")
+        resolve_symbol = self.resolver.symbol_address if self.resolver is not None else None
+        condition = Condition(" ".join(condition_tokens), resolve_symbol) if condition_tokens else None
+        return condition, hits
 
     def handle_delete_breakpoint(self, args, optional_args):
-        return ({"status": {"DelBreakpoint": args.addr}}, True)
+        return ({"hardhat": {"DeleteBreakpoint": args.addr}}, False)
+
+    def handle_list_breakpoints(self, args, optional_args):
+        return ({"hardhat": {"BreakpointList": None}}, False)
+
+    def handle_enable_breakpoint(self, args, optional_args):
+        return self.handle_toggle_breakpoint(args, optional_args, True)
+
+    def handle_disable_breakpoint(self, args, optional_args):
+        return self.handle_toggle_breakpoint(args, optional_args, False)
+
+    def handle_toggle_breakpoint(self, args, optional_args, enabled: bool):
+        if args.target == "all":
+            address = None
+        else:
+            try:
+                address = self.parse_address(args.target)
+            except ValueError:
+                return self.handle_unknown(args, optional_args)
+        return ({"hardhat": {"BreakpointEnable": {"address": address, "enabled": enabled}}}, False)
+
+    def handle_clear_breakpoints(self, args, optional_args):
+        return ({"hardhat": {"BreakpointClear": None}}, False)
+
+    def handle_regex_breakpoint(self, args, optional_args):
+        try:
+            pattern = re.compile(args.pattern)
+        except re.error as e:
+            return ({
+                "feedback": {
+                    "Error": {
+                        "error_type": "command",
+                        "message": f"Invalid pattern {args.pattern!r}: {e}"
+                    }
+                }
+            }, False)
+        return ({"hardhat": {"BreakpointRegex": pattern}}, False)
+
+    def handle_file_breakpoint(self, args, optional_args):
+        return ({"hardhat": {"BreakpointFile": args.path}}, False)
 
     def handle_read_memory(self, args, optional_args):
         return ({"status": {"ReadMem": args.addr}}, False)
@@ -304,7 +565,58 @@ class CommandParser():
         return ({"status": {"GetSymbolsByName": args.name}}, False)
 
     def handle_get_disassembly(self, args, optional_args):
-        return ({"status": {"DisassembleAt": [args.addr, args.length, False]}}, False)
+        return ({"hardhat": {"Disassemble": [args.addr, args.length]}}, False)
+
+    def handle_hexdump(self, args, optional_args):
+        if not 0 < args.length <= MAX_HEXDUMP_LENGTH:
+            return ({
+                "feedback": {
+                    "Error": {
+                        "error_type": "command",
+                        "message": f"Invalid length: {args.length:#x} (at most {MAX_HEXDUMP_LENGTH:#x} bytes)"
+                    }
+                }
+            }, False)
+        return ({"hardhat": {"Hexdump": [args.addr, args.length]}}, False)
+
+    def handle_dump(self, args, optional_args):
+        if len(args.target) == 1:
+            return ({"hardhat": {"Dump": {"region": args.target[0], "path": args.path}}}, False)
+        if len(args.target) == 2:
+            try:
+                start, end = (self.parse_address(target) for target in args.target)
+            except ValueError:
+                return self.handle_unknown(args, optional_args)
+            return ({"hardhat": {"Dump": {"start": start, "end": end, "path": args.path}}}, False)
+        return self.handle_unknown(args, optional_args)
+
+    def handle_search(self, args, optional_args):
+        if args.pointer:
+            try:
+                value = self.parse_address(args.pattern)
+            except ValueError:
+                return self.handle_unknown(args, optional_args)
+            pattern = value.to_bytes(8, "little")
+            description = f"pointer {value:#x}"
+        elif args.hex:
+            try:
+                pattern = bytes.fromhex(args.pattern)
+            except ValueError:
+                return self.handle_unknown(args, optional_args)
+            description = f"bytes {pattern.hex(' ')}"
+        else:
+            pattern = args.pattern.encode()
+            description = f"string {args.pattern!r}"
+        if not pattern:
+            return self.handle_unknown(args, optional_args)
+        return ({"hardhat": {"Search": {
+            "pattern": pattern.hex(),
+            "description": description,
+            "region": args.region,
+        }}}, False)
+
+    def handle_cancel(self, args, optional_args):
+        return ({"hardhat": {"Cancel": {"flush": args.flush}}}, False)
 
     def handle_get_variable(self, args, optional_args):
         return ({"status": {"ReadVariable": args.name}}, False)
@@ -312,6 +624,28 @@ class CommandParser():
     def handle_set_variable(self, args, optional_args):
         return ({"status": {"ReadVariable": [args.name, args.value]}}, True)
 
+    def handle_trace(self, args, optional_args):
+        if args.count < 1:
+            return self.handle_unknown(args, optional_args)
+        registers = [name.strip() for name in args.regs.split(",") if name.strip()]
+        unknown = [name for name in registers if name not in REGISTER_NAMES]
+        if unknown:
+            return ({
+                "feedback": {
+                    "Error": {
+                        "error_type": "command",
+                        "message": f"Unknown register for trace: {', '.join(unknown)}"
+                    }
+                }
+            }, False)
+        return ({"hardhat": {"Trace": {"count": args.count, "until": args.until, "registers": registers}}}, False)
+
+    def handle_save_trace(self, args, optional_args):
+        return ({"hardhat": {"TraceSave": args.path}}, False)
+
+    def handle_follow(self, args, optional_args):
+        return ({"hardhat": {"Follow": args.value}}, False)
+
     def handle_get_plugins(self, args, optional_args):
         return ({"status": "PluginGetList"}, False)
 
@@ -326,6 +660,48 @@ class CommandParser():
             }}, False)
         return result_dict
 
+    def handle_unresolved(self, error: UnresolvedName, input_string: str, looked_up: frozenset):
+        """
+        Build the result for a command whose address expression contains a name that is not cached.
+
+        Args:
+            error (UnresolvedName): The name that could not be resolved.
+            input_string (str): The raw command string, parsed again once the name was fetched.
+            looked_up (frozenset): The (kind, name) pairs that were already fetched for this command.
+
+        Returns:
+            tuple: A "Resolve" command, or an error feedback if fetching the name can not help.
+        """
+        if error.fetch and (error.kind, error.name) not in looked_up:
+            return ({"hardhat": {"Resolve": {
+                "kind": error.kind,
+                "name": error.name,
+                "command": input_string,
+                "looked_up": looked_up,
+            }}}, False)
+        return ({
+            "feedback": {
+                "Error": {
+                    "error_type": "command",
+                    "message": f"Unknown {error.kind}: {error.name}"
+                }
+            }
+        }, False)
+
+    def parse_address(self, input: str) -> int:
+        """
+        Convert an address argument, which may be an expression if a resolver is set.
+
+        Args:
+            input (str): The argument, e.g. "401000", "main+0x10" or "$rsp".
+
+        Returns:
+            int: The address.
+        """
+        if self.resolver is None:
+            return parse_hex(input)
+        return self.resolver.evaluate(input)
+
     # No subcommand matched
 
     def handle_unknown(self, args, optional_args):
@@ -0,0 +1,191 @@
+"""
+Module for scheduling the JSON commands that are sent to the CoreMiner.
+
+This module defines the CommandScheduler class, which replaces a plain FIFO queue of commands. It keeps two
+lanes: commands entered by the user and background refresh commands (e.g. DumpRegisters after a step).
+User commands always take priority. Refresh commands are idempotent, so duplicates are merged and pending
+refreshes are dropped as soon as a later state-changing command makes their result obsolete; that command
+queues its own refreshes afterwards. Every command is classified as read-only or not when it is queued, so the
+CoreMinerProcess can keep several read-only commands in flight at once.
+"""
+
+import json
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+from feedback_decoder import Feedback
+
+# Commands without side effects on the debuggee; the CoreMiner answers them in order, so they may overlap
+READ_ONLY_COMMANDS = frozenset((
+    "ReadMem", "DisassembleAt", "GetSymbolsByName", "DumpRegisters", "GetStack", "Backtrace", "ProcMap",
+))
+
+
+def command_keyword(command_json: str) -> str:
+    """
+    Get the keyword of a serialized JSON command, e.g. "ReadMem" for {"status": {"ReadMem": 4198400}}.
+
+    Args:
+        command_json (str): The serialized JSON command.
+
+    Returns:
+        str: The keyword, or an empty string if the command has none.
+    """
+    status = json.loads(command_json).get("status")
+    if isinstance(status, str):
+        return status
+    if isinstance(status, dict) and len(status) == 1:
+        return next(iter(status))
+    return ""
+
+
+class ScheduledCommand:
+    """
+    A JSON command waiting in the scheduler or in flight to the CoreMiner.
+
+    Attributes:
+        command_json (str): The serialized JSON command.
+        refresh (bool): True for background refresh commands, False for user commands.
+        state_changing (bool): True if the command changes the state of the debuggee.
+        on_feedback (Optional[Callable[[Feedback], bool]]): Handles the feedback instead of the FeedbackParser and
+            returns whether the command was successful.
+        on_dropped (Optional[Callable[[], None]]): Called if the command is removed by `clear` before it was sent,
+            so the job waiting for its feedback can finish.
+        quiet (bool): True if the command and its feedback are not recorded in the raw responses.
+        stop_generation (int): The stop generation of the debuggee when the command was queued; the commands are
+            answered in order, so its result belongs to that stop.
+        keyword (str): The keyword of the command, e.g. "Continue".
+        read_only (bool): True if the command has no side effects and may be sent while other read-only commands
+            are in flight.
+        sent_at (float): The `time.perf_counter()` when the command was written to the CoreMiner, 0 while queued.
+        overdue (bool): True once the command was reported for missing its deadline.
+    """
+
+    __slots__ = ("command_json", "refresh", "state_changing", "on_feedback", "on_dropped", "quiet",
+                 "stop_generation", "keyword", "read_only", "sent_at", "overdue")
+
+    def __init__(self, command_json: str, refresh: bool = False, state_changing: bool = False,
+                 on_feedback: Optional[Callable[[Feedback], bool]] = None, quiet: bool = False,
+                 stop_generation: int = 0, on_dropped: Optional[Callable[[], None]] = None):
+        self.command_json = command_json
+        self.refresh = refresh
+        self.state_changing = state_changing
+        self.on_feedback = on_feedback
+        self.on_dropped = on_dropped
+        self.quiet = quiet
+        self.stop_generation = stop_generation
+        self.keyword = command_keyword(command_json)
+        self.read_only = not state_changing and self.keyword in READ_ONLY_COMMANDS
+        self.sent_at = 0.0
+        self.overdue = False
+
+
+class CommandScheduler:
+    """
+    A thread safe two-lane scheduler for the commands sent to the CoreMiner.
+
+    Attributes:
+        stop_generation (int): The current stop generation of the debuggee, recorded with every queued command.
+        merged_refreshes (int): Number of refresh commands merged into an identical pending refresh.
+        dropped_refreshes (int): Number of pending refresh commands dropped by a later state-changing command.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty CommandScheduler.
+        """
+        self._lock = threading.Lock()
+        self._user_commands: deque[ScheduledCommand] = deque()
+        self._refresh_commands: deque[ScheduledCommand] = deque()
+        self._pending_refreshes: set[str] = set()
+        self.stop_generation = 0
+        self.merged_refreshes = 0
+        self.dropped_refreshes = 0
+
+    def put_user(self, command_json: str, state_changing: bool = False,
+                 on_feedback: Optional[Callable[[Feedback], bool]] = None, quiet: bool = False,
+                 on_dropped: Optional[Callable[[], None]] = None) -> None:
+        """
+        Queue a command entered by the user or issued by HardHat on behalf of the user.
+
+        A state-changing command makes the results of all pending refreshes obsolete, so they are dropped.
+
+        Args:
+            command_json (str): The serialized JSON command.
+            state_changing (bool): True if the command changes the state of the debuggee.
+            on_feedback (Optional[Callable[[Feedback], bool]]): Handles the feedback instead of the FeedbackParser.
+            quiet (bool): True if the command and its feedback are not recorded in the raw responses.
+            on_dropped (Optional[Callable[[], None]]): Called if `clear` removes the command before it was sent.
+        """
+        with self._lock:
+            if state_changing and self._refresh_commands:
+                self.dropped_refreshes += len(self._refresh_commands)
+                self._refresh_commands.clear()
+                self._pending_refreshes.clear()
+            self._user_commands.append(
+                ScheduledCommand(command_json, False, state_changing, on_feedback, quiet, self.stop_generation,
+                                 on_dropped))
+
+    def put_refresh(self, command_json: str, on_feedback: Optional[Callable[[Feedback], bool]] = None) -> None:
+        """
+        Queue a background refresh command, unless an identical refresh is already pending.
+
+        Args:
+            command_json (str): The serialized JSON command.
+            on_feedback (Optional[Callable[[Feedback], bool]]): Handles the feedback instead of the FeedbackParser.
+        """
+        with self._lock:
+            if command_json in self._pending_refreshes:
+                self.merged_refreshes += 1
+                return
+            self._pending_refreshes.add(command_json)
+            self._refresh_commands.append(
+                ScheduledCommand(command_json, True, False, on_feedback, stop_generation=self.stop_generation))
+
+    def get(self, read_only: bool = False) -> Optional[ScheduledCommand]:
+        """
+        Take the next command to send. User commands are returned before refresh commands.
+
+        Args:
+            read_only (bool): Only take the next command if it is read-only; otherwise it stays queued, so the
+                order of the commands is kept.
+
+        Returns:
+            Optional[ScheduledCommand]: The next command, or None if nothing (suitable) is queued.
+        """
+        with self._lock:
+            if self._user_commands:
+                if read_only and not self._user_commands[0].read_only:
+                    return None
+                return self._user_commands.popleft()
+            if self._refresh_commands:
+                if read_only and not self._refresh_commands[0].read_only:
+                    return None
+                scheduled = self._refresh_commands.popleft()
+                self._pending_refreshes.discard(scheduled.command_json)
+                return scheduled
+            return None
+
+    def empty(self) -> bool:
+        return not (self._user_commands or self._refresh_commands)
+
+    def __len__(self) -> int:
+        return len(self._user_commands) + len(self._refresh_commands)
+
+    def clear(self) -> list[ScheduledCommand]:
+        """
+        Remove all queued commands of both lanes.
+
+        The `on_dropped` callbacks are not called here, because they may queue commands themselves; the caller
+        calls them once the lock is released.
+
+        Returns:
+            list[ScheduledCommand]: The removed commands, user commands first.
+        """
+        with self._lock:
+            dropped = list(self._user_commands) + list(self._refresh_commands)
+            self._user_commands.clear()
+            self._refresh_commands.clear()
+            self._pending_refreshes.clear()
+        return dropped
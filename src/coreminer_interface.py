@@ -2,83 +2,323 @@
 Module for managing the CoreMiner debugger process.
 
 This module defines the CoreMinerProcess class, which is responsible for launching and communicating
-with CoreMiner. It sets up subprocess I/O, spawns background threads to continuously read stdout and stderr, 
+with CoreMiner. By default the subprocess I/O runs as asyncio tasks on the event loop of the TUI, so feedback
+is handled the moment it arrives. The older design, which spawns background threads to continuously read stdout
+and stderr, is still available as a fallback transport.
 It also is responsible to send the JSON commands to the CoreMiners stdin. To pasre user commands and CoreMiner 
 JSON feedback it uses the CommandParser and FeedbackParser class.  to handle communication and update the applications data store accordingly.
 """
 
+import os
+import signal
 import time
+import asyncio
 import subprocess
 import json
 import threading
+from collections import deque
+from functools import partial
 from queue import Queue
 import atexit
+from typing import Callable, Optional
 
 # Import parser logic
+from address_resolver import AddressResolver, UnresolvedName
+from auto_continue import AutoContinue
+from breakpoint_batch import BreakpointBatch
+from breakpoint_condition import ConditionalBreakpoint
 from command_parser import CommandParser
+from command_scheduler import CommandScheduler, ScheduledCommand
+from disassembly_cache import DisassemblyCache, DisassemblyLookup
+from feedback_decoder import (BacktraceFeedback, ProcessMapFeedback, RegistersFeedback, StackFeedback,
+                              SymbolsFeedback, decode_feedback, decode_line)
 from feedback_parser import FeedbackParser
+from memory_cache import MemoryCache, MemoryRead
+from memory_dump import MemoryDump
+from memory_search import MemorySearch
+from rip_follower import FOLLOW_RIP_COMMAND, RipFollower
+from step_batch import StepBatch
+from trace_recorder import TraceRecorder
+
+CMSERVE_ARGS = ["cmserve", "--logfile", "/tmp/harthat_cm.log"]
+
+# Available transports for the communication with the CoreMiner
+TRANSPORT_ASYNCIO = "asyncio"
+TRANSPORT_THREAD = "thread"
+TRANSPORTS = (TRANSPORT_ASYNCIO, TRANSPORT_THREAD)
+
+# Large JSON lines (e.g. disassembly or symbols) must fit into the buffer of the asyncio stream reader
+STREAM_LIMIT = 64 * 1024 * 1024
+
+# Seconds get_response may spend on processing one batch of responses before handing control back to the TUI
+RESPONSE_TIME_BUDGET = 0.05
+
+# Read-only commands that may be in flight at once; 1 sends every command only after the previous one finished
+PIPELINE_WINDOW = 16
+
+# Seconds until an unanswered command is reported as overdue; commands that run the debuggee may take longer
+COMMAND_DEADLINE = 5.0
+COMMAND_DEADLINES = {"Continue": 10.0, "StepOver": 10.0, "StepOut": 10.0, "Run": 10.0}
+
+# Commands that run the debuggee until it stops; the CoreMiner only answers them once it stopped
+INTERRUPTIBLE_COMMANDS = frozenset(("Continue", "StepOver", "StepOut"))
+
+# Seconds a command has to be in flight before the pending-command indicator shows it, so it does not flicker
+PENDING_INDICATOR_DELAY = 0.5
+
+# Commands used to reload the basic information if no reload provider is set
+DEFAULT_RELOAD_COMMANDS = [{"status": "DumpRegisters"}, {"status": "GetStack"}, {"status": "Backtrace"}]
+
+# Command used to refresh the memory map after it became stale
+PROCESS_MAP_COMMAND = json.dumps({"status": "ProcMap"})
+
+# Feedback that changes the state recorded in the snapshot log of the data store
+SNAPSHOT_FEEDBACK_TYPES = (RegistersFeedback, StackFeedback, BacktraceFeedback)
 
 
 class CoreMinerProcess:
     """
     Manages the CoreMiner process and handles communication between the CoreMiner debugger and the HardHat TUI.
 
-    This class launches the CoreMiner process, sets up I/O queues and background threads for reading
-    stdout and stderr, and provides methods to parse and send commands to the process. It also retrieves
+    This class launches the CoreMiner process, sets up I/O queues and either asyncio tasks or background threads
+    for reading stdout and stderr, and provides methods to parse and send commands to the process. It also retrieves
     and processes feedback from the process to update the data store.
 
     Attributes:
-        process (subprocess.Popen): The subprocess running the CoreMiner binary.
+        process (asyncio.subprocess.Process | subprocess.Popen): The subprocess running the CoreMiner binary.
+        transport (str): Either "asyncio" (event driven, default) or "thread" (polling fallback).
         data_store: The shared data store used for updating debuggee output and other state information.
-        command_finished (bool): Flag indicating whether the previous command has finished executing.
+        in_flight (deque[ScheduledCommand]): The commands sent to the CoreMiner that were not answered yet, oldest
+            first. The CoreMiner answers in order, so every feedback belongs to the oldest command. Either a single
+            command or up to `pipeline_window` read-only commands are in flight.
+        pipeline_window (int): The number of read-only commands that may be in flight at once.
         command_parser (CommandParser): An instance used to parse text commands into JSON commands.
         feedback_parser (FeedbackParser): An instance used to process JSON feedback from the CoreMiner.
-        queue_feedback (Queue): Queue for storing JSON feedback messages.
+        queue_feedback (Queue): Queue for storing the decoded feedback messages.
         queue_output (Queue): Queue for storing non-JSON stdout messages.
         queue_stderr (Queue): Queue for storing stderr messages.
-        queue_commands (Queue): Queue for storing JSON commands to send to the process.
+        command_scheduler (CommandScheduler): Schedules the JSON commands to send to the process; user commands
+            take priority over background refreshes, which are merged and dropped when obsolete.
+        response_event (asyncio.Event): Set whenever something new is waiting in one of the queues.
+        response_time_budget (float): Seconds get_response may spend on processing one batch of responses.
+        reload_provider (Optional[Callable[[], list[dict]]]): Returns the commands needed to reload the information
+            that is currently displayed. If None, DEFAULT_RELOAD_COMMANDS are used.
+        stop_generation (int): Incremented every time the debuggee state changed and the basic info is reloaded.
+        registers_generation (int): The stop generation of the registers in the data store.
+        command_generation (int): The stop generation the command whose feedback is handled was queued in, i.e. the
+            stop its result belongs to.
+        address_resolver (AddressResolver): Evaluates the address expressions of commands from the cached registers
+            and symbols.
     """
 
-    def __init__(self, data_store):
+    def __init__(self, data_store, transport: str = TRANSPORT_ASYNCIO,
+                 response_time_budget: float = RESPONSE_TIME_BUDGET, pipeline_window: int = PIPELINE_WINDOW):
         """
-        Initialize the CoreMinerProcess instance and launch the CoreMiner subprocess.
+        Initialize the CoreMinerProcess instance.
 
-        The process is started with pipes for stdin, stdout, and stderr. The process is also registered
-        for termination upon program exit. Command and feedback parsers are initialized, and background threads
-        are started to handle asynchronous reading of the process's output and sending of commands.
+        Command and feedback parsers as well as the I/O queues are initialized. The CoreMiner subprocess itself
+        is launched by `start`, because the asyncio transport has to be created on a running event loop.
 
         Args:
             data_store: An object used to store and update information received from the CoreMiner process.
+            transport (str): "asyncio" to use the event driven transport or "thread" to use the polling fallback.
+            response_time_budget (float): Seconds get_response may spend on one batch of responses.
+            pipeline_window (int): The number of read-only commands that may be in flight at once.
         """
-        self.process = subprocess.Popen(
-            ["cmserve", "--logfile" , "/tmp/harthat_cm.log"],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-
-        atexit.register(lambda: self.process.terminate())
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport: {transport}")
+        if pipeline_window < 1:
+            raise ValueError(f"Invalid pipeline window: {pipeline_window}")
+        self.transport = transport
+        self.process = None
+        self.response_time_budget = response_time_budget
 
         self.data_store = data_store
-        self.command_finished = True
+        self.in_flight: deque[ScheduledCommand] = deque()
+        self.pipeline_window = pipeline_window
+        # The writer thread of the thread transport takes commands while the TUI handles their feedback
+        self._in_flight_lock = threading.Lock()
+        # Commands at the front of in_flight that were sent before a failure cleared the command queue
+        self._cleared_in_flight = 0
+        self._refresh_requested = False
+        self._update_requested = False
 
-        self.command_parser = CommandParser()
+        self.registers_generation = -1
+        self.command_generation = 0
+        self.address_resolver = AddressResolver(
+            self.data_store,
+            lambda: self.registers_generation == self.stop_generation and self.data_store.snapshot_stop is None)
+        self.command_parser = CommandParser(self.address_resolver)
         self.feedback_parser = FeedbackParser(self.data_store)
 
+        # Commands that are executed by HardHat itself instead of being sent to the CoreMiner as they are
+        self.hardhat_command_handlers = {
+            "Repeat": self._handle_repeat,
+            "Trace": self._handle_trace,
+            "TraceSave": self._handle_trace_save,
+            "Disassemble": self._handle_disassemble,
+            "Follow": self._handle_follow,
+            "Resolve": self._handle_resolve,
+            "Hexdump": self._handle_hexdump,
+            "Dump": self._handle_dump,
+            "Search": self._handle_search,
+            "Cancel": self._handle_cancel,
+            "Breakpoint": self._handle_breakpoint,
+            "DeleteBreakpoint": self._handle_delete_breakpoint,
+            "BreakpointList": self._handle_breakpoint_list,
+            "BreakpointEnable": self._handle_breakpoint_enable,
+            "BreakpointClear": self._handle_breakpoint_clear,
+            "BreakpointRegex": self._handle_breakpoint_regex,
+            "BreakpointFile": self._handle_breakpoint_file,
+        }
+        self.trace_recorder: Optional[TraceRecorder] = None
+        self.step_batch: Optional[StepBatch] = None
+        self.memory_dump: Optional[MemoryDump] = None
+        self.memory_search: Optional[MemorySearch] = None
+        self.auto_continue: Optional[AutoContinue] = None
+
+        # Commands that change the memory of the debuggee or start a new one and invalidate cached information
+        self.disassembly_cache = DisassemblyCache()
+        self.cache_invalidators = {
+            "WriteMem": lambda payload: self.disassembly_cache.invalidate(payload[0], 8),
+            "Run": self._invalidate_on_run,
+            # Writing a variable (vars) may change any memory
+            "ReadVariable": self._invalidate_on_variable_write,
+            "WriteVariable": self._invalidate_on_variable_write,
+            # Executing an unknown amount of code may map or unmap memory (libraries, heap)
+            "Continue": self._invalidate_memory_map,
+            "StepOver": self._invalidate_memory_map,
+            "StepOut": self._invalidate_memory_map,
+        }
+        self.rip_follower = RipFollower(self)
+        # Memory read during the current stop of the debuggee
+        self.memory_cache = MemoryCache()
+
         self.queue_feedback = Queue()
         self.queue_output = Queue()
         self.queue_stderr = Queue()
-        self.queue_commands = Queue()
-        threading.Thread(target=self._read_stdout, daemon=True).start()
-        threading.Thread(target=self._read_stderr, daemon=True).start()
-        threading.Thread(target=self._send_command, daemon=True).start()
+        self.command_scheduler = CommandScheduler()
+        self.response_event = asyncio.Event()
+
+        self.reload_provider: Optional[Callable[[], list[dict]]] = None
+        self.stop_generation = 0
+        self._reload_generations: dict[str, int] = {}
+
+    async def start(self):
+        """
+        Launch the CoreMiner subprocess and start the reader and writer for the selected transport.
+
+        With the asyncio transport the process is created with `asyncio.create_subprocess_exec` and its
+        stdout and stderr are read by tasks on the running event loop. With the thread transport the process is
+        started with `subprocess.Popen` and background threads poll the pipes and the command queue.
+        In both cases the process is registered for termination upon program exit.
+        """
+        if self.transport == TRANSPORT_ASYNCIO:
+            self.process = await asyncio.create_subprocess_exec(
+                *CMSERVE_ARGS,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=STREAM_LIMIT
+            )
+            self._tasks = [
+                asyncio.create_task(self._read_stdout_async()),
+                asyncio.create_task(self._read_stderr_async()),
+            ]
+        else:
+            self.process = subprocess.Popen(
+                CMSERVE_ARGS,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            threading.Thread(target=self._read_stdout, daemon=True).start()
+            threading.Thread(target=self._read_stderr, daemon=True).start()
+            threading.Thread(target=self._send_command, daemon=True).start()
+
+        atexit.register(self.terminate)
+
+    def terminate(self):
+        """
+        Terminate the CoreMiner process if it is still running.
+        """
+        try:
+            self.process.terminate()
+        except ProcessLookupError:
+            pass
+
+    async def wait_for_response(self):
+        """
+        Wait until something new arrived from the CoreMiner process.
+
+        Only used with the asyncio transport. The event is cleared again before returning, so the caller is
+        expected to process everything that is currently waiting in the queues.
+        """
+        await self.response_event.wait()
+        self.response_event.clear()
+
+    def has_pending_response(self) -> bool:
+        """
+        Check whether any feedback, debuggee output or stderr message is waiting to be processed.
+
+        Returns:
+            bool: True if at least one of the queues is not empty.
+        """
+        return not (self.queue_feedback.empty() and self.queue_output.empty() and self.queue_stderr.empty())
+
+    def _put_stdout_line(self, line: str):
+        """
+        Put a line read from the CoreMiner's stdout into the feedback queue if it is a feedback, otherwise into the
+        output queue.
+
+        The feedback is decoded into its typed message right here, once, and keeps the line for the raw responses.
+
+        Args:
+            line (str): The stripped line read from stdout.
+        """
+        feedback = decode_line(line)
+        if feedback is None:
+            self.queue_output.put(line)
+        else:
+            self.queue_feedback.put(feedback)
+
+    async def _read_stdout_async(self):
+        """
+        Read lines from the CoreMiner process's stdout until the pipe is closed.
+
+        Feedback lines from the CoreMiner are decoded and added to the feedback queue, any other line is output of
+        the debuggee. After each line the response event is set so the TUI reacts immediately.
+        """
+        while True:
+            line_stdout = await self.process.stdout.readline()
+            if not line_stdout:
+                break
+            line_stdout = line_stdout.decode(errors="replace").strip()
+            if line_stdout:
+                self._put_stdout_line(line_stdout)
+                self.response_event.set()
+
+    async def _read_stderr_async(self):
+        """
+        Read lines from the CoreMiner process's stderr until the pipe is closed.
+
+        Every line is added to the stderr queue as it is and the response event is set.
+        """
+        while True:
+            line_stderr = await self.process.stderr.readline()
+            if not line_stderr:
+                break
+            line_stderr = line_stderr.decode(errors="replace").strip()
+            if line_stderr:
+                self.queue_stderr.put(line_stderr)
+                self.response_event.set()
 
     def _read_stdout(self):
         """
         Continuously read lines from the CoreMiner process's stdout.
 
-        Each line read is stripped of whitespace and then attempted to be parsed as JSON. If successful,
+        Each line read is stripped of whitespace and then attempted to be decoded as feedback. If successful,
         line read is a feedback from the CoreMiner and is added to the feedback queue; otherwise, the line 
         is interpreted as output from the debuggee and added to the output queue.
         """
@@ -87,120 +327,895 @@ class CoreMinerProcess:
             if self.process.stdout:
                 line_stdout = self.process.stdout.readline().strip()
                 if line_stdout:
-                    try:
-                        # Try to parse as JSON
-                        self.queue_feedback.put(json.loads(line_stdout))
-                    except Exception as e:
-                        self.queue_output.put(str(line_stdout))
+                    self._put_stdout_line(line_stdout)
 
     def _read_stderr(self):
         """
         Continuously read lines from the CoreMiner process's stderr.
 
-        Each line read is stripped of whitespace and then attempted to be parsed as JSON. If JSON parsing fails,
-        the raw string is added to the stderr queue.
+        Each line read is stripped of whitespace and added to the stderr queue as it is.
         """
         while True:
             time.sleep(0.01)
             if self.process.stderr:
                 line_stderr = self.process.stderr.readline().strip()
                 if line_stderr:
-                    try:
-                        # Try to parse as JSON
-                        self.queue_stderr.put(json.loads(line_stderr))
-                    except json.JSONDecodeError:
-                        # If not JSON, store as a regular string
-                        self.queue_stderr.put(line_stderr)
+                    self.queue_stderr.put(line_stderr)
 
     def parse_command(self, command: str):
         """
         Parse a command string and send the corresponding JSON command to the CoreMiner process if valid.
 
         The command string is parsed using the CommandParser. If the parsed result indicates an error (i.e.,
-        contains a "feedback" key), the error feedback is added to the feedback queue. Otherwise, the
-        resulting JSON command is queued for sendingto the CoreMiner. If the command requires reloading 
-        basic information, the reload_basic_info method is invoked.
+        contains a "feedback" key), the feedback is parsed right away, because it does not answer a command
+        sent to the CoreMiner. If it contains a "hardhat" key, the command is executed by HardHat itself.
+        Otherwise, the resulting JSON command is scheduled for sending to the CoreMiner.
+        If the command requires reloading basic information, i.e. it changes the state of the debuggee,
+        the reload_basic_info method is invoked.
 
         Args:
             command (str): The input command string provided by the user.
         """
         self.data_store.set_output(f"--> {command}")
-        result_dict, reload_basic_info = self.command_parser.parse(command)
+        self._execute_command(command)
+
+    def _execute_command(self, command: str, looked_up: frozenset = frozenset()):
+        """
+        Parse a command string and execute the result, see `parse_command`.
+
+        Args:
+            command (str): The input command string provided by the user.
+            looked_up (frozenset): The (kind, name) pairs of the address expressions that were already fetched.
+        """
+        result_dict, reload_basic_info = self.command_parser.parse(command, looked_up)
         if result_dict:
             # If the parser returned a dict, check for an error and return feedback if present.
             if "feedback" in result_dict:
-                self.queue_feedback.put(result_dict)
+                self.feedback_parser.parse_feedback(decode_feedback(result_dict))
+                self._refresh_requested = True
+                self.response_event.set()
+            elif "hardhat" in result_dict:
+                for keyword, payload in result_dict["hardhat"].items():
+                    self.hardhat_command_handlers[keyword](payload)
+                # The command may have been answered locally, e.g. from a cache
+                self._refresh_requested = True
+                self.response_event.set()
+                self._send_next_command()
+            elif result_dict.get("status") == "Continue" and self.data_store.get_breakpoints().has_conditions():
+                # The conditions are checked by HardHat, which continues until a breakpoint triggers
+                self._invalidate_caches(result_dict)
+                self.auto_continue = AutoContinue(self)
+                self.auto_continue.start()
+                self._send_next_command()
             else:
-                # Otherwise, send the valid JSON command to the Rust process.
-                self.queue_commands.put((json.dumps(result_dict)))
-                if reload_basic_info == True:
-                    self.reload_basic_info()
+                self._send_user_command(result_dict, reload_basic_info)
+
+    def _send_user_command(self, command: dict, reload_basic_info: bool):
+        """
+        Send a JSON command entered by the user to the CoreMiner.
+
+        Args:
+            command (dict): The JSON command.
+            reload_basic_info (bool): True if the command changes the state of the debuggee.
+        """
+        self._invalidate_caches(command)
+        self.command_scheduler.put_user(json.dumps(command), state_changing=reload_basic_info)
+        if reload_basic_info == True:
+            self.reload_basic_info()
+        self._send_next_command()
+
+    def _handle_repeat(self, payload):
+        """
+        Run a stepping command several times back to back using a StepBatch.
+
+        Args:
+            payload (list): A pair [command, count] with the JSON stepping command and the number of steps.
+        """
+        command, count = payload
+        self._invalidate_caches(command)
+        self.step_batch = StepBatch(self, command, count)
+        self.step_batch.start()
+
+    def _handle_trace(self, payload):
+        """
+        Start recording an instruction trace, unless a trace is already being recorded.
+
+        Args:
+            payload (dict): The options of the trace with the keys "count", "until" and "registers".
+        """
+        if self.trace_recorder is not None and self.trace_recorder.running:
+            self.data_store.set_output("[hh][!]: A trace is already being recorded")
+            return
+        self.trace_recorder = TraceRecorder(
+            self, payload["count"], payload["until"], payload["registers"])
+        self.trace_recorder.start()
+
+    def _handle_trace_save(self, path):
+        """
+        Export the last recorded trace. Paths ending with ".csv" are written as CSV, anything else as binary.
+
+        Args:
+            path (str): The file to write.
+        """
+        if self.trace_recorder is None:
+            self.data_store.set_output("[hh][!]: No trace recorded")
+            return
+        try:
+            if path.lower().endswith(".csv"):
+                self.trace_recorder.export_csv(path)
+            else:
+                self.trace_recorder.export_binary(path)
+        except OSError as e:
+            self.data_store.set_output(f"[hh][!]: Could not save trace: {e}")
+            return
+        self.data_store.set_output(f"[hh]: Saved {len(self.trace_recorder)} instructions to {path}")
+
+    def _handle_disassemble(self, payload):
+        """
+        Show the disassembly of a range, fetching only the parts that are not in the disassembly cache.
+
+        Args:
+            payload (list): A pair [address, length] with the start address and the number of bytes.
+        """
+        address, length = payload
+        DisassemblyLookup(self, address, length).run()
+
+    def _handle_follow(self, enabled):
+        """
+        Enable or disable following RIP in the disassembly. When enabled, the current RIP is shown right away.
+
+        Args:
+            enabled (bool): True to follow RIP.
+        """
+        self.rip_follower.enabled = enabled
+        if enabled:
+            self.rip_follower.follow(self.data_store.get_rip())
+        self.data_store.set_output(f"[hh]: Follow RIP {'enabled' if enabled else 'disabled'}")
+
+    def _handle_hexdump(self, payload):
+        """
+        Read a range of memory through the memory cache and show it in the Hexdump widget.
+
+        Args:
+            payload (list): A pair [address, length] with the start address and the number of bytes.
+        """
+        address, length = payload
+        MemoryRead(self, address, length, self._show_hexdump).run()
+
+    def _show_hexdump(self, read: MemoryRead):
+        """
+        Show the bytes of a finished MemoryRead in the Hexdump widget and report how they were read.
+
+        Args:
+            read (MemoryRead): The finished read.
+        """
+        self.data_store.set_hexdump(read.start, read.data)
+        if read.error_address is not None:
+            self.data_store.set_output(
+                f"[hh][!]: Read {len(read.data):#x} of {read.length:#x} bytes at {read.start:#x}, "
+                f"{read.error_address:#x} is not readable")
+        else:
+            self.data_store.set_output(
+                f"[hh]: Read {read.length:#x} bytes at {read.start:#x} "
+                f"({read.fetched_words} words fetched, {read.cached_words} cached)")
+
+    def _handle_dump(self, payload):
+        """
+        Dump a memory range or a region of the memory map into a file, unless a dump is already running.
+
+        A region is looked up in the memory map, which is fetched first if it is stale.
+
+        Args:
+            payload (dict): The "path" of the file and either the "region" name or the "start" and "end" address.
+        """
+        if self.memory_dump is not None and self.memory_dump.running:
+            self.data_store.set_output("[hh][!]: A dump is already running")
+            return
+        if "region" not in payload:
+            self._start_dump(payload["start"], payload["end"], payload["path"])
+        else:
+            self._with_memory_map(lambda: self._dump_region(payload["region"], payload["path"]))
+
+    def _with_memory_map(self, callback: Callable[[], None]):
+        """
+        Call a function that needs the memory map, after fetching the map if it is stale.
+
+        Args:
+            callback (Callable[[], None]): The function to call once the memory map is current.
+        """
+        memory_map = self.data_store.get_memory_map()
+        if not memory_map.stale and len(memory_map):
+            callback()
+            return
+
+        def on_feedback(feedback):
+            if not isinstance(feedback, ProcessMapFeedback):
+                return self.feedback_parser.parse_feedback(feedback)
+            self.data_store.set_memory_map(feedback.regions)
+            callback()
+            return True
+
+        self.command_scheduler.put_user(PROCESS_MAP_COMMAND, on_feedback=on_feedback)
+
+    def _handle_search(self, payload):
+        """
+        Search the readable regions of the memory map (or the regions with the given name) for a byte pattern,
+        unless a search is already running.
+
+        Args:
+            payload (dict): The "pattern" as hex string, its "description" and the optional "region" name.
+        """
+        if self.memory_search is not None and self.memory_search.running:
+            self.data_store.set_output("[hh][!]: A search is already running, cancel it first")
+            return
+        self._with_memory_map(lambda: self._start_search(payload))
+
+    def _start_search(self, payload):
+        region_name = payload["region"]
+        regions = self.data_store.get_memory_map().readable_regions(region_name)
+        if not regions:
+            self.data_store.set_output(f"[hh][!]: No readable region named {region_name}")
+            return
+        where = region_name if region_name is not None else f"{len(regions)} readable regions"
+        self.data_store.start_search(f"{payload['description']} in {where}")
+        self.memory_search = MemorySearch(
+            self, bytes.fromhex(payload["pattern"]),
+            [(region.start_address, region.end_address) for region in regions])
+        self.memory_search.start()
+
+    def _handle_cancel(self, payload):
+        """
+        Cancel the running memory search, memory dump, auto-continue loop, step batch and trace. An interrupted dump
+        can be resumed later; the loops keep the debuggee stopped at their next stop. A Continue (or step over/out)
+        the CoreMiner did not answer yet is interrupted, so the debuggee stops where it is. Flushing the queued
+        commands finishes the jobs that were waiting for them.
+
+        Args:
+            payload (dict): "flush" is True to drop the queued commands as well.
+        """
+        cancelled = self._interrupt_running_command()
+        if payload["flush"]:
+            dropped = self._drop_queued_commands()
+            self.data_store.set_output(f"[hh]: Dropped {dropped} queued commands")
+            if cancelled:
+                # The reload queued with the interrupted command was dropped as well
+                self.reload_basic_info()
+            cancelled = True
+        if self.auto_continue is not None and self.auto_continue.running:
+            self.auto_continue.cancel()
+            cancelled = True
+        if self.memory_search is not None and self.memory_search.running:
+            self.memory_search.cancel()
+            cancelled = True
+        if self.memory_dump is not None and self.memory_dump.running:
+            self.memory_dump.cancel()
+            cancelled = True
+        if self.step_batch is not None and self.step_batch.running:
+            self.step_batch.cancel()
+            cancelled = True
+        if self.trace_recorder is not None and self.trace_recorder.running:
+            self.trace_recorder.cancel()
+            cancelled = True
+        if not cancelled:
+            self.data_store.set_output("[hh]: Nothing to cancel")
+
+    def _drop_queued_commands(self) -> int:
+        """
+        Remove all queued commands and let the jobs that wait for their feedback finish.
+
+        Returns:
+            int: The number of dropped commands.
+        """
+        dropped = self.command_scheduler.clear()
+        for scheduled in dropped:
+            if scheduled.on_dropped is not None:
+                scheduled.on_dropped()
+        return len(dropped)
+
+    def _interrupt_running_command(self) -> bool:
+        """
+        Interrupt the debuggee if the oldest command in flight runs it, like Ctrl-C in gdb. The CoreMiner
+        answers the command once the debuggee stopped.
+
+        Returns:
+            bool: True if a command was interrupted or could not be interrupted, False if none is running.
+        """
+        with self._in_flight_lock:
+            running = self.in_flight[0] if self.in_flight else None
+        if running is None or running.keyword not in INTERRUPTIBLE_COMMANDS:
+            return False
+        elapsed = time.perf_counter() - running.sent_at
+        debuggees = self._debuggee_pids()
+        if not debuggees:
+            self.data_store.set_output(f"[hh][!]: Could not find the debuggee to interrupt {running.keyword}")
+            return True
+        for pid in debuggees:
+            try:
+                os.kill(pid, signal.SIGINT)
+            except OSError as e:
+                self.data_store.set_output(f"[hh][!]: Could not interrupt the debuggee {pid}: {e}")
+                return True
+        self.data_store.set_output(f"[hh]: Interrupted {running.keyword} after {elapsed:.1f}s")
+        return True
+
+    def _debuggee_pids(self) -> list[int]:
+        """
+        Find the debuggee, i.e. the child processes of the CoreMiner, in /proc.
+
+        Returns:
+            list[int]: The process ids, empty if the CoreMiner is not running or /proc is not available.
+        """
+        if self.process is None or self.process.returncode is not None:
+            return []
+        parent = self.process.pid
+        children = []
+        try:
+            entries = os.listdir("/proc")
+        except OSError:
+            return []
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "r") as stat:
+                    # The command name in parentheses may contain spaces, the parent follows the state
+                    fields = stat.read().rsplit(")", 1)[1].split()
+            except (OSError, IndexError):
+                continue
+            if len(fields) > 1 and int(fields[1]) == parent:
+                children.append(int(entry))
+        return children
+
+    def pending_status(self) -> str:
+        """
+        Describe the command the CoreMiner is working on and the commands waiting for it.
+
+        Returns:
+            str: E.g. "Continue 12.3s, 5 queued", or an empty string if no command has been running for long.
+        """
+        with self._in_flight_lock:
+            running = self.in_flight[0] if self.in_flight else None
+            in_flight = len(self.in_flight)
+        if running is None:
+            return ""
+        elapsed = time.perf_counter() - running.sent_at
+        if elapsed < PENDING_INDICATOR_DELAY:
+            return ""
+        parts = [f"{running.keyword or 'Command'} {elapsed:.1f}s"]
+        if in_flight > 1:
+            parts.append(f"{in_flight} in flight")
+        queued = len(self.command_scheduler)
+        if queued:
+            parts.append(f"{queued} queued")
+        return ", ".join(parts)
+
+    def check_deadlines(self) -> bool:
+        """
+        Report the oldest command in flight once it missed its deadline, see COMMAND_DEADLINES. The commands
+        behind it can not be answered earlier, so only the oldest one is checked.
+
+        Returns:
+            bool: True if a command was reported and the widgets should be updated.
+        """
+        with self._in_flight_lock:
+            running = self.in_flight[0] if self.in_flight else None
+        if running is None or running.overdue:
+            return False
+        elapsed = time.perf_counter() - running.sent_at
+        deadline = COMMAND_DEADLINES.get(running.keyword, COMMAND_DEADLINE)
+        if elapsed < deadline:
+            return False
+        running.overdue = True
+        queued = len(self.command_scheduler)
+        hint = ("'cancel' interrupts the debuggee" if running.keyword in INTERRUPTIBLE_COMMANDS
+                else "the CoreMiner may be stuck")
+        self.data_store.set_output(
+            f"[hh][!]: {running.keyword or 'Command'} has not answered for {elapsed:.0f}s, {queued} commands "
+            f"queued; {hint}, 'cancel --flush' also drops the queue")
+        return True
+
+    def _handle_breakpoint(self, payload):
+        """
+        Set a breakpoint and add it to the breakpoint table. A condition or hit count is checked by HardHat
+        whenever the debuggee stops there.
+
+        Args:
+            payload (dict): The "address", the compiled "condition" (or None) and the "hits" that stops.
+        """
+        address = payload["address"]
+        conditional = None
+        if payload["condition"] is not None or payload["hits"] > 1:
+            conditional = ConditionalBreakpoint(address, payload["condition"], payload["hits"])
+        # Replaces the breakpoint at the same address, together with its condition
+        BreakpointBatch(
+            self, "SetBreakpoint", [address], "Set",
+            lambda address: self.data_store.add_breakpoint(address, conditional=conditional),
+            details=conditional.describe() if conditional is not None else "").start()
+
+    def _handle_delete_breakpoint(self, address):
+        """
+        Delete a breakpoint and remove it from the breakpoint table.
+
+        Args:
+            address (int): The address of the breakpoint.
+        """
+        entry = self.data_store.get_breakpoints().get(address)
+        if entry is not None and not entry.enabled:
+            # A disabled breakpoint is not set in the CoreMiner
+            self.data_store.remove_breakpoint(address)
+            self.data_store.set_output(f"[hh]: Deleted breakpoint at {address:#x}")
+            return
+        BreakpointBatch(self, "DelBreakpoint", [address], "Deleted", self.data_store.remove_breakpoint).start()
+
+    def _handle_breakpoint_list(self, payload):
+        """
+        Print the breakpoint table with the origin, condition and hits of every breakpoint.
+
+        Args:
+            payload: Unused.
+        """
+        breakpoints = self.data_store.get_breakpoints()
+        if not len(breakpoints):
+            self.data_store.set_output("[hh]: No breakpoints")
+            return
+        symbols = self.data_store.get_symbols()
+        lines = [f"[hh]: {len(breakpoints)} breakpoints, {len(breakpoints.addresses(enabled=True))} enabled"]
+        for entry in breakpoints:
+            columns = [f"{entry.address:#018x}", "on " if entry.enabled else "off",
+                       entry.origin or symbols.describe(entry.address)]
+            if entry.conditional is not None:
+                conditional = entry.conditional
+                columns.append(f"{conditional.describe()}, hit {conditional.hit_count} of {conditional.reached} times")
+            lines.append("  " + "  ".join(column for column in columns if column))
+        self.data_store.set_output("\n".join(lines))
+
+    def _handle_breakpoint_enable(self, payload):
+        """
+        Set disabled breakpoints again or delete enabled ones in the CoreMiner, keeping them in the table.
+
+        Args:
+            payload (dict): The "address" of the breakpoint (None for all breakpoints) and "enabled".
+        """
+        address, enabled = payload["address"], payload["enabled"]
+        breakpoints = self.data_store.get_breakpoints()
+        if address is None:
+            addresses = breakpoints.addresses(enabled=not enabled)
+        elif address not in breakpoints:
+            self.data_store.set_output(f"[hh][!]: No breakpoint at {address:#x}")
+            return
+        else:
+            addresses = [address] if breakpoints.is_active(address) != enabled else []
+        if not addresses:
+            self.data_store.set_output(f"[hh]: No breakpoint to {'enable' if enabled else 'disable'}")
+            return
+        BreakpointBatch(
+            self, "SetBreakpoint" if enabled else "DelBreakpoint", addresses, "Enabled" if enabled else "Disabled",
+            lambda address: self.data_store.set_breakpoint_enabled(address, enabled)).start()
+
+    def _handle_breakpoint_clear(self, payload):
+        """
+        Delete all breakpoints.
+
+        Args:
+            payload: Unused.
+        """
+        disabled = self.data_store.get_breakpoints().addresses(enabled=False)
+        for address in disabled:
+            self.data_store.remove_breakpoint(address)
+        addresses = self.data_store.get_breakpoints().addresses(enabled=True)
+        if not addresses:
+            self.data_store.set_output(f"[hh]: Deleted {len(disabled)} breakpoints" if disabled else "[hh]: No breakpoints")
+            return
+        BreakpointBatch(self, "DelBreakpoint", addresses, "Deleted", self.data_store.remove_breakpoint).start()
+
+    def _handle_breakpoint_regex(self, pattern):
+        """
+        Set a breakpoint on every known symbol whose name matches a regular expression.
+
+        Only the symbols in the session's SymbolIndex are searched, i.e. those that were looked up or appeared in
+        a backtrace, because the CoreMiner can not list all symbols of the debuggee.
+
+        Args:
+            pattern (re.Pattern): The compiled regular expression.
+        """
+        breakpoints = self.data_store.get_breakpoints()
+        origins = {address: name for name, address in self.data_store.get_symbols().matching(pattern)
+                   if not breakpoints.is_active(address)}
+        if not origins:
+            self.data_store.set_output(
+                f"[hh][!]: No known symbol without a breakpoint matches {pattern.pattern!r}; symbols are known "
+                f"once they were looked up (sym) or appeared in a backtrace")
+            return
+        BreakpointBatch(self, "SetBreakpoint", sorted(origins), "Set",
+                        lambda address: self.data_store.add_breakpoint(address, origins[address])).start()
+
+    def _handle_breakpoint_file(self, path, fetched: bool = False):
+        """
+        Set a breakpoint on every address expression listed in a file, one per line.
+
+        Symbols that are not cached are fetched from the CoreMiner back to back before the breakpoints are set.
+
+        Args:
+            path (str): The file to read; `#` starts a comment.
+            fetched (bool): True if the missing symbols were already fetched.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                lines = [line.split("#", 1)[0].strip() for line in file]
+        except OSError as e:
+            self.data_store.set_output(f"[hh][!]: Could not read {path}: {e}")
+            return
+
+        origins: dict[int, str] = {}
+        missing: set[str] = set()
+        invalid: list[str] = []
+        for number, expression in enumerate(lines, 1):
+            if not expression:
+                continue
+            try:
+                origins.setdefault(self.address_resolver.evaluate(expression), expression)
+            except UnresolvedName as e:
+                if e.kind == "symbol" and e.fetch and not fetched:
+                    missing.add(e.name)
+                else:
+                    invalid.append(f"line {number}: {e}")
+            except ValueError:
+                invalid.append(f"line {number}: invalid address {expression!r}")
+
+        if missing:
+            self._fetch_symbols(sorted(missing), lambda: self._handle_breakpoint_file(path, fetched=True))
+            return
+        if invalid:
+            self.data_store.set_output(f"[hh][!]: Skipped {len(invalid)} lines of {path}, first {invalid[0]}")
+        breakpoints = self.data_store.get_breakpoints()
+        addresses = [address for address in sorted(origins) if not breakpoints.is_active(address)]
+        if not addresses:
+            self.data_store.set_output(f"[hh]: No new breakpoints in {path}")
+            return
+        BreakpointBatch(self, "SetBreakpoint", addresses, "Set",
+                        lambda address: self.data_store.add_breakpoint(address, origins[address])).start()
+
+    def _fetch_symbols(self, names: list[str], on_done: Callable[[], None]):
+        """
+        Look up several symbols back to back and add them to the symbol index.
+
+        Args:
+            names (list[str]): The names of the symbols.
+            on_done (Callable[[], None]): Called once all symbols were answered.
+        """
+        pending = len(names)
+
+        def on_feedback(name, feedback):
+            nonlocal pending
+            if isinstance(feedback, SymbolsFeedback):
+                self.data_store.add_symbols(feedback.symbols)
+            if self.data_store.get_symbols().address_of(name) is None:
+                self.address_resolver.mark_missing(name)
+            pending -= 1
+            if pending == 0:
+                on_done()
+            return True
+
+        for name in names:
+            self.command_scheduler.put_user(
+                json.dumps({"status": {"GetSymbolsByName": name}}),
+                on_feedback=partial(on_feedback, name), quiet=True)
+
+    def _dump_region(self, name: str, path: str):
+        region = self.data_store.get_memory_map().find(name)
+        if region is None:
+            self.data_store.set_output(f"[hh][!]: No mapped region named {name}")
+            return
+        self._start_dump(region.start_address, region.end_address, path)
+
+    def _start_dump(self, start: int, end: int, path: str):
+        if end <= start:
+            self.data_store.set_output(f"[hh][!]: Invalid range {start:#x}-{end:#x}")
+            return
+        self.memory_dump = MemoryDump(self, start, end, path)
+        try:
+            self.memory_dump.start_dump()
+        except OSError as e:
+            self.memory_dump = None
+            self.data_store.set_output(f"[hh][!]: Could not write dump: {e}")
+
+    def _handle_resolve(self, payload):
+        """
+        Fetch a register or symbol of an address expression that is not cached, then execute the command again.
+
+        Args:
+            payload (dict): The "kind" and "name" to fetch, the "command" string and the (kind, name) pairs
+                already "looked_up" for it.
+        """
+        kind, name = payload["kind"], payload["name"]
+        looked_up = payload["looked_up"] | {(kind, name)}
+        if kind == "register":
+            command = {"status": "DumpRegisters"}
+        else:
+            command = {"status": {"GetSymbolsByName": name}}
+
+        def on_feedback(feedback):
+            if isinstance(feedback, RegistersFeedback):
+                # The live registers replace a restored snapshot, otherwise they would not count as fresh
+                self.data_store.return_to_live()
+                self.feedback_parser.parse_feedback(feedback)
+                self._registers_received()
+            elif isinstance(feedback, SymbolsFeedback):
+                self.data_store.add_symbols(feedback.symbols)
+                if self.data_store.get_symbols().address_of(name) is None:
+                    self.address_resolver.mark_missing(name)
+            else:
+                self.feedback_parser.parse_feedback(feedback)
+            # The command reports the unresolvable name itself
+            self._execute_command(payload["command"], looked_up)
+            return True
+
+        self.command_scheduler.put_user(json.dumps(command), on_feedback=on_feedback, quiet=True)
+
+    def _invalidate_caches(self, command: dict):
+        """
+        Invalidate the cached information that is changed by a command before the command is queued.
+
+        Args:
+            command (dict): The JSON command that will be sent to the CoreMiner.
+        """
+        status = command.get("status")
+        if isinstance(status, str):
+            status = {status: None}
+        elif not isinstance(status, dict):
+            return
+        for keyword, payload in status.items():
+            invalidator = self.cache_invalidators.get(keyword)
+            if invalidator is not None:
+                invalidator(payload)
+
+    def _invalidate_on_run(self, payload):
+        # A new debuggee has new code and may be loaded at other addresses
+        self.disassembly_cache.clear()
+        # The new debuggee starts without breakpoints; they stay in the table to be enabled again
+        self.data_store.disable_breakpoints()
+        self.data_store.clear_symbols()
+        self._invalidate_memory_map(payload)
+
+    def _registers_received(self) -> None:
+        """
+        Mark the registers in the data store as fresh for the current stop and record them in the snapshot log.
+        """
+        self.registers_generation = self.command_generation
+        self.data_store.record_snapshot(self.command_generation)
+
+    def _invalidate_memory_map(self, payload):
+        # The map is fetched again with the next reload of the basic information
+        self.data_store.get_memory_map().invalidate()
+
+    def _on_memory_map(self, feedback) -> bool:
+        """
+        Store the memory map fetched in the background, without printing it.
+
+        Args:
+            feedback (Feedback): The feedback of the ProcMap command.
+
+        Returns:
+            bool: Always True; without a debuggee there is no map and the stale one is kept.
+        """
+        if isinstance(feedback, ProcessMapFeedback):
+            self.data_store.set_memory_map(feedback.regions)
+        return True
+
+    def _invalidate_on_variable_write(self, payload):
+        # Only the [name, value] form writes the variable; its address is unknown, so everything is dropped
+        if isinstance(payload, list):
+            self.disassembly_cache.clear()
 
     def _send_command(self):
         """
         Continuously send JSON commands from the command queue to the CoreMiner process.
 
-        This method checks if there are any commands queued and if the previous command has finished executing.
-        When both conditions are met, the next command is written to the process's stdin and flushed.
+        Only used with the thread transport. This method checks if there are any commands queued that may be sent
+        now, see `_take_next_command`. All of them are written to the process's stdin and flushed at once.
         """
         while True:
             time.sleep(0.01)
             if self.process.stdin:
-                if not self.queue_commands.empty() and self.command_finished == True:
-                    command = self.queue_commands.get()
+                command = self._take_next_command()
+                if command is None:
+                    continue
+                while command is not None:
                     self.process.stdin.write(command + "\n")
-                    self.process.stdin.flush()
-                    self.command_finished = False
-                    self.data_store.set_responses_coreminer(command)
+                    command = self._take_next_command()
+                self.process.stdin.flush()
+
+    def _send_next_command(self):
+        """
+        Send the queued JSON commands that may be sent now to the CoreMiner process, see `_take_next_command`.
+
+        Only used with the asyncio transport, where there is no writer thread. It is called whenever a command
+        is queued and whenever a command finished. The asyncio stream writer buffers the data, so writing never
+        blocks the event loop.
+        """
+        if self.transport != TRANSPORT_ASYNCIO or self.process is None:
+            return
+        command = self._take_next_command()
+        while command is not None:
+            self.process.stdin.write((command + "\n").encode())
+            command = self._take_next_command()
+
+    def _take_next_command(self) -> Optional[str]:
+        """
+        Take the next command from the scheduler if it may be sent now and mark it as in flight.
+
+        A command is sent once all commands in flight finished. A read-only command is also sent while only
+        read-only commands are in flight and the pipeline window is not full, so state-changing commands stay
+        serialized: nothing overlaps them and they never overtake a read.
+
+        Returns:
+            Optional[str]: The JSON command to write to the CoreMiner, or None if nothing can be sent now.
+        """
+        with self._in_flight_lock:
+            if not self.in_flight:
+                scheduled = self.command_scheduler.get()
+            elif self.in_flight[-1].read_only and len(self.in_flight) < self.pipeline_window:
+                scheduled = self.command_scheduler.get(read_only=True)
+            else:
+                return None
+            if scheduled is None:
+                return None
+            scheduled.sent_at = time.perf_counter()
+            self.in_flight.append(scheduled)
+        if not scheduled.quiet:
+            self.data_store.set_responses_coreminer(scheduled.command_json)
+        return scheduled.command_json
 
     def get_response(self):
         """
-        Retrieve and process responses from the CoreMiner process.
+        Retrieve and process all waiting responses from the CoreMiner process in one batch.
 
-        This method checks for JSON feedback in the feedback queue and processes it using the FeedbackParser,
-        which updates the data store. If a command executes successfully, the command_finished flag is set.
-        Additionally, if there is non-JSON output in the output queue, it updates the debuggee output in the data store.
-        The method returns True when a complete response has been processed and the command queue is empty to trigger
-        the TUI to reload the information of each widget. Due to performance issues we only update the widgets when
-        the comamnd queue is empty insetad of after every command.
+        This method drains the output, stderr and feedback queues in a single pass. Non-JSON output and stderr
+        messages are appended to the debuggee output in the data store, JSON feedback is processed using the
+        FeedbackParser, which updates the data store. Every feedback finishes the oldest command in flight, after
+        which the next commands are sent.
+        The pass stops early when the time budget is used up, so a huge burst of responses can not block the TUI;
+        the rest is handled by the next call. Due to performance issues the caller should only update the widgets
+        once per batch and only when the command queue is empty instead of after every command.
 
         Returns:
-            bool: True if a response (feedback or output) was processed and the command is finished, False otherwise.
+            bool: True if at least one response was processed and the widgets should be updated, False otherwise.
         """
-        # Check for non-JSON output from the debuggee
-        while not self.queue_output.empty():
-            output = self.queue_output.get()
-            self.data_store.set_output("[d]: " + output)
-            if self.queue_output.empty():
-                return True
-            
-        while not self.queue_stderr.empty():
-            output = self.queue_stderr.get()
-            self.data_store.set_output("[d][!]: " + output)
-            if self.queue_stderr.empty():
-                return True
+        deadline = time.perf_counter() + self.response_time_budget
+        processed = self._refresh_requested
+        self._refresh_requested = False
+        command_failed = False
 
-        if not self.queue_feedback.empty():
-            feedback = self.queue_feedback.get()
-            executed_successfull = self.feedback_parser.parse_feedback(
-                feedback)
-            if executed_successfull:
-                self.command_finished = True
-                if self.queue_commands.empty():  # Only update TUI when the commands queue is empty
-                    return True
-            else:  # command unsuccessfull clear commands queue and send signal TRUE to update content of the widgets
-                while not self.queue_commands.empty():
-                    self.queue_commands.get()
-                self.command_finished = True
-                return True
-        return False
+        while True:
+            if not self.queue_output.empty():
+                # Non-JSON output from the debuggee
+                output = self.queue_output.get()
+                self.data_store.set_output("[d]: " + output)
+            elif not self.queue_stderr.empty():
+                output = self.queue_stderr.get()
+                self.data_store.set_output("[d][!]: " + output)
+            elif not self.queue_feedback.empty():
+                feedback = self.queue_feedback.get()
+                with self._in_flight_lock:
+                    scheduled = self.in_flight.popleft() if self.in_flight else None
+                    sent_before_failure = self._cleared_in_flight > 0
+                    if sent_before_failure:
+                        self._cleared_in_flight -= 1
+                if scheduled is not None:
+                    self.command_generation = scheduled.stop_generation
+                if scheduled is not None and scheduled.on_feedback is not None:
+                    # The command was issued by HardHat, which handles the feedback itself
+                    if not scheduled.quiet:
+                        self.data_store.set_responses_coreminer(feedback.raw)
+                    executed_successfull = scheduled.on_feedback(feedback)
+                else:
+                    if isinstance(feedback, SNAPSHOT_FEEDBACK_TYPES):
+                        # New state replaces the restored one, which must not be recorded for the new stop
+                        self.data_store.return_to_live()
+                    executed_successfull = self.feedback_parser.parse_feedback(
+                        feedback)
+                    if isinstance(feedback, RegistersFeedback):
+                        self._registers_received()
+                    elif isinstance(feedback, SNAPSHOT_FEEDBACK_TYPES):
+                        self.data_store.record_snapshot(self.command_generation)
+                if not executed_successfull:  # command unsuccessfull clear commands queue
+                    if not sent_before_failure:
+                        # The pipelined commands still in flight belong to the cleared queue, so their failures must
+                        # not drop the commands queued after this one
+                        with self._in_flight_lock:
+                            self._cleared_in_flight = len(self.in_flight)
+                        self._drop_queued_commands()
+                    command_failed = True
+                self._send_next_command()
+            else:
+                break
+
+            processed = True
+            if time.perf_counter() >= deadline:
+                break
+
+        # Only update TUI when the commands queue is empty or a command failed, or a long job reports progress
+        update = processed and (command_failed or self.command_scheduler.empty() or self._update_requested)
+        self._update_requested = False
+        # A new RIP that is already disassembled is shown right away, without waiting for the prefetch
+        followed = self.rip_follower.check()
+        self._send_next_command()
+        return update or followed
+
+    def request_update(self):
+        """
+        Update the widgets after the current batch of responses even though commands are still queued.
+
+        Used by long running jobs like memory dumps to show their progress.
+        """
+        self._update_requested = True
+
+    def state_changed(self) -> None:
+        """
+        Increment the stop generation after a command changed the debuggee state.
+
+        Cached memory pages and resolved registers belong to the stop before and are fetched again when needed.
+        Nothing is reloaded; batches that change the state many times call this after every step and reload the
+        basic information once they finish.
+        """
+        self.stop_generation += 1
+        self.command_scheduler.stop_generation = self.stop_generation
 
     def reload_basic_info(self):
         """
         Enqueue commands to reload basic information from the debuggee.
-        This method queues commands to retrieve the current register values and the stack from the debuggee.
+
+        The debuggee state changed, so the stop generation is incremented. Only the commands returned by the
+        reload provider (i.e. the information that is currently displayed) are queued; everything else becomes
+        stale and is fetched by `reload_stale` once it is displayed again. The memory map is only fetched again if
+        a command may have changed it.
+        """
+        self.state_changed()
+        self.data_store.return_to_live()
+        if self.reload_provider is None:
+            commands = DEFAULT_RELOAD_COMMANDS
+            self.rip_follower.visible = True
+        else:
+            commands = self.reload_provider()
+            self.rip_follower.visible = FOLLOW_RIP_COMMAND in commands
+        self._queue_reload_commands(commands)
+        if self.data_store.get_memory_map().stale:
+            self.command_scheduler.put_refresh(PROCESS_MAP_COMMAND, on_feedback=self._on_memory_map)
+
+    def reload_stale(self, commands: list[dict]):
+        """
+        Enqueue the given reload commands if their result is older than the current stop generation.
+
+        Called when a widget becomes visible, so it shows the current state without reloading everything.
+
+        Args:
+            commands (list[dict]): The reload commands of the widget that became visible.
+        """
+        if FOLLOW_RIP_COMMAND in commands and not self.rip_follower.visible:
+            self.rip_follower.visible = True
+            # Stale registers are reloaded below and followed when they arrive
+            if self.rip_follower.enabled and self.registers_generation == self.stop_generation:
+                self.rip_follower.follow(self.data_store.get_rip())
+        stale_commands = [
+            command for command in commands
+            if command != FOLLOW_RIP_COMMAND
+            and self._reload_generations.get(json.dumps(command), 0) != self.stop_generation
+        ]
+        if stale_commands:
+            self._queue_reload_commands(stale_commands)
+            self._send_next_command()
+
+    def _queue_reload_commands(self, commands: list[dict]):
+        """
+        Enqueue reload commands and remember the stop generation they were fetched for.
+
+        Args:
+            commands (list[dict]): The reload commands to queue.
         """
-        self.queue_commands.put((json.dumps({"status": "DumpRegisters"})))
-        self.queue_commands.put((json.dumps({"status": "GetStack"})))
-        self.queue_commands.put((json.dumps({"status": "Backtrace"})))
-        return
+        for command in commands:
+            if command == FOLLOW_RIP_COMMAND:
+                # Handled by the RipFollower once the registers arrived
+                continue
+            command_json = json.dumps(command)
+            self._reload_generations[command_json] = self.stop_generation
+            self.command_scheduler.put_refresh(command_json)
@@ -1,4 +1,19 @@
-from typing import Optional
+import mmap
+from array import array
+from typing import Callable, Optional
+
+from breakpoint_condition import ConditionalBreakpoint
+from breakpoint_table import BreakpointTable
+from disassembly_model import DisassemblyModel
+from memory_map import MemoryMap
+from snapshot_log import SnapshotLog
+from ring_buffer import RingBuffer, DEFAULT_MAX_LINES, DEFAULT_MAX_BYTES
+from symbol_index import SymbolIndex
+
+# Every field that carries a generation counter and can be subscribed to
+FIELDS = ("responses_coreminer", "registers", "stack", "rip", "output", "disassembly", "backtrace", "symbols",
+          "memory_map", "hexdump", "memory_file",
+          "search", "snapshots", "breakpoints")
 
 class DataStore:
     """
@@ -7,90 +22,403 @@ class DataStore:
     This class stores information such as responses from CoreMiner, register values, the stack,
     the instruction pointer (RIP), output messages, and disassembly information. Widgets and other
     components can query and update this shared data store to reflect the current state of the debuggee.
+
+    Every field carries a generation counter that is incremented by its setter. Components can subscribe to
+    a field; after a batch of updates `notify_subscribers` calls the subscribers of the changed fields only.
     """
 
-    def __init__(self):
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 output_spill_path: Optional[str] = None, responses_spill_path: Optional[str] = None):
         """
         Initialize the DataStore with default empty values.
 
+        The output and the responses from CoreMiner grow during the whole session, so they are kept in bounded
+        ring buffers. Lines exceeding the caps are dropped or, if a spill path is given, appended to that file.
+
+        Args:
+            max_lines (int): Maximum number of lines kept for the output and for the responses each.
+            max_bytes (int): Maximum number of characters kept for the output and for the responses each.
+            output_spill_path (Optional[str]): File receiving output lines that drop out of the buffer.
+            responses_spill_path (Optional[str]): File receiving responses that drop out of the buffer.
+
         Attributes:
-            responses_coreminer (Optional[str]): Stores concatenated responses from CoreMiner. Initialized as None.
-            registers (str): Stores the current register values as a string.
-            stack (str): Stores the current stack as a string.
+            responses_coreminer (RingBuffer): Stores the responses from CoreMiner line by line.
+            registers (dict[str, int]): Stores the current register values by register name.
+            snapshots (SnapshotLog): The registers, stack and backtrace of the recent stops.
+            snapshot_stop (Optional[int]): The stop whose snapshot is shown instead of the live state, if any.
+            breakpoints (BreakpointTable): The breakpoints set by HardHat.
+            stack_start (int): The address of the first word of the current stack.
+            stack_words (list[int]): The words of the current stack.
             rip (str): Stores the current instruction pointer (RIP) as a string.
-            output (str): Stores debuggee output messages.
-            disassembly (str): Stores disassembly information.
+            output (RingBuffer): Stores debuggee output messages line by line.
+            disassembly (DisassemblyModel): Stores the disassembled instructions in columnar form.
+            backtrace (str): Stores the current backtrace as a string.
+            symbols (SymbolIndex): The symbols learned during the session.
+            memory_map (MemoryMap): The regions of the last process map.
+            hexdump_start (int): The address of the first byte of the last hexdump.
+            hexdump_data (bytes): The bytes of the last hexdump.
+            memory_file_start (int): The address of the first byte of the last memory dump.
+            memory_file_path (str): The file of the last memory dump.
+            memory_file_data (mmap.mmap | bytes): The last memory dump, mapped read-only.
+            search_results (array): The addresses found by the last memory search.
+            search_status (str): The pattern and the progress of the last memory search.
         """
-        self.responses_coreminer: Optional[str] = None
-        self.registers = ""
-        self.stack = ""
+        self.responses_coreminer = RingBuffer(max_lines, max_bytes, responses_spill_path)
+        self.registers: dict[str, int] = {}
+        self.snapshots = SnapshotLog()
+        self.snapshot_stop: Optional[int] = None
+        self.breakpoints = BreakpointTable()
+        self.stack_start = 0
+        self.stack_words: list[int] = []
         self.rip = ""
-        self.output = ""
-        self.disassembly = ""
+        self.output = RingBuffer(max_lines, max_bytes, output_spill_path)
+        self.disassembly = DisassemblyModel()
         self.backtrace = ""
+        self.symbols = SymbolIndex()
+        self.memory_map = MemoryMap()
+        self.hexdump_start = 0
+        self.hexdump_data = b""
+        self.memory_file_start = 0
+        self.memory_file_path = ""
+        self.memory_file_data = b""
+        self.search_results = array("Q")
+        self.search_description = ""
+        self.search_status = ""
+
+        self.generations = dict.fromkeys(FIELDS, 0)
+        self._subscribers: dict[str, list[Callable[[], None]]] = {field: [] for field in FIELDS}
+        self._dirty_fields: set[str] = set()
+
+    def _changed(self, field: str) -> None:
+        """
+        Increment the generation of a field and remember it for the next notification.
+
+        Args:
+            field (str): The name of the changed field.
+        """
+        self.generations[field] += 1
+        self._dirty_fields.add(field)
+
+    def get_generation(self, field: str) -> int:
+        return self.generations[field]
+
+    def subscribe(self, field: str, callback: Callable[[], None]) -> None:
+        """
+        Register a callback that is called by `notify_subscribers` whenever the field changed.
+
+        Args:
+            field (str): The name of the field, one of FIELDS.
+            callback (Callable[[], None]): The function to call, e.g. the `update_content` method of a widget.
+        """
+        self._subscribers[field].append(callback)
+
+    def unsubscribe(self, field: str, callback: Callable[[], None]) -> None:
+        """
+        Remove a callback registered with `subscribe`.
+
+        Args:
+            field (str): The name of the field.
+            callback (Callable[[], None]): The function that was registered.
+        """
+        if callback in self._subscribers[field]:
+            self._subscribers[field].remove(callback)
+
+    def flush_spill(self) -> None:
+        """
+        Write the lines spilled from the output and response buffers to their files.
+        """
+        self.output.flush()
+        self.responses_coreminer.flush()
+
+    def close(self) -> None:
+        """
+        Close the spill files of the output and response buffers.
+        """
+        self.output.close()
+        self.responses_coreminer.close()
+
+    def notify_subscribers(self) -> None:
+        """
+        Call the subscribers of every field that changed since the last notification.
+
+        A callback subscribed to several changed fields is only called once.
+        """
+        if not self._dirty_fields:
+            return
+        dirty_fields = self._dirty_fields
+        self._dirty_fields = set()
+
+        callbacks = []
+        for field in FIELDS:
+            if field in dirty_fields:
+                for callback in self._subscribers[field]:
+                    if callback not in callbacks:
+                        callbacks.append(callback)
+        for callback in callbacks:
+            callback()
 
     def set_responses_coreminer(self, response: str) -> None:
         """
         Append a new response from CoreMiner to the stored responses.
 
-        If responses already exist, the new response is appended on a new line.
-        Otherwise, the response is set as the initial value.
+        The response is appended on a new line of the ring buffer.
 
         Args:
             response (str): The response string from CoreMiner to be added.
         """
-        if self.responses_coreminer:
-            self.responses_coreminer += f"\n{response}"
-        else:
-            self.responses_coreminer = response
+        self.responses_coreminer.append(response)
+        self._changed("responses_coreminer")
 
     def get_responses_coreminer(self) -> str:
+        return self.responses_coreminer.text()
+
+    def get_responses_coreminer_buffer(self) -> RingBuffer:
         return self.responses_coreminer
     
-    def set_registers(self, response: str) -> None:
+    def set_registers(self, response: dict[str, int]) -> None:
         self.registers = response
+        self._changed("registers")
 
     def get_registers(self) -> str:
+        return "\n".join(f"  {name}: {value:0x}" for name, value in self.registers.items())
+
+    def get_register_values(self) -> dict[str, int]:
         return self.registers
+
+    def get_changed_registers(self) -> set[str]:
+        """
+        Get the registers whose value changed between the shown stop and the recorded stop before it.
+        """
+        snapshots = self.snapshots
+        index = len(snapshots) - 1 if self.snapshot_stop is None else snapshots.index_of_stop(self.snapshot_stop)
+        if not snapshots or index is None:
+            return set()
+        return {name for name, changed in zip(snapshots.names, snapshots.changed(index)) if changed}
     
-    def set_stack(self, response: str) -> None:
-        self.stack = response
+    def set_stack(self, start_addr: int, words: list[int]) -> None:
+        self.stack_start = start_addr
+        self.stack_words = words
+        self._changed("stack")
 
     def get_stack(self) -> str:
-        return self.stack
+        return "\n".join(f"  {self.stack_start + 8 * i:016x}: {word:016x}" for i, word in enumerate(self.stack_words))
+
+    def get_stack_words(self) -> tuple[int, list[int]]:
+        return self.stack_start, self.stack_words
     
     def set_output(self, response: str) -> None:
         """
         Append a new output message to the stored debuggee output.
 
-        If output already exists, the new message is appended on a new line.
-        Otherwise, the response is set as the initial output.
+        The message is appended on a new line of the ring buffer.
 
         Args:
             response (str): The output message to be added.
         """
-        if self.output:
-            self.output += f"\n{response}"
-        else:
-            self.output = response
+        self.output.append(response)
+        self._changed("output")
 
     def get_output(self) -> str:
+        return self.output.text()
+
+    def get_output_buffer(self) -> RingBuffer:
         return self.output
     
-    def set_disassembly(self, response: str) -> None:
+    def set_disassembly(self, response: DisassemblyModel) -> None:
         self.disassembly = response
+        self._changed("disassembly")
     
     def get_disassembly(self) -> str:
+        return self.disassembly.text()
+
+    def get_disassembly_model(self) -> DisassemblyModel:
         return self.disassembly
     
     def set_rip(self, response: str) -> None:
         self.rip = response
+        self._changed("rip")
 
     def get_rip(self) -> str:
         return self.rip
     
     def set_backtrace(self, response: str) -> None:
         self.backtrace = response
+        self._changed("backtrace")
 
     def get_backtrace(self) -> str:
         return self.backtrace
+
+    def record_snapshot(self, stop: int) -> None:
+        """
+        Record the current registers, stack and backtrace as the snapshot of a stop.
+
+        Only the live state is recorded; the caller returns to it with `return_to_live` before the new state is
+        stored, otherwise the registers of a restored snapshot would be recorded for the new stop.
+
+        Args:
+            stop (int): The stop generation the state belongs to.
+        """
+        if not self.registers or self.snapshot_stop is not None:
+            return
+        self.snapshots.record(stop, self.registers, self.stack_start, self.stack_words, self.backtrace)
+        self._changed("snapshots")
+
+    def restore_snapshot(self, index: int) -> None:
+        """
+        Show the registers, stack and backtrace of a recorded stop in every widget.
+
+        Restoring the newest snapshot returns to the live state. RIP is replaced without marking it as changed, so
+        the RipFollower does not move the disassembly window or prefetch around a restored RIP; the Disassembly
+        widget moves its highlight when the snapshots change.
+
+        Args:
+            index (int): The index of the snapshot in the snapshot log.
+        """
+        state = self.snapshots.state(index)
+        self.snapshot_stop = None if index == len(self.snapshots) - 1 else state.stop
+        self.set_registers(state.registers)
+        self.rip = state.registers.get("rip", 0)
+        self.set_stack(state.stack_start, state.stack_words)
+        self.set_backtrace(state.backtrace)
+        self._changed("snapshots")
+
+    def return_to_live(self) -> None:
+        """
+        Restore the newest snapshot if an earlier one is shown.
+        """
+        if self.snapshot_stop is not None:
+            self.restore_snapshot(len(self.snapshots) - 1)
+
+    def get_snapshots(self) -> SnapshotLog:
+        return self.snapshots
+
+    def add_breakpoint(self, address: int, origin: str = "",
+                       conditional: Optional[ConditionalBreakpoint] = None) -> None:
+        self.breakpoints.add(address, origin, conditional)
+        self._changed("breakpoints")
+
+    def remove_breakpoint(self, address: int) -> None:
+        self.breakpoints.remove(address)
+        self._changed("breakpoints")
+
+    def set_breakpoint_enabled(self, address: int, enabled: bool) -> None:
+        self.breakpoints.set_enabled(address, enabled)
+        self._changed("breakpoints")
+
+    def disable_breakpoints(self) -> None:
+        for address in self.breakpoints.addresses(enabled=True):
+            self.breakpoints.set_enabled(address, False)
+        self.breakpoints.reset_statistics()
+        self._changed("breakpoints")
+
+    def get_breakpoints(self) -> BreakpointTable:
+        return self.breakpoints
+
+    def add_symbols(self, symbols) -> None:
+        """
+        Add the symbols of a Symbols feedback to the symbol index.
+
+        Args:
+            symbols (list[Symbol]): The decoded symbols.
+        """
+        generation = self.symbols.generation
+        self.symbols.add_symbols(symbols)
+        if self.symbols.generation != generation:
+            self._changed("symbols")
+
+    def add_frame_symbols(self, frames) -> None:
+        """
+        Add the functions of the frames of a Backtrace feedback to the symbol index.
+
+        Args:
+            frames (list[Frame]): The decoded frames.
+        """
+        generation = self.symbols.generation
+        self.symbols.add_frames(frames)
+        if self.symbols.generation != generation:
+            self._changed("symbols")
+
+    def clear_symbols(self) -> None:
+        self.symbols.clear()
+        self._changed("symbols")
+
+    def get_symbols(self) -> SymbolIndex:
+        return self.symbols
+
+    def set_memory_map(self, regions) -> None:
+        """
+        Replace the memory map with the regions of a ProcessMap feedback.
+
+        Args:
+            regions (list[MemoryRegion]): The decoded regions.
+        """
+        self.memory_map.update(regions)
+        self._changed("memory_map")
+
+    def get_memory_map(self) -> MemoryMap:
+        return self.memory_map
+
+    def set_hexdump(self, start_addr: int, data: bytes) -> None:
+        self.hexdump_start = start_addr
+        self.hexdump_data = data
+        self._changed("hexdump")
+
+    def get_hexdump(self) -> tuple[int, bytes]:
+        return self.hexdump_start, self.hexdump_data
+
+    def set_memory_file(self, start_addr: int, path: str, data) -> None:
+        """
+        Replace the displayed memory dump, closing the mapping of the previous one.
+
+        Args:
+            start_addr (int): The address of the first byte of the dump.
+            path (str): The dump file.
+            data (mmap.mmap | bytes): The mapped dump file.
+        """
+        if isinstance(self.memory_file_data, mmap.mmap):
+            self.memory_file_data.close()
+        self.memory_file_start = start_addr
+        self.memory_file_path = path
+        self.memory_file_data = data
+        self._changed("memory_file")
+
+    def get_memory_file(self):
+        return self.memory_file_start, self.memory_file_data
+
+    def start_search(self, description: str) -> None:
+        """
+        Drop the results of the previous memory search.
+
+        Args:
+            description (str): The pattern and the searched regions, shown above the results.
+        """
+        self.search_results = array("Q")
+        self.search_description = description
+        self.search_status = description
+        self._changed("search")
+
+    def add_search_results(self, addresses: list[int]) -> None:
+        self.search_results.extend(addresses)
+        self._changed("search")
+
+    def set_search_status(self, status: str) -> None:
+        self.search_status = f"{self.search_description}: {status}"
+        self._changed("search")
+
+    def get_search_results(self) -> tuple[str, array]:
+        return self.search_status, self.search_results
+
+    def describe_address(self, address: int) -> str:
+        """
+        Annotate a word that may be a pointer, preferring the symbol it points into over its memory region.
+
+        Args:
+            address (int): The word to describe.
+
+        Returns:
+            str: E.g. "<main+0x10>", "[heap]" or "libc.so.6+0x29d90", or an empty string if nothing is known.
+        """
+        symbol = self.symbols.describe(address)
+        if symbol:
+            return f"<{symbol}>"
+        return self.memory_map.describe(address)
@@ -0,0 +1,308 @@
+"""
+Module for caching disassembled instructions on the client side.
+
+This module defines the DisassemblyCache class, which keeps every instruction disassembled by the CoreMiner
+indexed by its address, together with the byte ranges that have been disassembled. Repeated or overlapping
+`dis` requests are answered from the cache and only the missing ranges are fetched with DisassembleAt.
+The DisassemblyLookup class performs such a request. The cache is invalidated precisely when the memory of
+the debuggee is written or a new debuggee is run. Breakpoint markers are not taken from the cached instructions
+but from the breakpoint table, so setting or deleting a breakpoint keeps the cache.
+"""
+
+import json
+from bisect import bisect_left, bisect_right
+from functools import partial
+from typing import Optional
+
+from feedback_decoder import DisassemblyFeedback, Feedback
+
+
+class DisassemblyCache:
+    """
+    Disassembled instructions indexed by address.
+
+    The cache remembers the byte ranges [start, end) that were disassembled. A range always starts and ends at
+    instruction boundaries, so a missing range can be disassembled on its own and joined with its neighbours.
+
+    Attributes:
+        generation (int): The memory generation; incremented whenever cached instructions are invalidated.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty DisassemblyCache.
+        """
+        self._addresses: list[int] = []
+        self._instructions: dict[int, list] = {}
+        self._range_starts: list[int] = []
+        self._range_ends: list[int] = []
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def missing_ranges(self, start: int, end: int) -> list[tuple[int, int]]:
+        """
+        Get the ranges of [start, end) that have not been disassembled yet.
+
+        If start lies inside a disassembled range but is no instruction boundary, the whole range has to be
+        disassembled again from start, because the instructions are decoded differently from there.
+
+        Args:
+            start (int): The first address.
+            end (int): The address after the last byte.
+
+        Returns:
+            list[tuple[int, int]]: The missing ranges as (start, end) pairs in ascending order.
+        """
+        index = bisect_right(self._range_starts, start) - 1
+        if index >= 0 and start < self._range_ends[index] and start not in self._instructions:
+            return [(start, end)]
+
+        missing = []
+        position = start
+        while position < end:
+            index = bisect_right(self._range_starts, position) - 1
+            if index >= 0 and position < self._range_ends[index]:
+                position = self._range_ends[index]
+                continue
+            if index + 1 < len(self._range_starts):
+                gap_end = min(end, self._range_starts[index + 1])
+            else:
+                gap_end = end
+            missing.append((position, gap_end))
+            position = gap_end
+        return missing
+
+    def store(self, start: int, length: int, instructions: list) -> None:
+        """
+        Store the instructions disassembled from a range, replacing the cached instructions they overlap.
+
+        Args:
+            start (int): The address the range was disassembled from.
+            length (int): The number of bytes that were requested.
+            instructions (list): The instructions of a DisassemblyFeedback.
+        """
+        end = start + length
+        if instructions:
+            last = instructions[-1]
+            end = max(end, last[0] + len(last[1]))
+        self._discard(start, end)
+
+        for entry in instructions:
+            address = entry[0]
+            if address not in self._instructions:
+                self._addresses.insert(bisect_left(self._addresses, address), address)
+            self._instructions[address] = entry
+        self._add_range(start, end)
+
+    def instructions(self, start: int, end: int) -> list:
+        """
+        Get the cached instructions that start inside [start, end).
+
+        Args:
+            start (int): The first address.
+            end (int): The address after the last byte.
+
+        Returns:
+            list: The instructions in ascending order.
+        """
+        lo = bisect_left(self._addresses, start)
+        hi = bisect_left(self._addresses, end)
+        return [self._instructions[address] for address in self._addresses[lo:hi]]
+
+    def is_instruction(self, address: int) -> bool:
+        """
+        Check whether a cached instruction starts at the given address.
+        """
+        return address in self._instructions
+
+    def preceding_address(self, address: int, count: int) -> int:
+        """
+        Get the address of the cached instruction `count` instructions before the given one.
+
+        Only instructions of the same disassembled range are considered, since only those are known to lead up to
+        the given instruction.
+
+        Args:
+            address (int): The address of a cached instruction.
+            count (int): How many instructions to go back.
+
+        Returns:
+            int: The address of the preceding instruction, or the given address if it is not cached.
+        """
+        if address not in self._instructions:
+            return address
+        index = bisect_left(self._addresses, address)
+        range_start = self._range_starts[bisect_right(self._range_starts, address) - 1]
+        first = bisect_left(self._addresses, range_start)
+        return self._addresses[max(first, index - count)]
+
+    def invalidate(self, start: int, length: int) -> None:
+        """
+        Drop the cached instructions that overlap the given bytes, e.g. after the memory was written.
+
+        Args:
+            start (int): The first changed address.
+            length (int): The number of changed bytes.
+        """
+        self._discard(start, start + length)
+        self.generation += 1
+
+    def clear(self) -> None:
+        """
+        Drop all cached instructions, e.g. when a new debuggee is run.
+        """
+        self._addresses.clear()
+        self._instructions.clear()
+        self._range_starts.clear()
+        self._range_ends.clear()
+        self.generation += 1
+
+    def _discard(self, start: int, end: int) -> None:
+        """
+        Remove all instructions overlapping [start, end) and the bytes they cover from the disassembled ranges.
+        """
+        lo = bisect_left(self._addresses, start)
+        if lo > 0:
+            previous = self._addresses[lo - 1]
+            if previous + len(self._instructions[previous][1]) > start:
+                lo -= 1
+        hi = bisect_left(self._addresses, end)
+        if lo < hi:
+            start = min(start, self._addresses[lo])
+            last = self._addresses[hi - 1]
+            end = max(end, last + len(self._instructions[last][1]))
+            for address in self._addresses[lo:hi]:
+                del self._instructions[address]
+            del self._addresses[lo:hi]
+        self._remove_range(start, end)
+
+    def _add_range(self, start: int, end: int) -> None:
+        """
+        Mark [start, end) as disassembled, merging it with overlapping and adjacent ranges.
+        """
+        lo = bisect_left(self._range_ends, start)
+        hi = bisect_right(self._range_starts, end)
+        if lo < hi:
+            start = min(start, self._range_starts[lo])
+            end = max(end, self._range_ends[hi - 1])
+        self._range_starts[lo:hi] = [start]
+        self._range_ends[lo:hi] = [end]
+
+    def _remove_range(self, start: int, end: int) -> None:
+        """
+        Mark [start, end) as not disassembled, cutting the ranges that overlap it.
+        """
+        lo = bisect_right(self._range_ends, start)
+        hi = bisect_left(self._range_starts, end)
+        if lo >= hi:
+            return
+        starts = []
+        ends = []
+        if self._range_starts[lo] < start:
+            starts.append(self._range_starts[lo])
+            ends.append(start)
+        if self._range_ends[hi - 1] > end:
+            starts.append(end)
+            ends.append(self._range_ends[hi - 1])
+        self._range_starts[lo:hi] = starts
+        self._range_ends[lo:hi] = ends
+
+
+class DisassemblyLookup:
+    """
+    Shows the disassembly of a range, fetching only the parts that are not cached.
+
+    One DisassembleAt command is sent for every missing range. When all of them answered, the range is displayed
+    from the cache. If the cache was invalidated while the commands were in flight, their results are not stored
+    and the lookup starts over.
+
+    Only the first `display_length` bytes are displayed; the rest of the range is fetched ahead into the cache.
+    If the displayed part is cached already, it is displayed right away while the rest is still being fetched.
+    Background lookups use the refresh lane of the CommandScheduler and fail quietly.
+
+    Attributes:
+        process: The CoreMinerProcess used to send the commands.
+        start (int): The first address to disassemble.
+        length (int): The number of bytes to disassemble.
+        display_length (int): The number of bytes to display.
+        background (bool): True if the commands are sent as background refreshes.
+        pending (int): The number of DisassembleAt commands that have not answered yet.
+        shown (bool): True once the range was displayed.
+    """
+
+    def __init__(self, process, start: int, length: int, display_length: Optional[int] = None,
+                 background: bool = False):
+        """
+        Initialize the DisassemblyLookup.
+
+        Args:
+            process: The CoreMinerProcess used to send the commands.
+            start (int): The first address to disassemble.
+            length (int): The number of bytes to disassemble.
+            display_length (Optional[int]): The number of bytes to display; defaults to length.
+            background (bool): True to send the commands as background refreshes.
+        """
+        self.process = process
+        self.cache: DisassemblyCache = process.disassembly_cache
+        self.start = start
+        self.length = length
+        self.display_length = length if display_length is None else display_length
+        self.background = background
+        self.pending = 0
+        self.generation = 0
+        self.shown = False
+
+    def run(self) -> None:
+        """
+        Display the range right away if it is cached, otherwise fetch the missing ranges.
+        """
+        self.generation = self.cache.generation
+        missing = self.cache.missing_ranges(self.start, self.start + self.length)
+        if not self.shown and not self.cache.missing_ranges(self.start, self.start + self.display_length):
+            self._finish()
+        if not missing:
+            return
+        self.pending = len(missing)
+        for gap_start, gap_end in missing:
+            command_json = json.dumps({"status": {"DisassembleAt": [gap_start, gap_end - gap_start, False]}})
+            on_feedback = partial(self._on_feedback, gap_start, gap_end)
+            if self.background:
+                self.process.command_scheduler.put_refresh(command_json, on_feedback=on_feedback)
+            else:
+                self.process.command_scheduler.put_user(command_json, on_feedback=on_feedback)
+
+    def _on_feedback(self, gap_start: int, gap_end: int, feedback: Feedback) -> bool:
+        """
+        Store the instructions of a missing range and display the whole range once all ranges answered.
+
+        Args:
+            gap_start (int): The start of the missing range.
+            gap_end (int): The end of the missing range.
+            feedback (Feedback): The feedback of the DisassembleAt command.
+
+        Returns:
+            bool: True if the range was disassembled, False otherwise.
+        """
+        if not isinstance(feedback, DisassemblyFeedback):
+            if self.background:
+                # A failed prefetch is dropped quietly, the next lookup tries again
+                return True
+            # An error clears the command queue, so the other missing ranges are not fetched anymore
+            return self.process.feedback_parser.parse_feedback(feedback)
+
+        if self.cache.generation == self.generation:
+            self.cache.store(gap_start, gap_end - gap_start, feedback.instructions)
+        self.pending -= 1
+        if self.pending == 0:
+            if self.cache.generation != self.generation:
+                self.run()
+            elif not self.shown:
+                self._finish()
+        return True
+
+    def _finish(self) -> None:
+        self.shown = True
+        self.process.feedback_parser.show_disassembly(
+            self.cache.instructions(self.start, self.start + self.display_length))
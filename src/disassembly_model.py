@@ -0,0 +1,157 @@
+"""
+Module for storing disassembled instructions in a compact columnar form.
+
+This module defines the DisassemblyModel class, which keeps the instructions shown in the Disassembly widget as
+parallel arrays (addresses, byte spans, mnemonic and operand indices, breakpoint flags) instead of one large
+formatted string. Mnemonics and operands are interned in a string table. A row is only formatted when it is
+rendered, so displaying tens of thousands of instructions costs no more than the rows that are visible.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+ADDRESS_COL_WIDTH = 21
+BYTES_COL_WIDTH = 22
+MNEMONIC_COL_WIDTH = 8
+
+
+class DisassemblyModel:
+    """
+    Columnar storage of disassembled instructions in ascending address order.
+
+    Attributes:
+        addresses (array): The address of every instruction.
+        byte_starts (array): The offset of the first byte of every instruction in `code`, followed by the end offset.
+        code (bytearray): The bytes of all instructions, one after the other.
+        mnemonic_ids (array): The index of the mnemonic of every instruction in `strings`.
+        operand_ids (array): The index of the operands of every instruction in `strings`.
+        breakpoints (bytearray): 1 for every instruction with a breakpoint, 0 otherwise.
+        strings (list[str]): The interned mnemonics and operands.
+    """
+
+    def __init__(self, instructions: Iterable[list] = ()):
+        """
+        Initialize the DisassemblyModel.
+
+        Args:
+            instructions (Iterable[list]): Instructions as [address, bytes, tokens, has_breakpoint], where tokens
+                is a list of dicts with the keys "kind" and "text".
+        """
+        self.addresses = array("Q")
+        self.byte_starts = array("L", [0])
+        self.code = bytearray()
+        self.mnemonic_ids = array("L")
+        self.operand_ids = array("L")
+        self.breakpoints = bytearray()
+        self.strings: list[str] = [""]
+        self._string_ids: dict[str, int] = {"": 0}
+        self._max_operand_width = 0
+        for entry in instructions:
+            self.append(entry)
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def append(self, entry: list) -> None:
+        """
+        Append a single instruction.
+
+        Args:
+            entry (list): The instruction as [address, bytes, tokens, has_breakpoint].
+        """
+        address, bytes_list, tokens, has_breakpoint = entry
+
+        # Separate the mnemonic and operand tokens
+        mnemonic_text = ""
+        operand_parts = []
+        found_mnemonic = False
+        for token in tokens:
+            if token.get("kind") == "Mnemonic" and not found_mnemonic:
+                mnemonic_text = token["text"].strip()  # e.g. "mov"
+                found_mnemonic = True
+            else:
+                operand_parts.append(token["text"])
+        operand_text = "".join(operand_parts).strip()
+
+        self.addresses.append(address)
+        self.code.extend(bytes_list)
+        self.byte_starts.append(len(self.code))
+        self.mnemonic_ids.append(self._intern(mnemonic_text))
+        self.operand_ids.append(self._intern(operand_text))
+        self.breakpoints.append(1 if has_breakpoint else 0)
+        self._max_operand_width = max(self._max_operand_width, len(operand_text))
+
+    def _intern(self, text: str) -> int:
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(text)
+            self._string_ids[text] = string_id
+        return string_id
+
+    def index_of(self, address: int) -> Optional[int]:
+        """
+        Get the row of the instruction at the given address.
+
+        Args:
+            address (int): The address of the instruction.
+
+        Returns:
+            Optional[int]: The row, or None if no instruction starts at the address.
+        """
+        index = bisect_left(self.addresses, address)
+        if index < len(self.addresses) and self.addresses[index] == address:
+            return index
+        return None
+
+    def width(self) -> int:
+        """
+        Get the width of the widest row in characters.
+        """
+        return ADDRESS_COL_WIDTH + BYTES_COL_WIDTH + MNEMONIC_COL_WIDTH + self._max_operand_width
+
+    def row_columns(self, index: int, has_breakpoint: Optional[bool] = None) -> tuple[str, str]:
+        """
+        Format a single instruction.
+
+        Args:
+            index (int): The row of the instruction.
+            has_breakpoint (Optional[bool]): Whether to show the breakpoint marker, None to use the breakpoint
+                flag reported by the CoreMiner when the instruction was disassembled.
+
+        Returns:
+            tuple[str, str]: The address column (with the breakpoint marker) and the rest of the row.
+        """
+        address = self.addresses[index]
+        if has_breakpoint is None:
+            has_breakpoint = bool(self.breakpoints[index])
+        if has_breakpoint:
+            address_str = f"{address:016x}(*)"
+        else:
+            address_str = f"{address:016x}"
+
+        byte_str = self.code[self.byte_starts[index]:self.byte_starts[index + 1]].hex(" ")
+        mnemonic = self.strings[self.mnemonic_ids[index]]
+        operands = self.strings[self.operand_ids[index]]
+        return (f"{address_str:<{ADDRESS_COL_WIDTH}}",
+                f"{byte_str:<{BYTES_COL_WIDTH}}{mnemonic:<{MNEMONIC_COL_WIDTH}}{operands}")
+
+    def row(self, index: int) -> str:
+        """
+        Format a single instruction into one line.
+
+        Args:
+            index (int): The row of the instruction.
+
+        Returns:
+            str: The formatted line.
+        """
+        address_col, rest = self.row_columns(index)
+        return address_col + rest
+
+    def text(self) -> str:
+        """
+        Format all instructions. Only meant for small models, the widget formats the visible rows only.
+        """
+        return "\n".join(self.row(index) for index in range(len(self)))
@@ -0,0 +1,441 @@
+"""
+Module for decoding the JSON feedback of the CoreMiner into typed messages.
+
+Every line written by the CoreMiner to stdout is either a JSON feedback or output of the debuggee. This module
+decodes a feedback line once into a small typed message class (Registers, Stack, Disassembly, ...) that keeps
+the original line in its `raw` attribute, so it never has to be serialized again for the RawResponses widget.
+If the optional `orjson` package is installed it is used to parse the JSON, otherwise the `json` module.
+"""
+
+import json
+from typing import Optional
+
+try:
+    import orjson
+
+    def _loads(line):
+        return orjson.loads(line)
+
+    JSON_BACKEND = "orjson"
+    _DECODE_ERRORS = (orjson.JSONDecodeError,)
+except ImportError:
+    _loads = json.loads
+    JSON_BACKEND = "json"
+    _DECODE_ERRORS = (json.JSONDecodeError,)
+
+
+class Feedback:
+    """
+    Base class of all decoded feedback messages.
+
+    Attributes:
+        raw (str): The JSON line as received from the CoreMiner.
+    """
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: str):
+        self.raw = raw
+
+
+class OkFeedback(Feedback):
+    """
+    The command was executed successfully and has no result.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "OkFeedback":
+        return cls(raw)
+
+
+class ErrorFeedback(Feedback):
+    """
+    The command failed.
+
+    Attributes:
+        error: The error details, usually a dict with "error_type" and "message".
+    """
+
+    __slots__ = ("error",)
+
+    def __init__(self, raw: str, error):
+        super().__init__(raw)
+        self.error = error
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "ErrorFeedback":
+        return cls(raw, payload)
+
+
+class RegistersFeedback(Feedback):
+    """
+    The register values of the debuggee.
+
+    Attributes:
+        registers (dict[str, int]): The register names mapped to their values, in the order of the CoreMiner.
+    """
+
+    __slots__ = ("registers",)
+
+    def __init__(self, raw: str, registers: dict[str, int]):
+        super().__init__(raw)
+        self.registers = registers
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "RegistersFeedback":
+        return cls(raw, payload)
+
+
+class StackFeedback(Feedback):
+    """
+    The stack of the debuggee.
+
+    Attributes:
+        start_addr (int): The address of the first word.
+        words (list[int]): The words of the stack, one every 8 bytes.
+    """
+
+    __slots__ = ("start_addr", "words")
+
+    def __init__(self, raw: str, start_addr: int, words: list[int]):
+        super().__init__(raw)
+        self.start_addr = start_addr
+        self.words = words
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "StackFeedback":
+        return cls(raw, payload["start_addr"], payload["words"])
+
+
+class DisassemblyFeedback(Feedback):
+    """
+    Disassembled instructions.
+
+    The instructions are kept in the compact list form of the CoreMiner instead of one object per instruction.
+
+    Attributes:
+        instructions (list): Entries [address, bytes, tokens, has_breakpoint], where bytes is a list of ints and
+            tokens is a list of dicts with the keys "kind" and "text".
+    """
+
+    __slots__ = ("instructions",)
+
+    def __init__(self, raw: str, instructions: list):
+        super().__init__(raw)
+        self.instructions = instructions
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "DisassemblyFeedback":
+        return cls(raw, payload["vec"])
+
+
+class MemoryRegion:
+    """
+    A single region of the process memory map.
+    """
+
+    __slots__ = ("start_address", "end_address", "size", "offset", "device", "inode", "path",
+                 "read", "write", "execute", "private", "shared")
+
+    def __init__(self, region: dict):
+        self.start_address = region.get("start_address", 0)
+        self.end_address = region.get("end_address", 0)
+        self.size = region.get("size", 0)
+        self.offset = region.get("offset", 0)
+        self.device = region.get("device", "N/A")
+        self.inode = region.get("inode", "N/A")
+        self.path = region.get("path")
+        perms = region.get("permissions", {})
+        self.read = perms.get("read", False)
+        self.write = perms.get("write", False)
+        self.execute = perms.get("execute", False)
+        self.private = perms.get("private", False)
+        self.shared = perms.get("shared", False)
+
+    def permissions(self) -> str:
+        """
+        Format the permissions like /proc/pid/maps, e.g. "r-xp".
+        """
+        if self.private:
+            ps = "p"
+        elif self.shared:
+            ps = "s"
+        else:
+            ps = "-"
+        return ("r" if self.read else "-") + ("w" if self.write else "-") + ("x" if self.execute else "-") + ps
+
+
+class ProcessMapFeedback(Feedback):
+    """
+    The memory map of the debuggee.
+
+    Attributes:
+        total_mapped (int): Total mapped memory in bytes.
+        executable_regions (int): Number of executable regions.
+        private_regions (int): Number of private regions.
+        writable_regions (int): Number of writable regions.
+        regions (list[MemoryRegion]): The mapped regions.
+    """
+
+    __slots__ = ("total_mapped", "executable_regions", "private_regions", "writable_regions", "regions")
+
+    def __init__(self, raw: str, payload: dict):
+        super().__init__(raw)
+        self.total_mapped = payload.get("total_mapped", 0)
+        self.executable_regions = payload.get("executable_regions", 0)
+        self.private_regions = payload.get("private_regions", 0)
+        self.writable_regions = payload.get("writable_regions", 0)
+        self.regions = [MemoryRegion(region) for region in payload.get("regions", [])]
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "ProcessMapFeedback":
+        return cls(raw, payload)
+
+
+class Frame:
+    """
+    A single frame of a backtrace.
+    """
+
+    __slots__ = ("addr", "name", "start_addr")
+
+    def __init__(self, frame: dict):
+        self.addr = frame.get("addr", 0)
+        self.name = frame.get("name")
+        self.start_addr = frame.get("start_addr")
+
+
+class BacktraceFeedback(Feedback):
+    """
+    The backtrace of the debuggee.
+
+    Attributes:
+        frames (list[Frame]): The frames, innermost first.
+    """
+
+    __slots__ = ("frames",)
+
+    def __init__(self, raw: str, frames: list[Frame]):
+        super().__init__(raw)
+        self.frames = frames
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "BacktraceFeedback":
+        return cls(raw, [Frame(frame) for frame in payload.get("frames", [])])
+
+
+class WordFeedback(Feedback):
+    """
+    A word read from the memory of the debuggee.
+
+    Attributes:
+        word: The value of the word, usually an int.
+    """
+
+    __slots__ = ("word",)
+
+    def __init__(self, raw: str, word):
+        super().__init__(raw)
+        self.word = word
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "WordFeedback":
+        return cls(raw, payload)
+
+
+class Symbol:
+    """
+    A debug symbol with its nested child symbols.
+    """
+
+    __slots__ = ("name", "kind", "offset", "datatype", "low_addr", "high_addr", "children")
+
+    def __init__(self, symbol: dict):
+        self.name = symbol.get("name")
+        self.kind = symbol.get("kind", "<unknown>")
+        self.offset = symbol.get("offset")
+        self.datatype = symbol.get("datatype")
+        self.low_addr = symbol.get("low_addr")
+        self.high_addr = symbol.get("high_addr")
+        self.children = [Symbol(child) for child in symbol.get("children", [])]
+
+
+class SymbolsFeedback(Feedback):
+    """
+    Symbols found by name.
+
+    Attributes:
+        symbols (list[Symbol]): The top level symbols.
+    """
+
+    __slots__ = ("symbols",)
+
+    def __init__(self, raw: str, symbols: list[Symbol]):
+        super().__init__(raw)
+        self.symbols = symbols
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "SymbolsFeedback":
+        return cls(raw, [Symbol(symbol) for symbol in payload])
+
+
+class VariableFeedback(Feedback):
+    """
+    The value of a variable.
+
+    Attributes:
+        data (list[int]): The bytes of the variable.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, raw: str, data: list[int]):
+        super().__init__(raw)
+        self.data = data
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "VariableFeedback":
+        return cls(raw, payload.get("Bytes", []))
+
+
+class PluginListFeedback(Feedback):
+    """
+    The plugins of the CoreMiner.
+
+    Attributes:
+        plugins (list): Entries [plugin_name, active].
+    """
+
+    __slots__ = ("plugins",)
+
+    def __init__(self, raw: str, plugins: list):
+        super().__init__(raw)
+        self.plugins = plugins
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "PluginListFeedback":
+        return cls(raw, payload)
+
+
+class ExitFeedback(Feedback):
+    """
+    The debuggee exited.
+
+    Attributes:
+        exit_code (int): The exit code of the debuggee.
+    """
+
+    __slots__ = ("exit_code",)
+
+    def __init__(self, raw: str, exit_code: int):
+        super().__init__(raw)
+        self.exit_code = exit_code
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "ExitFeedback":
+        return cls(raw, payload)
+
+
+class VersionFeedback(Feedback):
+    """
+    The version of the CoreMiner. This is a meta feedback that is not made by the CoreMiner.
+
+    Attributes:
+        version (str): The version string.
+    """
+
+    __slots__ = ("version",)
+
+    def __init__(self, raw: str, version: str):
+        super().__init__(raw)
+        self.version = version
+
+    @classmethod
+    def decode(cls, payload, raw: str) -> "VersionFeedback":
+        return cls(raw, payload)
+
+
+class UnknownFeedback(Feedback):
+    """
+    A feedback with an unknown keyword or a payload that does not match the expected schema.
+
+    Attributes:
+        keyword (str): The keyword of the feedback.
+        payload: The undecoded payload.
+    """
+
+    __slots__ = ("keyword", "payload")
+
+    def __init__(self, raw: str, keyword: str, payload):
+        super().__init__(raw)
+        self.keyword = keyword
+        self.payload = payload
+
+
+# Maps the keyword of a feedback to its message class
+FEEDBACK_TYPES = {
+    "Error": ErrorFeedback,
+    "Registers": RegistersFeedback,
+    "Stack": StackFeedback,
+    "Disassembly": DisassemblyFeedback,
+    "ProcessMap": ProcessMapFeedback,
+    "Backtrace": BacktraceFeedback,
+    "Word": WordFeedback,
+    "Symbols": SymbolsFeedback,
+    "Variable": VariableFeedback,
+    "PluginList": PluginListFeedback,
+    "Exit": ExitFeedback,
+    "version": VersionFeedback,
+}
+
+
+def decode_feedback(feedback_dict: dict, raw: Optional[str] = None) -> Feedback:
+    """
+    Decode a feedback dict into its typed message.
+
+    Args:
+        feedback_dict (dict): A dict with the key "feedback", as sent by the CoreMiner.
+        raw (Optional[str]): The original JSON line; if None, the dict is serialized.
+
+    Returns:
+        Feedback: The typed message. Unknown keywords and malformed payloads result in an UnknownFeedback.
+    """
+    if raw is None:
+        raw = json.dumps(feedback_dict)
+    feedback_data = feedback_dict["feedback"]
+    if feedback_data == "Ok":
+        return OkFeedback(raw)
+    if not isinstance(feedback_data, dict) or not feedback_data:
+        return UnknownFeedback(raw, str(feedback_data), None)
+
+    keyword, payload = next(iter(feedback_data.items()))
+    feedback_type = FEEDBACK_TYPES.get(keyword)
+    if feedback_type is None:
+        return UnknownFeedback(raw, keyword, payload)
+    try:
+        return feedback_type.decode(payload, raw)
+    except (KeyError, TypeError, AttributeError, ValueError):
+        return UnknownFeedback(raw, keyword, payload)
+
+
+def decode_line(line: str) -> Optional[Feedback]:
+    """
+    Decode a line read from the stdout of the CoreMiner.
+
+    Args:
+        line (str): The stripped line.
+
+    Returns:
+        Optional[Feedback]: The typed message, or None if the line is no feedback (i.e. output of the debuggee).
+    """
+    if not line.startswith("{"):
+        return None
+    try:
+        feedback_dict = _loads(line)
+    except _DECODE_ERRORS:
+        return None
+    if not isinstance(feedback_dict, dict) or "feedback" not in feedback_dict:
+        return None
+    return decode_feedback(feedback_dict, line)
@@ -1,10 +1,30 @@
+from disassembly_model import DisassemblyModel
+from feedback_decoder import (
+    BacktraceFeedback,
+    DisassemblyFeedback,
+    ErrorFeedback,
+    ExitFeedback,
+    Feedback,
+    OkFeedback,
+    PluginListFeedback,
+    ProcessMapFeedback,
+    RegistersFeedback,
+    StackFeedback,
+    SymbolsFeedback,
+    UnknownFeedback,
+    VariableFeedback,
+    VersionFeedback,
+    WordFeedback,
+)
+
+
 class FeedbackParser:
     """
     Parses and processes feedback received from the CoreMiner process.
 
-    This class receives feedback as a JSON dictionary (or string), parses it to determine the type of feedback,
-    and updates the shared data store accordingly. Feedback types include errors, register values, stack information,
-    disassembly output, process memory maps, backtraces, memory reads, symbols, variables, and plugin lists.
+    This class receives feedback as a typed message decoded by the feedback_decoder module, dispatches it on its
+    type and updates the shared data store accordingly. Feedback types include errors, register values, stack
+    information, disassembly output, process memory maps, backtraces, memory reads, symbols, variables, and plugin lists.
     """
 
     def __init__(self, data_store):
@@ -16,256 +36,204 @@ class FeedbackParser:
         """
         self.data_store = data_store
 
-    def parse_feedback(self, feedback_dict):
+        # Maps the type of a feedback message to the method that handles it
+        self.feedback_handlers = {
+            OkFeedback: self._parse_ok,
+            ErrorFeedback: self._parse_error,
+            RegistersFeedback: self._parse_registers,
+            StackFeedback: self._parse_stack,
+            DisassemblyFeedback: self._parse_disassembly,
+            ProcessMapFeedback: self._parse_processmap,
+            BacktraceFeedback: self._parse_backtrace,
+            WordFeedback: self._parse_read_memory,
+            SymbolsFeedback: self._parse_symbols,
+            VariableFeedback: self._parse_variable,
+            PluginListFeedback: self._parse_plugin_list,
+            ExitFeedback: self._parse_exit,
+            VersionFeedback: self._parse_version,
+            UnknownFeedback: self._parse_unknown,
+        }
+
+    def parse_feedback(self, feedback: Feedback):
         """
-        Parse the raw feedback and update the data store accordingly.
+        Parse the decoded feedback and update the data store accordingly.
 
-        The feedback is expected to be a JSON dictionary. The method first stores the raw feedback in the data store.
-        It then checks if the feedback is a simple "Ok" response or contains specific keys, and calls the appropriate
-        parsing method based on the feedback keyword.
+        The method first stores the raw JSON line of the feedback in the data store. It then looks up the handler
+        for the type of the feedback message and calls it.
 
         Args:
-            feedback_dict (dict): The feedback received from CoreMiner.
+            feedback (Feedback): The typed feedback received from CoreMiner.
 
         Returns:
             bool: True if the feedback indicates successful execution; False otherwise.
         """
-        self.data_store.set_responses_coreminer(str(feedback_dict))
-        feedback_data = feedback_dict["feedback"]
-        if feedback_data == "Ok":
-            self.data_store.set_output("[cm]: Ok")
-            return True
-
-        for keyword, payload in feedback_data.items():
-            if keyword == "Error":
-                return self._parse_error(payload)
-            elif keyword == "Registers":
-                return self._parse_registers(payload)
-            elif keyword == "Stack":
-                return self._parse_stack(payload)
-            elif keyword == "Disassembly":
-                return self._parse_disassembly(payload)
-            elif keyword == "ProcessMap":
-                return self._parse_processmap(payload)
-            elif keyword == "Backtrace":
-                return self._parse_backtrace(payload)
-            elif keyword == "Word":
-                return self._parse_read_memory(payload)
-            elif keyword == "Symbols":
-                return self._parse_symbols(payload)
-            elif keyword == "Variable":
-                return self._parse_variable(payload)
-            elif keyword == "PluginList":
-                return self._parse_plugin_list(payload)
-            elif keyword == "Exit":
-                return self._parse_exit(payload)
-            elif keyword == "version":
-                return self._parse_version(payload)
-            else:
-                # Default fallback if the keyword is unknown
-                self.data_store.set_responses_coreminer(
-                    f"Unknown feedback key '{keyword}' -> {payload}")
-                return False
+        self.data_store.set_responses_coreminer(feedback.raw)
+        return self.feedback_handlers[type(feedback)](feedback)
+
+    def _parse_ok(self, feedback):
+        """
+        Parse the "Ok" feedback of a command without result.
+
+        Args:
+            feedback (OkFeedback): The feedback.
+
+        Returns:
+            bool: True, indicating successful execution.
+        """
+        self.data_store.set_output("[cm]: Ok")
+        return True
+
+    def _parse_unknown(self, feedback):
+        """
+        Report a feedback with an unknown keyword or an unexpected payload.
+
+        Args:
+            feedback (UnknownFeedback): The feedback.
 
-    def _parse_error(self, error_dict):
+        Returns:
+            bool: False, as the feedback could not be handled.
+        """
+        self.data_store.set_responses_coreminer(
+            f"Unknown feedback key '{feedback.keyword}' -> {feedback.payload}")
+        return False
+
+    def _parse_error(self, feedback):
         """
         Parse error feedback and update the data store with an error message.
 
         Args:
-            error_dict (dict): The error details provided by CoreMiner.
+            feedback (ErrorFeedback): The error details provided by CoreMiner.
 
         Returns:
             bool: False, indicating that the feedback represents an error.
         """
-        self.data_store.set_output(f"[cm][!]: {error_dict}")
+        self.data_store.set_output(f"[cm][!]: {feedback.error}")
         return False
 
-    def _parse_registers(self, registers_dict):
+    def _parse_registers(self, feedback):
         """
-        Parse and format register feedback, then update the data store.
+        Parse register feedback, then update the data store.
 
-        Each register's value is formatted as a hexadecimal string. If the register 'rip' is found, its value is also
-        stored separately. The formatted registers are then saved to the data store.
+        The register values are stored by name; the Registers widget formats them. If the register 'rip' is found,
+        its value is also stored separately.
 
         Args:
-            registers_dict (dict): A dictionary with register names as keys and their values as integers.
+            feedback (RegistersFeedback): The register names mapped to their values.
 
         Returns:
             bool: True, indicating successful parsing of register feedback.
         """
-        lines = []
-        for reg_name, reg_value in registers_dict.items():
-            lines.append(f"  {reg_name}: {reg_value:0x}")
-            if reg_name == "rip":
-                self.data_store.set_rip(reg_value)
-
-        self.data_store.set_registers("\n".join(lines))
+        if "rip" in feedback.registers:
+            self.data_store.set_rip(feedback.registers["rip"])
+        self.data_store.set_registers(feedback.registers)
         return True
 
-    def _parse_stack(self, stack_dict):
+    def _parse_stack(self, feedback):
         """
-        Parse and format the stack feedback, then update the data store.
+        Parse the stack feedback and update the data store.
 
-        The method expects a starting address and a list of words. Each word is formatted into a line with its
-        corresponding address (incremented by 8 for each word).
+        The method stores the starting address and the list of words. The Stack widget formats each word into a
+        line with its corresponding address (incremented by 8 for each word).
 
         Args:
-            stack_dict (dict): A dictionary with keys "start_addr" (int) and "words" (list of ints).
+            feedback (StackFeedback): The start address and the words of the stack.
 
         Returns:
             bool: True, indicating successful parsing of stack feedback.
         """
-        start_addr = stack_dict["start_addr"]
-        words = stack_dict["words"]
-        lines = []
-        for word in words:
-            lines.append(f"  {start_addr:016x}: {word:016x}")
-            start_addr += 8
-        self.data_store.set_stack("\n".join(lines))
+        self.data_store.set_stack(feedback.start_addr, feedback.words)
         return True
 
-    def _parse_disassembly(self, disasm_dict):
+    def _parse_disassembly(self, feedback):
         """
-        Parse disassembly feedback and format it into a human-readable string.
+        Parse disassembly feedback into a DisassemblyModel and update the data store.
 
-        Each instruction entry is formatted into columns: address (with an optional breakpoint marker), hex bytes,
-        mnemonic, and operands. The formatted disassembly is then stored in the data store.
+        The instructions are stored in columns (address, bytes, mnemonic, operands, breakpoint flag). They are
+        formatted by the Disassembly widget only when they are displayed.
 
         Args:
-            disasm_dict (dict): A dictionary containing a key "vec" with a list of disassembly entries. Each entry is a list
-                                containing address, a list of byte values, tokens (for mnemonic and operands), and a breakpoint flag.
+            feedback (DisassemblyFeedback): The disassembly entries. Each entry is a list containing address, a list of
+                                            byte values, tokens (for mnemonic and operands), and a breakpoint flag.
 
         Returns:
             bool: True, indicating successful parsing of disassembly feedback.
         """
-        ADDRESS_COL_WIDTH = 21
-        BYTES_COL_WIDTH = 22
-        MNEMONIC_COL_WIDTH = 8
-
-        lines = []
-        for entry in disasm_dict["vec"]:
-            address = entry[0]     # e.g. 140180160845120
-            bytes_list = entry[1]     # e.g. [72, 137, 231]
-            # list of dicts with { kind: "...", text: "..." }
-            tokens = entry[2]
-            has_breakpoint = entry[3]    # True or False
-
-            # Format address as hex and mark breakpoint if applicable
-            if has_breakpoint:
-                address_str = f"{address:016x}(*)"
-            else:
-                address_str = f"{address:016x}"
-            address_col = f"{address_str:<{ADDRESS_COL_WIDTH}}"
-
-            # Format bytes into a hex string
-            byte_str = " ".join(f"{b:02x}" for b in bytes_list)
-            bytes_col = f"{byte_str:<{BYTES_COL_WIDTH}}"
-
-            # Separate the mnemonic and operand tokens
-            mnemonic_text = ""
-            operand_text = ""
-            found_mnemonic = False
-            for token in tokens:
-                if token.get("kind") == "Mnemonic" and not found_mnemonic:
-                    mnemonic_text = token["text"].strip()  # e.g. "mov"
-                    found_mnemonic = True
-                else:
-                    operand_text += token["text"]
-
-            mnemonic_col = f"{mnemonic_text:<{MNEMONIC_COL_WIDTH}}"
-            operand_text = operand_text.strip()
-
-            line_str = f"{address_col}{bytes_col}{mnemonic_col}{operand_text}"
-            lines.append(line_str)
-
-        disassembly_str = "\n".join(lines)
-        self.data_store.set_disassembly(disassembly_str)
+        self.show_disassembly(feedback.instructions)
         return True
 
-    def _parse_processmap(self, procmap_dict):
+    def show_disassembly(self, instructions):
+        """
+        Store disassembled instructions in the data store.
+
+        Args:
+            instructions (list): The instructions as [address, bytes, tokens, has_breakpoint].
+        """
+        self.data_store.set_disassembly(DisassemblyModel(instructions))
+
+    def _parse_processmap(self, feedback):
         """
         Parse process memory map feedback and format it into a detailed report.
 
         The method extracts summary statistics and region details (such as address range, size, offset,
-        device, inode, path, and permissions) from the process map. The formatted output is stored in the data store.
+        device, inode, path, and permissions) from the process map. The formatted output is stored in the data store
+        and the regions replace the memory map used to annotate pointers.
 
         Args:
-            procmap_dict (dict): A dictionary containing memory map details, including totals and a list of memory regions.
+            feedback (ProcessMapFeedback): The memory map details, including totals and a list of memory regions.
 
         Returns:
             bool: True, indicating successful parsing of process memory map feedback.
         """
-        total_mapped = procmap_dict.get("total_mapped", 0)
-        executable_regions = procmap_dict.get("executable_regions", 0)
-        private_regions = procmap_dict.get("private_regions", 0)
-        writable_regions = procmap_dict.get("writable_regions", 0)
-
         output_lines = [
             "Process Memory Map:",
-            f"  Total mapped memory: {total_mapped} bytes",
-            f"  Executable regions: {executable_regions}",
-            f"  Writable regions: {writable_regions}",
-            f"  Private regions: {private_regions}",
+            f"  Total mapped memory: {feedback.total_mapped} bytes",
+            f"  Executable regions: {feedback.executable_regions}",
+            f"  Writable regions: {feedback.writable_regions}",
+            f"  Private regions: {feedback.private_regions}",
             "",
             "Regions:"
         ]
 
-        regions = procmap_dict.get("regions", [])
-        for idx, region in enumerate(regions, start=1):
-            start_addr = region.get("start_address", 0)
-            end_addr = region.get("end_address", 0)
-            size = region.get("size", 0)
-            offset = region.get("offset", 0)
-            device = region.get("device", "N/A")
-            inode = region.get("inode", "N/A")
-            path = region.get("path")
+        for idx, region in enumerate(feedback.regions, start=1):
+            path = region.path
             if path is None:
                 path = "Anonymous"
 
-            perms = region.get("permissions", {})
-            r = "r" if perms.get("read", False) else "-"
-            w = "w" if perms.get("write", False) else "-"
-            x = "x" if perms.get("execute", False) else "-"
-            if perms.get("private", False):
-                ps = "p"
-            elif perms.get("shared", False):
-                ps = "s"
-            else:
-                ps = "-"
-            perm_str = r + w + x + ps
-
             output_lines.append(
                 f"  {idx}. {path}\n"
-                f"      Address Range: 0x{start_addr:016x} - 0x{end_addr:016x}\n"
-                f"      Size: {size} bytes, Offset: {offset}, Device: {device}, Inode: {inode}\n"
-                f"      Permissions: {perm_str}"
+                f"      Address Range: 0x{region.start_address:016x} - 0x{region.end_address:016x}\n"
+                f"      Size: {region.size} bytes, Offset: {region.offset}, Device: {region.device}, "
+                f"Inode: {region.inode}\n"
+                f"      Permissions: {region.permissions()}"
             )
 
         output = "\n".join(output_lines)
         self.data_store.set_output("[cm]:\n" + "ProcessMap: \n" + output)
+        self.data_store.set_memory_map(feedback.regions)
         return True
 
-    def _parse_backtrace(self, backtrace_dict):
+    def _parse_backtrace(self, feedback):
         """
         Parse backtrace feedback and format it into a readable list of stack frames.
 
-        Each frame includes the address, function name, and starting address (if available). The formatted
-        backtrace is stored in the data store.
+        Each frame includes the address, function name, and starting address (if available). The functions of
+        the frames are added to the symbol index, which in turn names frames without a function name if possible.
+        The formatted backtrace is stored in the data store.
 
         Args:
-            backtrace_dict (dict): A dictionary containing a list of frames under the key "frames".
+            feedback (BacktraceFeedback): The frames of the backtrace.
 
         Returns:
             bool: True, indicating successful parsing of backtrace feedback.
         """
-        frames = backtrace_dict.get("frames", [])
+        self.data_store.add_frame_symbols(feedback.frames)
+        symbols = self.data_store.get_symbols()
         output_lines = ["Backtrace:"]
 
-        for idx, frame in enumerate(frames, start=1):
-            addr = frame.get("addr", 0)
-            name = frame.get("name") or "<unknown>"
-            start_addr = frame.get("start_addr")
-            addr_str = f"0x{addr:016x}"
+        for idx, frame in enumerate(feedback.frames, start=1):
+            name = frame.name or symbols.describe(frame.addr) or "<unknown>"
+            start_addr = frame.start_addr
+            addr_str = f"0x{frame.addr:016x}"
             start_str = f"0x{start_addr:016x}" if start_addr is not None else "N/A"
             output_lines.append(
                 f"  {idx}. Address: {addr_str} | Function: {name} | Start: {start_str}")
@@ -274,39 +242,40 @@ class FeedbackParser:
         self.data_store.set_backtrace(output)
         return True
 
-    def _parse_read_memory(self, word_value):
+    def _parse_read_memory(self, feedback):
         """
         Parse memory read feedback by formatting a word value into hexadecimal.
 
         Args:
-            word_value: The integer value read from memory.
+            feedback (WordFeedback): The value read from memory.
 
         Returns:
             bool: True, indicating successful parsing of memory read feedback.
         """
         try:
-            hex_word = f"0x{int(word_value):016x}"
+            hex_word = f"0x{int(feedback.word):016x}"
         except (ValueError, TypeError):
             hex_word = "Invalid word value"
 
         self.data_store.set_output("[cm]:\n" + f"Memory word: {hex_word}")
         return True
 
-    def _parse_symbols(self, symbols):
+    def _parse_symbols(self, feedback):
         """
         Parse symbols feedback and format them into a human-readable tree.
 
-        The payload is expected to be a list of symbol dictionaries. Each symbol may have nested child symbols.
-        The method recursively formats each symbol using the format_symbols helper method and stores the result.
+        Each symbol may have nested child symbols. The symbols are added to the symbol index. The method
+        recursively formats each symbol using the format_symbols helper method and stores the result.
 
         Args:
-            symbols (list): A list of symbol dictionaries.
+            feedback (SymbolsFeedback): The top level symbols.
 
         Returns:
             bool: True, indicating successful parsing of symbols feedback.
         """
+        self.data_store.add_symbols(feedback.symbols)
         output_lines = ["Symbols:"]
-        for symbol in symbols:
+        for symbol in feedback.symbols:
             output_lines.extend(self.format_symbols(symbol))
 
         output = "\n".join(output_lines)
@@ -318,23 +287,20 @@ class FeedbackParser:
         Recursively format a symbol and its children into a list of human-readable strings.
 
         Args:
-            symbol (dict): A dictionary representing a symbol with possible keys such as 'name', 'kind',
-                           'offset', 'datatype', 'low_addr', 'high_addr', and 'children'.
+            symbol (Symbol): The symbol with its name, kind, offset, datatype, address range and children.
             indent (int, optional): The current indentation level for nested symbols. Defaults to 0.
 
         Returns:
             list: A list of formatted strings representing the symbol and its children.
         """
         indent_str = "  " * indent
-        name = symbol.get("name") if symbol.get(
-            "name") is not None else "<anonymous>"
-        kind = symbol.get("kind", "<unknown>")
-        offset = symbol.get("offset")
-        datatype = symbol.get("datatype")
-        low_addr = symbol.get("low_addr")
-        high_addr = symbol.get("high_addr")
-
-        line = f"{indent_str}{kind}: {name}"
+        name = symbol.name if symbol.name is not None else "<anonymous>"
+        offset = symbol.offset
+        datatype = symbol.datatype
+        low_addr = symbol.low_addr
+        high_addr = symbol.high_addr
+
+        line = f"{indent_str}{symbol.kind}: {name}"
         if offset is not None:
             line += f", offset: {offset}"
         if datatype is not None:
@@ -345,30 +311,28 @@ class FeedbackParser:
             line += f", range: {low_str} - {high_str}"
 
         lines = [line]
-        for child in symbol.get("children", []):
+        for child in symbol.children:
             lines.extend(self.format_symbols(child, indent=indent + 1))
         return lines
 
-    def _parse_variable(self, variable_dict):
+    def _parse_variable(self, feedback):
         """
         Parse variable feedback by formatting its byte values into a hexadecimal string.
 
-        The payload is expected to be a dictionary with a key 'Bytes' that contains a list of integers.
         The formatted variable value is then stored in the data store.
 
         Args:
-            variable_dict (dict): A dictionary containing variable data with a 'Bytes' key.
+            feedback (VariableFeedback): The bytes of the variable.
 
         Returns:
             bool: True, indicating successful parsing of variable feedback.
         """
-        bytes_list = variable_dict.get("Bytes", [])
-        hex_bytes = " ".join(f"{b:02x}" for b in bytes_list)
+        hex_bytes = " ".join(f"{b:02x}" for b in feedback.data)
         output = f"Variable: {hex_bytes}"
         self.data_store.set_output("[cm]:\n" + output)
         return True
 
-    def _parse_plugin_list(self, plugin_list_payload):
+    def _parse_plugin_list(self, feedback):
         """
         Parse plugin list feedback and format it for display.
 
@@ -376,13 +340,13 @@ class FeedbackParser:
         The formatted list is stored in the data store.
 
         Args:
-            plugin_list_payload (list): A list where each element is a pair [plugin_name, active].
+            feedback (PluginListFeedback): The plugins; each element is a pair [plugin_name, active].
 
         Returns:
             bool: True, indicating successful parsing of plugin list feedback.
         """
         output_lines = ["   Plugins:"]
-        for entry in plugin_list_payload:
+        for entry in feedback.plugins:
             if isinstance(entry, list) and len(entry) == 2:
                 plugin_name, active = entry
                 status = "activated" if active else "deactivated"
@@ -393,32 +357,32 @@ class FeedbackParser:
         self.data_store.set_output("[cm]:\n" + output)
         return True
 
-    def _parse_exit(self, exit_code):
+    def _parse_exit(self, feedback):
         """
         Parse exit code
 
         Args:
-            exitcode (int): exit code
+            feedback (ExitFeedback): exit code
 
         Returns:
             bool: True, indicating successful parsing of plugin list feedback.
         """
         self.data_store.set_output(
-            "[cm]: Debuggee exited with code " + str(exit_code))
+            "[cm]: Debuggee exited with code " + str(feedback.exit_code))
         return False
 
-    def _parse_version(self, payload):
+    def _parse_version(self, feedback):
         """
         Parse version
 
         This is a meta feedback that is not made by the coreminer
 
         Args:
-            version string
+            feedback (VersionFeedback): version string
 
         Returns:
             bool: True, indicating successful parsing of version string
         """
         self.data_store.set_output(
-            "[cm]: version: " + str(payload))
+            "[cm]: version: " + str(feedback.version))
         return True
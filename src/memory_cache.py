@@ -0,0 +1,283 @@
+"""
+Module for caching the memory of the debuggee on the client side.
+
+This module defines the MemoryCache class, which keeps the words read from the debuggee in pages. The cache belongs
+to one stop of the debuggee: as soon as the stop generation of the CoreMinerProcess changes, every page is dropped,
+so re-viewing the same memory between two steps costs no round trip at all.
+The MemoryRead class reads a range of memory through the cache. The CoreMiner reads one word per ReadMem command,
+so the missing words are requested with a window of commands queued back to back instead of one at a time.
+"""
+
+import json
+from functools import partial
+from typing import Callable, Optional
+
+from feedback_decoder import Feedback, WordFeedback
+
+PAGE_SIZE = 0x1000
+WORD_SIZE = 8
+WORDS_PER_PAGE = PAGE_SIZE // WORD_SIZE
+WORD_MASK = 0xffffffffffffffff
+
+# Number of ReadMem commands kept queued while a range is read
+READ_WINDOW = 64
+
+# Pages kept in the cache; the oldest page is dropped first
+MAX_PAGES = 4096
+
+
+class MemoryCache:
+    """
+    Words of the debuggee's memory, stored in pages of PAGE_SIZE bytes.
+
+    Every page keeps its bytes and one valid flag per word. Words are read at addresses aligned to WORD_SIZE.
+    At most `max_pages` pages are kept, so scanning large regions does not grow the cache without bounds.
+
+    Attributes:
+        generation (int): The stop generation the cached memory belongs to.
+        max_pages (int): The maximum number of cached pages.
+    """
+
+    def __init__(self, max_pages: int = MAX_PAGES):
+        """
+        Initialize an empty MemoryCache.
+
+        Args:
+            max_pages (int): The maximum number of cached pages.
+        """
+        self._pages: dict[int, tuple[bytearray, bytearray]] = {}
+        self.generation = 0
+        self.max_pages = max_pages
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def sync(self, generation: int) -> None:
+        """
+        Drop all pages if the debuggee was stopped again since the memory was read.
+
+        Args:
+            generation (int): The current stop generation.
+        """
+        if generation != self.generation:
+            self._pages.clear()
+            self.generation = generation
+
+    def missing_words(self, start: int, end: int) -> list[int]:
+        """
+        Get the aligned addresses of the words in [start, end) that are not cached.
+
+        Args:
+            start (int): The first address.
+            end (int): The address after the last byte.
+
+        Returns:
+            list[int]: The addresses of the missing words in ascending order.
+        """
+        missing = []
+        address = start - start % WORD_SIZE
+        while address < end:
+            page_number, offset = divmod(address, PAGE_SIZE)
+            page_end = min(end, (page_number + 1) * PAGE_SIZE)
+            page = self._pages.get(page_number)
+            if page is None:
+                missing.extend(range(address, page_end, WORD_SIZE))
+            else:
+                valid = page[1]
+                for word_address in range(address, page_end, WORD_SIZE):
+                    if not valid[(word_address % PAGE_SIZE) // WORD_SIZE]:
+                        missing.append(word_address)
+            address = (page_number + 1) * PAGE_SIZE
+        return missing
+
+    def store_word(self, address: int, value: int) -> None:
+        """
+        Store a word read from the debuggee.
+
+        Args:
+            address (int): The aligned address of the word.
+            value (int): The value of the word; the memory is little endian.
+        """
+        page_number, offset = divmod(address, PAGE_SIZE)
+        page = self._pages.get(page_number)
+        if page is None:
+            if len(self._pages) >= self.max_pages:
+                # Dicts keep the insertion order, so the first page is the oldest
+                del self._pages[next(iter(self._pages))]
+            page = (bytearray(PAGE_SIZE), bytearray(WORDS_PER_PAGE))
+            self._pages[page_number] = page
+        data, valid = page
+        data[offset:offset + WORD_SIZE] = (value & WORD_MASK).to_bytes(WORD_SIZE, "little")
+        valid[offset // WORD_SIZE] = 1
+
+    def read(self, start: int, length: int) -> bytes:
+        """
+        Get the cached bytes of a range, up to the first byte that is not cached.
+
+        Args:
+            start (int): The first address.
+            length (int): The number of bytes.
+
+        Returns:
+            bytes: The cached prefix of the range; shorter than length if a word is missing.
+        """
+        end = start + length
+        chunks = []
+        address = start
+        while address < end:
+            page_number, offset = divmod(address, PAGE_SIZE)
+            page = self._pages.get(page_number)
+            if page is None:
+                break
+            data, valid = page
+            chunk_end = min(PAGE_SIZE, end - page_number * PAGE_SIZE)
+            # The first word that is not cached ends the readable prefix
+            first_missing = valid.find(0, offset // WORD_SIZE, (chunk_end + WORD_SIZE - 1) // WORD_SIZE)
+            if first_missing != -1:
+                chunks.append(data[offset:max(offset, first_missing * WORD_SIZE)])
+                break
+            chunks.append(data[offset:chunk_end])
+            address = page_number * PAGE_SIZE + chunk_end
+        return b"".join(chunks)
+
+    def clear(self) -> None:
+        """
+        Drop all pages.
+        """
+        self._pages.clear()
+
+
+class MemoryRead:
+    """
+    Reads a range of memory through the MemoryCache.
+
+    The missing words are requested with ReadMem commands; up to `window` of them are queued at a time and every
+    answer queues the next one. Words answered after the debuggee was stopped again are not stored and the read
+    starts over once the queued commands answered. When all words are read (or a word could not be read), the
+    `on_done` callback receives the MemoryRead once; the answers of the ReadMem commands still in flight after an
+    error are ignored.
+
+    Attributes:
+        process: The CoreMinerProcess used to send the commands.
+        start (int): The first address to read.
+        length (int): The number of bytes to read.
+        data (bytes): The bytes read, up to the first word that could not be read.
+        error_address (Optional[int]): The address of the first word that could not be read, if any.
+        cached_words (int): The number of words that were answered from the cache.
+        fetched_words (int): The number of words that were read from the debuggee.
+        pending (int): The number of ReadMem commands that have not answered yet.
+        finished (bool): True once `on_done` was called.
+    """
+
+    def __init__(self, process, start: int, length: int, on_done: Callable[["MemoryRead"], None],
+                 quiet_errors: bool = False, window: int = READ_WINDOW):
+        """
+        Initialize the MemoryRead.
+
+        Args:
+            process: The CoreMinerProcess used to send the commands.
+            start (int): The first address to read.
+            length (int): The number of bytes to read.
+            on_done (Callable[[MemoryRead], None]): Called once the range was read.
+            quiet_errors (bool): True to stop at an unreadable word without reporting the error and without
+                clearing the command queue.
+            window (int): The number of ReadMem commands kept queued.
+        """
+        self.process = process
+        self.cache: MemoryCache = process.memory_cache
+        self.start = start
+        self.length = length
+        self.on_done = on_done
+        self.quiet_errors = quiet_errors
+        self.window = window
+        self.data = b""
+        self.error_address: Optional[int] = None
+        self.cached_words = 0
+        self.fetched_words = 0
+        self.pending = 0
+        self.finished = False
+        self.generation = 0
+        self._missing: list[int] = []
+        self._next = 0
+        self._stale = False
+
+    def run(self) -> None:
+        """
+        Read the range from the cache if possible, otherwise start requesting the missing words.
+        """
+        self.cache.sync(self.process.stop_generation)
+        self.generation = self.cache.generation
+        self._missing = self.cache.missing_words(self.start, self.start + self.length)
+        self._next = 0
+        self._stale = False
+        self.error_address = None
+        self.finished = False
+        words = range(self.start - self.start % WORD_SIZE, self.start + self.length, WORD_SIZE)
+        self.cached_words = len(words) - len(self._missing)
+        if not self._missing:
+            self._finish()
+            return
+        self._fill()
+
+    def _fill(self) -> None:
+        # Keep the window of queued ReadMem commands full
+        while self.pending < self.window and self._next < len(self._missing) and self.error_address is None:
+            address = self._missing[self._next]
+            self._next += 1
+            self.pending += 1
+            self.process.command_scheduler.put_user(
+                json.dumps({"status": {"ReadMem": address}}),
+                on_feedback=partial(self._on_word, address), quiet=True,
+                on_dropped=partial(self._on_dropped, address))
+
+    def _on_dropped(self, address: int) -> None:
+        # The queued ReadMem commands were flushed, the read ends before the first of them
+        if self.finished:
+            return
+        if self.error_address is None or address < self.error_address:
+            self.error_address = address
+        self.pending = 0
+        self._finish()
+
+    def _on_word(self, address: int, feedback: Feedback) -> bool:
+        """
+        Store a word read from the debuggee and queue the next ReadMem command.
+
+        Args:
+            address (int): The address of the word.
+            feedback (Feedback): The feedback of the ReadMem command.
+
+        Returns:
+            bool: True if the word was read or the error is ignored, False otherwise.
+        """
+        if self.finished:
+            # Answered after an error finished the read
+            return True
+        self.pending -= 1
+        if not isinstance(feedback, WordFeedback):
+            if self.error_address is None or address < self.error_address:
+                self.error_address = address
+            if not self.quiet_errors:
+                # An error clears the command queue, so the other queued words are not read anymore
+                self.pending = 0
+                executed_successfull = self.process.feedback_parser.parse_feedback(feedback)
+                self._finish()
+                return executed_successfull
+        elif self.process.command_generation == self.generation:
+            self.cache.store_word(address, feedback.word)
+            self.fetched_words += 1
+        else:
+            self._stale = True
+
+        self._fill()
+        if self.pending == 0:
+            if self._stale:
+                self.run()
+            else:
+                self._finish()
+        return True
+
+    def _finish(self) -> None:
+        self.finished = True
+        self.data = self.cache.read(self.start, self.length)
+        self.on_done(self)
@@ -0,0 +1,243 @@
+"""
+Module for dumping memory of the debuggee into a file.
+
+This module defines the MemoryDump class, which streams the words of a memory range into a file that is created
+with its final size and written through `mmap`, so the dumped bytes never pile up in Python memory. The progress
+is recorded in a sidecar file next to the dump; if a dump is interrupted (an unreadable word, a state change of
+the debuggee or the end of the session), running the same dump again resumes from the last recorded offset.
+"""
+
+import json
+import mmap
+import os
+import time
+from functools import partial
+from typing import Optional
+
+from feedback_decoder import Feedback, WordFeedback
+from memory_cache import READ_WINDOW, WORD_MASK, WORD_SIZE
+
+# Suffix of the sidecar file recording the progress of a dump
+PROGRESS_SUFFIX = ".progress"
+
+# Bytes written between two updates of the sidecar file
+CHECKPOINT_BYTES = 0x10000
+
+# Seconds between two progress reports
+PROGRESS_INTERVAL = 1.0
+
+
+class MemoryDump:
+    """
+    Dumps the memory range [start, end) into a file, one ReadMem command per word.
+
+    Up to `window` ReadMem commands are queued at a time. The commands are answered in order, so the words are
+    written one after the other and everything before the next address is complete.
+
+    Attributes:
+        process: The CoreMinerProcess used to send the commands.
+        start (int): The first address to dump.
+        end (int): The address after the last byte to dump.
+        path (str): The file receiving the memory.
+        offset (int): The number of bytes written so far.
+        resumed_from (int): The offset an interrupted dump was resumed from.
+        running (bool): True while words are being read.
+    """
+
+    def __init__(self, process, start: int, end: int, path: str, window: int = READ_WINDOW):
+        """
+        Initialize the MemoryDump.
+
+        Args:
+            process: The CoreMinerProcess used to send the commands.
+            start (int): The first address to dump.
+            end (int): The address after the last byte to dump.
+            path (str): The file receiving the memory.
+            window (int): The number of ReadMem commands kept queued.
+        """
+        self.process = process
+        self.start = start
+        self.end = end
+        self.path = path
+        self.window = window
+        self.offset = 0
+        self.resumed_from = 0
+        self.running = False
+        self.generation = 0
+        self._next = 0
+        self._pending = 0
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._started_at = 0.0
+        self._reported_at = 0.0
+        self._checkpoint = 0
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+    @property
+    def progress_path(self) -> str:
+        return self.path + PROGRESS_SUFFIX
+
+    def start_dump(self) -> None:
+        """
+        Create (or reopen) the file with its final size and start reading words.
+
+        Raises:
+            OSError: If the file can not be created.
+        """
+        self.resumed_from = self._load_progress()
+        mode = "r+b" if self.resumed_from else "w+b"
+        self._file = open(self.path, mode)
+        self._file.truncate(self.length)
+        self._map = mmap.mmap(self._file.fileno(), self.length)
+        self.offset = self._next = self._checkpoint = self.resumed_from
+        self.generation = self.process.stop_generation
+        self.running = True
+        self._started_at = self._reported_at = time.perf_counter()
+        self._save_progress()
+        if self.resumed_from:
+            self.process.data_store.set_output(
+                f"[hh]: Resuming dump of {self.start:#x}-{self.end:#x} at offset {self.resumed_from:#x}")
+        self._fill()
+        if self.offset >= self.length:
+            self._finish()
+
+    def _load_progress(self) -> int:
+        """
+        Get the offset to resume from, if an interrupted dump of the same range into the same file exists.
+
+        Returns:
+            int: The recorded offset, or 0 to start over.
+        """
+        try:
+            with open(self.progress_path) as progress_file:
+                progress = json.load(progress_file)
+            if (progress.get("start") == self.start and progress.get("end") == self.end
+                    and os.path.getsize(self.path) == self.length):
+                return min(int(progress.get("offset", 0)), self.length)
+        except (OSError, ValueError):
+            pass
+        return 0
+
+    def _save_progress(self) -> None:
+        with open(self.progress_path, "w") as progress_file:
+            json.dump({"start": self.start, "end": self.end, "offset": self.offset}, progress_file)
+
+    def _fill(self) -> None:
+        # Keep the window of queued ReadMem commands full
+        while self.running and self._pending < self.window and self._next < self.length:
+            address = self.start + self._next
+            self._next += WORD_SIZE
+            self._pending += 1
+            self.process.command_scheduler.put_user(
+                json.dumps({"status": {"ReadMem": address}}),
+                on_feedback=partial(self._on_word, address), quiet=True, on_dropped=self._on_dropped)
+
+    def _on_dropped(self) -> None:
+        if self.running:
+            self._interrupt("the queued reads were dropped")
+
+    def _on_word(self, address: int, feedback: Feedback) -> bool:
+        """
+        Write a word into the file and queue the next ReadMem command.
+
+        Args:
+            address (int): The address of the word.
+            feedback (Feedback): The feedback of the ReadMem command.
+
+        Returns:
+            bool: True if the word was read, False if the dump stopped because of an error.
+        """
+        self._pending -= 1
+        if not self.running:
+            return True
+        if not isinstance(feedback, WordFeedback):
+            executed_successfull = self.process.feedback_parser.parse_feedback(feedback)
+            self._interrupt(f"{address:#x} is not readable")
+            return executed_successfull
+        if self.process.command_generation != self.generation:
+            self._interrupt("the debuggee was stopped again")
+            return True
+
+        offset = address - self.start
+        size = min(WORD_SIZE, self.length - offset)
+        self._map[offset:offset + size] = (feedback.word & WORD_MASK).to_bytes(WORD_SIZE, "little")[:size]
+        self.offset = offset + size
+
+        if self.offset >= self.length:
+            self._finish()
+            return True
+        if self.offset - self._checkpoint >= CHECKPOINT_BYTES:
+            self._map.flush()
+            self._save_progress()
+            self._checkpoint = self.offset
+        now = time.perf_counter()
+        if now - self._reported_at >= PROGRESS_INTERVAL:
+            self._reported_at = now
+            self.process.data_store.set_output(f"[hh]: {self._progress_text()}")
+            self.process.request_update()
+        self._fill()
+        return True
+
+    def _progress_text(self) -> str:
+        elapsed = time.perf_counter() - self._started_at
+        rate = (self.offset - self.resumed_from) / elapsed if elapsed > 0 else 0.0
+        percent = 100 * self.offset / self.length
+        return (f"Dumped {self.offset:#x}/{self.length:#x} bytes ({percent:.0f}%) in {elapsed:.1f}s "
+                f"({rate / 1024:.1f} KiB/s)")
+
+    def _close(self) -> None:
+        self.running = False
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+
+    def cancel(self) -> None:
+        """
+        Stop the dump; it can be resumed by running it again.
+        """
+        if self.running:
+            self._interrupt("cancelled")
+
+    def _interrupt(self, reason: str) -> None:
+        """
+        Stop the dump and keep the progress, so running the same dump again resumes it.
+
+        Args:
+            reason (str): Why the dump stopped.
+        """
+        self._save_progress()
+        self._close()
+        self.process.data_store.set_output(
+            f"[hh][!]: Dump interrupted, {reason}: {self._progress_text()}. Run it again to resume.")
+
+    def _finish(self) -> None:
+        """
+        Close the file, remove the sidecar file and show the dump in the MemoryFile widget.
+        """
+        self._close()
+        try:
+            os.remove(self.progress_path)
+        except OSError:
+            pass
+        self.process.data_store.set_output(f"[hh]: {self._progress_text()} to {self.path}")
+        self.process.data_store.set_memory_file(self.start, self.path, open_memory_file(self.path))
+
+
+def open_memory_file(path: str):
+    """
+    Map a dump file read-only, so a viewer can page through it without reading it into memory.
+
+    Args:
+        path (str): The dump file.
+
+    Returns:
+        mmap.mmap | bytes: The mapped file, or empty bytes for an empty file.
+    """
+    with open(path, "rb") as memory_file:
+        if os.fstat(memory_file.fileno()).st_size == 0:
+            return b""
+        # The mapping stays valid after the file is closed
+        return mmap.mmap(memory_file.fileno(), 0, access=mmap.ACCESS_READ)
@@ -0,0 +1,125 @@
+"""
+Module for indexing the memory map of the debuggee.
+
+This module defines the MemoryMap class, which keeps the regions of the last ProcessMap feedback sorted by their
+start address. An address is resolved to its region with a binary search, so the Stack and Registers widgets can
+tag every word that points into mapped memory (e.g. `[heap]`, `libc.so.6+0x1234`) without asking the CoreMiner.
+"""
+
+import os
+from bisect import bisect_right
+from typing import Iterable, Optional
+
+from feedback_decoder import MemoryRegion
+
+
+class MemoryMap:
+    """
+    Sorted interval index of the mapped regions of the debuggee.
+
+    The map is marked stale by commands that may map or unmap memory (running a new debuggee or executing an
+    unknown amount of code); the regions are kept until the next ProcessMap feedback replaces them.
+
+    Attributes:
+        stale (bool): True if the regions may be outdated and should be fetched again.
+        generation (int): Incremented whenever the regions changed.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty MemoryMap.
+        """
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._regions: list[MemoryRegion] = []
+        self.stale = False
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    def update(self, regions: Iterable[MemoryRegion]) -> None:
+        """
+        Replace all regions with the regions of a ProcessMap feedback.
+
+        Args:
+            regions (Iterable[MemoryRegion]): The decoded regions, in any order.
+        """
+        self._regions = sorted(regions, key=lambda region: region.start_address)
+        self._starts = [region.start_address for region in self._regions]
+        self._ends = [region.end_address for region in self._regions]
+        self.stale = False
+        self.generation += 1
+
+    def invalidate(self) -> None:
+        """
+        Mark the regions as possibly outdated.
+        """
+        self.stale = True
+
+    def lookup(self, address: int) -> Optional[MemoryRegion]:
+        """
+        Get the region containing an address.
+
+        Args:
+            address (int): The address to resolve.
+
+        Returns:
+            Optional[MemoryRegion]: The region, or None if the address is not mapped.
+        """
+        index = bisect_right(self._starts, address) - 1
+        if index < 0 or address >= self._ends[index]:
+            return None
+        return self._regions[index]
+
+    def find(self, name: str) -> Optional[MemoryRegion]:
+        """
+        Get the first region whose path or file name matches, e.g. "[heap]" or "libc.so.6".
+
+        Args:
+            name (str): The path or file name.
+
+        Returns:
+            Optional[MemoryRegion]: The region with the lowest address, or None if no region matches.
+        """
+        for region in self._regions:
+            if region.path and (region.path == name or os.path.basename(region.path) == name):
+                return region
+        return None
+
+    def readable_regions(self, name: Optional[str] = None) -> list[MemoryRegion]:
+        """
+        Get the readable regions in ascending address order.
+
+        Args:
+            name (Optional[str]): Only return the regions whose path or file name matches, e.g. "libc.so.6".
+
+        Returns:
+            list[MemoryRegion]: The matching readable regions.
+        """
+        return [region for region in self._regions
+                if region.read and (name is None or region.path == name
+                                    or (region.path and os.path.basename(region.path) == name))]
+
+    def describe(self, address: int) -> str:
+        """
+        Format the region an address points into.
+
+        Pseudo regions like the heap and the stack are named by their path, e.g. "[heap]". Addresses in a mapped
+        file are described by the file name and the offset in the file, e.g. "libc.so.6+0x29d90".
+
+        Args:
+            address (int): The address to describe.
+
+        Returns:
+            str: The description, or an empty string if the address is not mapped.
+        """
+        region = self.lookup(address)
+        if region is None:
+            return ""
+        path = region.path
+        if not path:
+            return "[anon]"
+        if path.startswith("["):
+            return path
+        return f"{os.path.basename(path)}+0x{address - region.start_address + region.offset:x}"
@@ -0,0 +1,180 @@
+"""
+Module for searching the memory of the debuggee for a byte pattern.
+
+This module defines the MemorySearch class, which walks the readable regions of the memory map in chunks of one
+page. Every chunk is read through the MemoryCache, so memory that was viewed during the current stop is not read
+again. The chunks are matched as a stream: the last bytes of a chunk are kept and prepended to the next one, so a
+pattern crossing a chunk boundary is found as well. Hits are reported incrementally while the scan runs.
+"""
+
+import time
+from typing import Optional
+
+from memory_cache import PAGE_SIZE, MemoryRead
+
+# Bytes read and matched at a time
+CHUNK_SIZE = PAGE_SIZE
+
+# The search stops after this many hits
+MAX_RESULTS = 10000
+
+# Seconds between two progress updates of the widgets
+PROGRESS_INTERVAL = 0.5
+
+
+class MemorySearch:
+    """
+    Searches a list of memory ranges for a byte pattern, chunk by chunk.
+
+    Only one chunk is read at a time, so commands entered by the user are sent in between and the scan can be
+    cancelled at any chunk boundary. Unreadable pages are skipped.
+
+    Attributes:
+        process: The CoreMinerProcess used to read the memory.
+        pattern (bytes): The bytes to search for.
+        ranges (list[tuple[int, int]]): The [start, end) ranges to search, in ascending order.
+        hits (int): The number of hits found so far.
+        scanned (int): The number of bytes searched so far.
+        running (bool): True while the search is running.
+    """
+
+    def __init__(self, process, pattern: bytes, ranges: list[tuple[int, int]]):
+        """
+        Initialize the MemorySearch.
+
+        Args:
+            process: The CoreMinerProcess used to read the memory.
+            pattern (bytes): The bytes to search for, at least one byte.
+            ranges (list[tuple[int, int]]): The [start, end) ranges to search, in ascending order.
+        """
+        self.process = process
+        self.pattern = pattern
+        self.ranges = ranges
+        self.total = sum(end - start for start, end in ranges)
+        self.hits = 0
+        self.scanned = 0
+        self.skipped = 0
+        self.running = False
+        self.generation = 0
+        self._range_index = 0
+        self._position = 0
+        self._tail = b""
+        self._read_done = True
+        self._advancing = False
+        self._started_at = 0.0
+        self._reported_at = 0.0
+
+    def start(self) -> None:
+        """
+        Start reading and matching the first chunk.
+        """
+        self.running = True
+        self.generation = self.process.stop_generation
+        self._started_at = self._reported_at = time.perf_counter()
+        if self.ranges:
+            self._position = self.ranges[0][0]
+        self._report()
+        self._advance()
+
+    def cancel(self) -> None:
+        """
+        Stop the search after the chunk that is currently read.
+        """
+        if self.running:
+            self.running = False
+            self._report("cancelled")
+
+    def _advance(self) -> None:
+        """
+        Read the next chunk, and keep going as long as chunks are answered from the cache right away.
+        """
+        if self._advancing:
+            # Called from a chunk that was answered from the cache inside the loop below
+            return
+        self._advancing = True
+        try:
+            while self.running and self._read_done:
+                chunk = self._next_chunk()
+                if chunk is None:
+                    self.running = False
+                    self._report("done")
+                    break
+                self._read_done = False
+                start, length = chunk
+                MemoryRead(self.process, start, length, self._on_chunk, quiet_errors=True).run()
+        finally:
+            self._advancing = False
+
+    def _next_chunk(self) -> Optional[tuple[int, int]]:
+        # Move on to the next range once the current one is searched
+        while self._range_index < len(self.ranges):
+            end = self.ranges[self._range_index][1]
+            if self._position < end:
+                return self._position, min(CHUNK_SIZE - self._position % CHUNK_SIZE, end - self._position)
+            self._range_index += 1
+            self._tail = b""
+            if self._range_index < len(self.ranges):
+                self._position = self.ranges[self._range_index][0]
+        return None
+
+    def _on_chunk(self, read: MemoryRead) -> None:
+        """
+        Match a chunk that was read, together with the end of the previous chunk.
+
+        Args:
+            read (MemoryRead): The finished read of the chunk.
+        """
+        self._read_done = True
+        if not self.running:
+            return
+        if self.process.stop_generation != self.generation:
+            self.running = False
+            self._report("stopped, the debuggee was stopped again")
+            return
+
+        buffer = self._tail + read.data
+        base = read.start - len(self._tail)
+        found = []
+        index = buffer.find(self.pattern)
+        while index != -1 and self.hits + len(found) < MAX_RESULTS:
+            found.append(base + index)
+            index = buffer.find(self.pattern, index + 1)
+        if found:
+            self.hits += len(found)
+            self.process.data_store.add_search_results(found)
+
+        self.scanned += len(read.data)
+        if read.error_address is None:
+            self._position = read.start + read.length
+            self._tail = buffer[len(buffer) - len(self.pattern) + 1:] if len(self.pattern) > 1 else b""
+        else:
+            # Skip the rest of the unreadable page; a match can not cross it
+            self._position = read.error_address - read.error_address % PAGE_SIZE + PAGE_SIZE
+            self.skipped += self._position - read.start - len(read.data)
+            self._tail = b""
+
+        if self.hits >= MAX_RESULTS:
+            self.running = False
+            self._report(f"stopped after {MAX_RESULTS} hits")
+            return
+        now = time.perf_counter()
+        if found or now - self._reported_at >= PROGRESS_INTERVAL:
+            self._reported_at = now
+            self._report()
+        self._advance()
+
+    def _report(self, state: str = "searching") -> None:
+        """
+        Show the progress of the search in the results widget.
+
+        Args:
+            state (str): The state of the search, e.g. "searching" or "done".
+        """
+        done = self.scanned + self.skipped
+        percent = 100 * done / self.total if self.total else 100.0
+        elapsed = time.perf_counter() - self._started_at
+        self.process.data_store.set_search_status(
+            f"{state}: {self.hits} hits, {done:#x}/{self.total:#x} bytes ({percent:.0f}%) in {elapsed:.1f}s")
+        self.process.request_update()
+        if state != "searching":
+            self.process.data_store.set_output(f"[hh]: Search {state}, {self.hits} hits")
@@ -0,0 +1,190 @@
+"""
+Module providing a bounded, line oriented ring buffer.
+
+The RingBuffer is used by the data store for the continuously growing texts (debuggee output and raw
+CoreMiner responses). Appending a line is O(1), reading a line by its index is O(1) and the memory usage
+is capped by a maximum number of lines and a maximum number of characters. Lines that drop out of the
+buffer can optionally be spilled into a file on disk, so nothing gets lost during long sessions. The spill file
+is written through Python's file buffer and only flushed by `flush`, once per batch of responses.
+"""
+
+from typing import Optional
+
+DEFAULT_MAX_LINES = 100_000
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+class RingBuffer:
+    """
+    A fixed capacity ring buffer of text lines.
+
+    Every line that was ever appended gets an absolute index, starting with 0. Once a cap is reached the
+    oldest lines are evicted, so `first_index` moves forward while `end_index` keeps counting all appended
+    lines. Readers (e.g. widgets) can remember the `end_index` they have seen to fetch only new lines.
+
+    Attributes:
+        max_lines (int): Maximum number of lines kept in memory.
+        max_bytes (int): Maximum number of characters (including line breaks) kept in memory.
+        spill_path (Optional[str]): File the evicted lines are appended to, or None to drop them.
+        first_index (int): Absolute index of the oldest line still in the buffer.
+        size (int): Number of characters (including line breaks) currently stored.
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 spill_path: Optional[str] = None):
+        """
+        Initialize an empty RingBuffer.
+
+        Args:
+            max_lines (int): Maximum number of lines kept in memory.
+            max_bytes (int): Maximum number of characters (including line breaks) kept in memory.
+            spill_path (Optional[str]): If set, evicted lines are appended to this file.
+        """
+        if max_lines < 1:
+            raise ValueError("max_lines must be at least 1")
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.spill_path = spill_path
+        self._spill_file = None
+
+        self._slots: list[Optional[str]] = []
+        self._start = 0
+        self._count = 0
+        self.first_index = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def end_index(self) -> int:
+        """
+        Absolute index one past the newest line, i.e. the number of lines ever appended.
+        """
+        return self.first_index + self._count
+
+    def append(self, text: str) -> None:
+        """
+        Append text to the buffer. Text containing line breaks is split into several lines.
+
+        Args:
+            text (str): The text to be added.
+        """
+        for line in text.split("\n"):
+            self._append_line(line)
+
+    def _append_line(self, line: str) -> None:
+        """
+        Append a single line and evict the oldest lines until both caps are satisfied again.
+
+        Args:
+            line (str): A line without line breaks.
+        """
+        if self._count == self.max_lines:
+            self._evict()
+
+        slot = (self._start + self._count) % self.max_lines
+        if slot == len(self._slots):
+            self._slots.append(line)
+        else:
+            self._slots[slot] = line
+        self._count += 1
+        self.size += len(line) + 1
+
+        # Always keep the newest line, even if it alone exceeds the byte cap
+        while self.size > self.max_bytes and self._count > 1:
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Remove the oldest line from the buffer and spill it to disk if configured.
+        """
+        line = self._slots[self._start]
+        self._slots[self._start] = None
+        self._start = (self._start + 1) % self.max_lines
+        self._count -= 1
+        self.first_index += 1
+        self.size -= len(line) + 1
+
+        if self.spill_path:
+            if self._spill_file is None:
+                self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+            self._spill_file.write(line + "\n")
+
+    def flush(self) -> None:
+        """
+        Write the spilled lines that are still buffered to the spill file.
+        """
+        if self._spill_file is not None:
+            self._spill_file.flush()
+
+    def close(self) -> None:
+        """
+        Flush and close the spill file. A later eviction opens it again.
+        """
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def get(self, index: int) -> Optional[str]:
+        """
+        Get a single line by its absolute index.
+
+        Args:
+            index (int): Absolute index of the line.
+
+        Returns:
+            Optional[str]: The line, or None if it was evicted or does not exist yet.
+        """
+        if index < self.first_index or index >= self.end_index:
+            return None
+        return self._slots[(self._start + index - self.first_index) % self.max_lines]
+
+    def slice(self, start: int, stop: int) -> list[str]:
+        """
+        Get the lines with an absolute index in the range [start, stop).
+
+        Indices outside of the lines currently held are clipped.
+
+        Args:
+            start (int): Absolute index of the first line.
+            stop (int): Absolute index one past the last line.
+
+        Returns:
+            list[str]: The requested lines, oldest first.
+        """
+        start = max(start, self.first_index)
+        stop = min(stop, self.end_index)
+        return [self._slots[(self._start + index - self.first_index) % self.max_lines]
+                for index in range(start, stop)]
+
+    def tail(self, count: int) -> list[str]:
+        """
+        Get the newest lines.
+
+        Args:
+            count (int): Maximum number of lines to return.
+
+        Returns:
+            list[str]: The newest `count` lines, oldest first.
+        """
+        return self.slice(self.end_index - count, self.end_index)
+
+    def text(self) -> str:
+        """
+        Join all lines currently held into a single string.
+
+        Returns:
+            str: The buffered lines separated by line breaks.
+        """
+        return "\n".join(self.slice(self.first_index, self.end_index))
+
+    def clear(self) -> None:
+        """
+        Remove all lines. The absolute indices keep counting, so readers notice the change.
+        """
+        self.first_index = self.end_index
+        self._slots = []
+        self._start = 0
+        self._count = 0
+        self.size = 0
@@ -0,0 +1,102 @@
+"""
+Module for following the instruction pointer in the Disassembly widget.
+
+This module defines the RipFollower class, which shows a window of instructions around the current RIP after
+every stop of the debuggee. The instructions after RIP are disassembled ahead in the background lane of the
+CommandScheduler and kept in the DisassemblyCache, so as long as the next RIP is still inside the cached range,
+stepping updates the window right away without waiting for a DisassembleAt. Like any other reload, RIP is only
+followed while a widget showing the disassembly is visible.
+"""
+
+from typing import Optional
+
+from disassembly_cache import DisassemblyLookup
+
+# Bytes of instructions shown in the Disassembly widget
+WINDOW_BYTES = 0x60
+
+# Bytes after RIP that are disassembled ahead in the background
+PREFETCH_BYTES = 0x200
+
+# Already disassembled instructions kept above RIP when the window moves
+CONTEXT_INSTRUCTIONS = 3
+
+# Reload request of the widgets showing the disassembly; handled by HardHat instead of being sent to the CoreMiner
+FOLLOW_RIP_COMMAND = {"hardhat": "FollowRip"}
+
+
+class RipFollower:
+    """
+    Keeps the Disassembly widget at the current RIP.
+
+    The window stays in place while RIP moves inside it. When RIP leaves the window (or lands in the middle of a
+    cached instruction), the window moves to RIP, keeping a few cached instructions above it for context.
+    The instructions after RIP are prefetched in large chunks once less than half of the prefetch range is left.
+
+    Attributes:
+        process: The CoreMinerProcess used to send the commands.
+        enabled (bool): True if the disassembly follows RIP, False if the user turned following off.
+        visible (bool): True if a widget that requests FOLLOW_RIP_COMMAND was visible at the last reload.
+        window_start (Optional[int]): The address of the first instruction shown.
+        window_bytes (int): Bytes of instructions shown.
+        prefetch_bytes (int): Bytes after RIP that are disassembled ahead.
+    """
+
+    def __init__(self, process, window_bytes: int = WINDOW_BYTES, prefetch_bytes: int = PREFETCH_BYTES):
+        """
+        Initialize the RipFollower.
+
+        Args:
+            process: The CoreMinerProcess used to send the commands.
+            window_bytes (int): Bytes of instructions shown.
+            prefetch_bytes (int): Bytes after RIP that are disassembled ahead.
+        """
+        self.process = process
+        self.enabled = True
+        self.visible = True
+        self.window_start: Optional[int] = None
+        self.window_bytes = window_bytes
+        self.prefetch_bytes = prefetch_bytes
+        self._rip_generation = 0
+
+    def check(self) -> bool:
+        """
+        Follow RIP if it was updated in the data store since the last check.
+
+        Returns:
+            bool: True if the window was displayed right away from the cache.
+        """
+        data_store = self.process.data_store
+        generation = data_store.get_generation("rip")
+        if generation == self._rip_generation:
+            return False
+        self._rip_generation = generation
+        if not self.enabled or not self.visible:
+            return False
+        return self.follow(data_store.get_rip())
+
+    def follow(self, rip) -> bool:
+        """
+        Show the window around RIP and prefetch the instructions after it.
+
+        Args:
+            rip: The current instruction pointer; ignored if it is not known yet.
+
+        Returns:
+            bool: True if the window was displayed right away from the cache.
+        """
+        if not isinstance(rip, int):
+            return False
+        cache = self.process.disassembly_cache
+        if (self.window_start is None or not self.window_start <= rip < self.window_start + self.window_bytes
+                or not cache.is_instruction(rip)):
+            self.window_start = cache.preceding_address(rip, CONTEXT_INSTRUCTIONS)
+
+        # Prefetch again only when less than half of the prefetch range after RIP is left, to fetch large chunks
+        fetch_end = self.window_start + self.window_bytes
+        if cache.missing_ranges(rip, rip + self.prefetch_bytes // 2):
+            fetch_end = max(fetch_end, rip + self.prefetch_bytes)
+        lookup = DisassemblyLookup(self.process, self.window_start, fetch_end - self.window_start,
+                                   display_length=self.window_bytes, background=True)
+        lookup.run()
+        return lookup.shown
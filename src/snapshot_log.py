@@ -0,0 +1,292 @@
+"""
+Module for keeping the state of the recent stops of the debuggee.
+
+This module defines the SnapshotLog class, which records the registers, the stack and the backtrace of every stop
+so an earlier stop can be shown again without asking the CoreMiner. Consecutive stops differ in a few registers
+and stack words only, so a snapshot stores just the words that changed against the snapshot before. Every
+KEYFRAME_INTERVAL snapshots a full snapshot is stored, which bounds the number of deltas applied to restore one.
+"""
+
+import sys
+from array import array
+from collections import deque
+from typing import NamedTuple, Optional
+
+# Number of stops kept in the log
+SNAPSHOT_CAPACITY = 1000
+
+# A full snapshot is stored after this many delta snapshots
+KEYFRAME_INTERVAL = 64
+
+REGISTER_MASK = 0xffffffffffffffff
+
+
+class StopState(NamedTuple):
+    """
+    The decoded state of a stop.
+
+    Attributes:
+        stop (int): The stop generation.
+        registers (dict[str, int]): The register names mapped to their values.
+        stack_start (int): The address of the first word of the stack.
+        stack_words (list[int]): The words of the stack.
+        backtrace (str): The formatted backtrace.
+    """
+    stop: int
+    registers: dict[str, int]
+    stack_start: int
+    stack_words: list[int]
+    backtrace: str
+
+
+class _Snapshot:
+    """
+    One encoded stop. A keyframe lists every register and stack word, a delta only the changed ones.
+    """
+
+    __slots__ = ("stop", "keyframe", "register_indices", "register_values", "stack_start", "stack_length",
+                 "stack_indices", "stack_values", "backtrace")
+
+    def __init__(self, stop: int, keyframe: bool, register_indices: array, register_values: array,
+                 stack_start: int, stack_length: int, stack_indices: array, stack_values: array,
+                 backtrace: Optional[str]):
+        self.stop = stop
+        self.keyframe = keyframe
+        self.register_indices = register_indices
+        self.register_values = register_values
+        self.stack_start = stack_start
+        self.stack_length = stack_length
+        self.stack_indices = stack_indices
+        self.stack_values = stack_values
+        # None if the backtrace did not change
+        self.backtrace = backtrace
+
+    def size(self) -> int:
+        """
+        Get the approximate number of bytes used by the snapshot.
+        """
+        return (sys.getsizeof(self) + sys.getsizeof(self.register_indices) + sys.getsizeof(self.register_values)
+                + sys.getsizeof(self.stack_indices) + sys.getsizeof(self.stack_values)
+                + (sys.getsizeof(self.backtrace) if self.backtrace is not None else 0))
+
+
+def _project_stack(start: int, words: list[int], new_start: int, length: int) -> list[int]:
+    """
+    Move the words of a stack to another start address, so words at the same address line up.
+
+    Args:
+        start (int): The address of the first word of the stack.
+        words (list[int]): The words of the stack.
+        new_start (int): The address of the first word of the projected stack.
+        length (int): The number of words of the projected stack.
+
+    Returns:
+        list[int]: The projected words; words that were not part of the stack are 0.
+    """
+    projected = [0] * length
+    shift, misaligned = divmod(new_start - start, 8)
+    if misaligned:
+        return projected
+    first = max(0, -shift)
+    last = min(length, len(words) - shift)
+    if first < last:
+        projected[first:last] = words[first + shift:last + shift]
+    return projected
+
+
+class SnapshotLog:
+    """
+    Bounded, delta-encoded log of the state of the recent stops.
+
+    Snapshots are addressed by their index, 0 being the oldest one that is still kept. When the log is full, the
+    oldest snapshot is dropped and the snapshot after it is turned into a keyframe.
+
+    Attributes:
+        capacity (int): The maximum number of snapshots.
+        names (tuple[str, ...]): The register names, i.e. the layout of the register values.
+    """
+
+    def __init__(self, capacity: int = SNAPSHOT_CAPACITY, keyframe_interval: int = KEYFRAME_INTERVAL):
+        """
+        Initialize an empty SnapshotLog.
+
+        Args:
+            capacity (int): The maximum number of snapshots.
+            keyframe_interval (int): The number of delta snapshots between two keyframes.
+        """
+        self.capacity = capacity
+        self.keyframe_interval = keyframe_interval
+        self.names: tuple[str, ...] = ()
+        self._snapshots: deque[_Snapshot] = deque()
+        # The decoded newest state and the state before it, the bases for encoding the next snapshot
+        self._last: Optional[StopState] = None
+        self._before_last: Optional[StopState] = None
+        self._since_keyframe = 0
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def clear(self) -> None:
+        """
+        Drop all snapshots.
+        """
+        self._snapshots.clear()
+        self._last = self._before_last = None
+        self._since_keyframe = 0
+
+    def record(self, stop: int, registers: dict[str, int], stack_start: int, stack_words: list[int],
+               backtrace: str) -> None:
+        """
+        Record the state of a stop. State received again during the same stop replaces its snapshot.
+
+        Args:
+            stop (int): The stop generation the state belongs to.
+            registers (dict[str, int]): The register names mapped to their values.
+            stack_start (int): The address of the first word of the stack.
+            stack_words (list[int]): The words of the stack.
+            backtrace (str): The formatted backtrace.
+        """
+        names = tuple(registers)
+        if names != self.names:
+            # Another register layout can not be diffed against the recorded snapshots
+            self.clear()
+            self.names = names
+
+        if self._snapshots and self._snapshots[-1].stop == stop:
+            # The replacement keeps the place of the replaced snapshot in the keyframe interval
+            replaced = self._snapshots.pop()
+            base = self._before_last
+            keyframe = replaced.keyframe or base is None
+        else:
+            base = self._last
+            self._before_last = self._last
+            keyframe = base is None or self._since_keyframe >= self.keyframe_interval
+            self._since_keyframe = 0 if keyframe else self._since_keyframe + 1
+
+        state = StopState(stop, {name: value & REGISTER_MASK for name, value in registers.items()}, stack_start,
+                          list(stack_words), backtrace)
+        self._snapshots.append(self._encode(state, None if keyframe else base))
+        self._last = state
+
+        if len(self._snapshots) > self.capacity:
+            self._drop_oldest()
+
+    def _encode(self, state: StopState, base: Optional[StopState]) -> _Snapshot:
+        """
+        Encode a state against the state of the stop before.
+
+        Args:
+            state (StopState): The state to encode.
+            base (Optional[StopState]): The state of the stop before, None to encode a keyframe.
+
+        Returns:
+            _Snapshot: The encoded snapshot.
+        """
+        values = list(state.registers.values())
+        words = state.stack_words
+        if base is None:
+            register_indices = array("H", range(len(values)))
+            register_values = array("Q", values)
+            stack_indices = array("I", range(len(words)))
+            stack_values = array("Q", words)
+            backtrace = state.backtrace
+        else:
+            register_indices = array("H", [index for index, (value, before)
+                                           in enumerate(zip(values, base.registers.values())) if value != before])
+            register_values = array("Q", [values[index] for index in register_indices])
+            projected = _project_stack(base.stack_start, base.stack_words, state.stack_start, len(words))
+            stack_indices = array("I", [index for index, (word, before)
+                                        in enumerate(zip(words, projected)) if word != before])
+            stack_values = array("Q", [words[index] for index in stack_indices])
+            backtrace = None if state.backtrace == base.backtrace else state.backtrace
+        return _Snapshot(state.stop, base is None, register_indices, register_values, state.stack_start,
+                         len(words), stack_indices, stack_values, backtrace)
+
+    def _drop_oldest(self) -> None:
+        # The new oldest snapshot must not depend on the dropped one
+        if not self._snapshots[1].keyframe:
+            self._snapshots[1] = self._encode(self.state(1), None)
+        self._snapshots.popleft()
+
+    def stop(self, index: int) -> int:
+        """
+        Get the stop generation of a snapshot.
+
+        Args:
+            index (int): The index of the snapshot.
+        """
+        return self._snapshots[index].stop
+
+    def index_of_stop(self, stop: int) -> Optional[int]:
+        """
+        Get the index of the snapshot of a stop.
+
+        Args:
+            stop (int): The stop generation.
+
+        Returns:
+            Optional[int]: The index, or None if the stop is not in the log.
+        """
+        for index in range(len(self._snapshots) - 1, -1, -1):
+            if self._snapshots[index].stop == stop:
+                return index
+        return None
+
+    def state(self, index: int) -> StopState:
+        """
+        Decode the state of a snapshot by applying the deltas since the keyframe before it.
+
+        Args:
+            index (int): The index of the snapshot.
+
+        Returns:
+            StopState: The decoded state.
+
+        Raises:
+            IndexError: If there is no snapshot with this index.
+        """
+        if not 0 <= index < len(self._snapshots):
+            raise IndexError(index)
+        if index == len(self._snapshots) - 1:
+            return self._last
+        first = index
+        while not self._snapshots[first].keyframe:
+            first -= 1
+
+        values = [0] * len(self.names)
+        stack_start, words, backtrace = 0, [], ""
+        for position in range(first, index + 1):
+            snapshot = self._snapshots[position]
+            for register, value in zip(snapshot.register_indices, snapshot.register_values):
+                values[register] = value
+            words = _project_stack(stack_start, words, snapshot.stack_start, snapshot.stack_length)
+            stack_start = snapshot.stack_start
+            for word, value in zip(snapshot.stack_indices, snapshot.stack_values):
+                words[word] = value
+            if snapshot.backtrace is not None:
+                backtrace = snapshot.backtrace
+        return StopState(self._snapshots[index].stop, dict(zip(self.names, values)), stack_start, words,
+                         backtrace)
+
+    def changed(self, index: int) -> list[bool]:
+        """
+        Compare the registers of a snapshot with the registers of the snapshot before.
+
+        Args:
+            index (int): The index of the snapshot.
+
+        Returns:
+            list[bool]: For every register in the order of `names`, True if its value changed. Nothing changed
+                for the oldest snapshot.
+        """
+        registers = self.state(index).registers
+        if index == 0:
+            return [False] * len(registers)
+        previous = self.state(index - 1).registers
+        return [value != previous[name] for name, value in registers.items()]
+
+    def size(self) -> int:
+        """
+        Get the approximate number of bytes used by all snapshots.
+        """
+        return sum(snapshot.size() for snapshot in self._snapshots)
@@ -0,0 +1,113 @@
+"""
+Module for running a stepping command several times in a row.
+
+This module defines the StepBatch class, which sends a stepping command (e.g. StepSingle) back to back
+for a given number of times. The intermediate feedback is handled quietly: neither the widgets nor the basic
+information are reloaded between the steps. Only the final state is shown, together with the elapsed time
+and the stepping rate. The batch stops early if a step fails, the debuggee exits or the batch is cancelled.
+"""
+
+import json
+import time
+
+from feedback_decoder import Feedback, OkFeedback
+
+
+class StepBatch:
+    """
+    Sends a stepping command `count` times, one after the other.
+
+    Attributes:
+        process: The CoreMinerProcess used to send the commands.
+        command (dict): The JSON stepping command, e.g. {"status": "StepSingle"}.
+        count (int): The number of steps to perform.
+        done (int): The number of steps that succeeded so far.
+        running (bool): True until the batch finished.
+    """
+
+    def __init__(self, process, command: dict, count: int):
+        """
+        Initialize the StepBatch.
+
+        Args:
+            process: The CoreMinerProcess used to send the commands.
+            command (dict): The JSON stepping command.
+            count (int): The number of steps to perform.
+        """
+        self.process = process
+        self.command = command
+        self.command_json = json.dumps(command)
+        self.count = count
+        self.done = 0
+        self.running = False
+        self.started_at = 0.0
+        self._cancelled = False
+
+    def start(self) -> None:
+        """
+        Start the batch by sending the first step.
+        """
+        self.running = True
+        self.started_at = time.perf_counter()
+        self._send_step()
+
+    def cancel(self) -> None:
+        """
+        Stop the batch once the step that is queued or running answered.
+        """
+        self._cancelled = True
+
+    def _send_step(self) -> None:
+        self.process.command_scheduler.put_user(
+            self.command_json, state_changing=True, on_feedback=self._on_feedback, quiet=True,
+            on_dropped=self._on_dropped)
+
+    def _on_feedback(self, feedback: Feedback) -> bool:
+        """
+        Handle the feedback of a single step and send the next one.
+
+        Successful steps are only counted; each one makes the memory and registers of the stop before stale. Any
+        other feedback (an error or the exit of the debuggee) is passed to the FeedbackParser so it is reported to
+        the user, and the batch stops.
+
+        Args:
+            feedback (Feedback): The feedback received from CoreMiner.
+
+        Returns:
+            bool: True if the step was successful, False otherwise.
+        """
+        if isinstance(feedback, OkFeedback):
+            self.done += 1
+            self.process.state_changed()
+            if self._cancelled:
+                self._finish(reload_basic_info=True, reason="cancelled")
+            elif self.done < self.count:
+                self._send_step()
+            else:
+                self._finish(reload_basic_info=True)
+            return True
+
+        executed_successfull = self.process.feedback_parser.parse_feedback(feedback)
+        self._finish(reload_basic_info=executed_successfull)
+        return executed_successfull
+
+    def _on_dropped(self) -> None:
+        # The queued step was flushed, the steps done so far changed the state
+        self._finish(reload_basic_info=self.done > 0, reason="the next step was dropped")
+
+    def _finish(self, reload_basic_info: bool, reason: str = "") -> None:
+        """
+        Report the elapsed time and the stepping rate and reload the basic information once.
+
+        Args:
+            reload_basic_info (bool): True if the debuggee is still alive and its state should be reloaded.
+            reason (str): Why the batch stopped before all steps were done.
+        """
+        self.running = False
+        elapsed = time.perf_counter() - self.started_at
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        reason = f", {reason}" if reason else ""
+        self.process.data_store.set_output(
+            f"[hh]: {self.done}/{self.count} steps in {elapsed:.3f}s ({rate:.0f} steps/s){reason}")
+        if reload_basic_info:
+            self.process.reload_basic_info()
@@ -0,0 +1,189 @@
+"""
+Module for indexing the symbols of the debuggee during a session.
+
+This module defines the SymbolIndex class, which collects the symbols HardHat learns from every Symbols and
+Backtrace feedback. Names are mapped to addresses with a dict, and the address ranges of the functions are kept
+sorted, so an address is resolved to function+offset with a binary search. The views use the index to annotate
+addresses without asking the CoreMiner again.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Optional
+
+# Assumed maximum size of a symbol whose end is unknown (learned from a backtrace frame)
+OPEN_SYMBOL_SIZE = 0x10000
+
+
+class SymbolIndex:
+    """
+    Session-level index of function symbols.
+
+    A symbol learned from a Symbols feedback has a known address range. A symbol learned from a backtrace frame
+    only has a start address; its range is assumed to reach up to the next known symbol, but at most
+    OPEN_SYMBOL_SIZE bytes.
+
+    Attributes:
+        generation (int): Incremented whenever the index changed.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty SymbolIndex.
+        """
+        self._addresses: dict[str, int] = {}
+        self._starts: list[int] = []
+        self._ends: list[Optional[int]] = []
+        self._names: list[str] = []
+        self._sorted_names: Optional[list[str]] = None
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def add(self, name: str, start: int, end: Optional[int] = None) -> None:
+        """
+        Add a symbol, replacing a symbol that starts at the same address. A name that is known at another
+        address moves, i.e. its previous entry is removed.
+
+        Args:
+            name (str): The name of the symbol.
+            start (int): The first address of the symbol.
+            end (Optional[int]): The address after the last byte of the symbol, or None if unknown.
+        """
+        previous = self._addresses.get(name)
+        if previous is not None and previous != start:
+            # Otherwise the old entry keeps the name and replacing it later would drop the new address
+            moved = bisect_left(self._starts, previous)
+            del self._starts[moved]
+            del self._ends[moved]
+            del self._names[moved]
+        index = bisect_left(self._starts, start)
+        if index < len(self._starts) and self._starts[index] == start:
+            if self._names[index] == name and (end is None or self._ends[index] == end):
+                return
+            if end is None:
+                end = self._ends[index]
+            if self._names[index] != name:
+                self._addresses.pop(self._names[index], None)
+            self._ends[index] = end
+            self._names[index] = name
+        else:
+            self._starts.insert(index, start)
+            self._ends.insert(index, end)
+            self._names.insert(index, name)
+        self._addresses[name] = start
+        self._sorted_names = None
+        self.generation += 1
+
+    def add_symbols(self, symbols: Iterable) -> None:
+        """
+        Add every symbol (and nested child symbol) with an address range from a Symbols feedback.
+
+        Args:
+            symbols (Iterable[Symbol]): The decoded symbols.
+        """
+        for symbol in symbols:
+            if symbol.name is not None and symbol.low_addr is not None:
+                self.add(symbol.name, symbol.low_addr, symbol.high_addr)
+            self.add_symbols(symbol.children)
+
+    def add_frames(self, frames: Iterable) -> None:
+        """
+        Add the function of every named frame of a Backtrace feedback.
+
+        Args:
+            frames (Iterable[Frame]): The decoded frames.
+        """
+        for frame in frames:
+            if frame.name is not None and frame.start_addr is not None:
+                self.add(frame.name, frame.start_addr)
+
+    def clear(self) -> None:
+        """
+        Remove all symbols, e.g. when a new debuggee is run.
+        """
+        self._addresses.clear()
+        self._starts.clear()
+        self._ends.clear()
+        self._names.clear()
+        self._sorted_names = None
+        self.generation += 1
+
+    def address_of(self, name: str) -> Optional[int]:
+        """
+        Get the start address of a symbol.
+
+        Args:
+            name (str): The name of the symbol.
+
+        Returns:
+            Optional[int]: The address, or None if the symbol is unknown.
+        """
+        return self._addresses.get(name)
+
+    def lookup(self, address: int) -> Optional[tuple[str, int]]:
+        """
+        Resolve an address to the symbol containing it.
+
+        Args:
+            address (int): The address to resolve.
+
+        Returns:
+            Optional[tuple[str, int]]: The name of the symbol and the offset of the address in it, or None.
+        """
+        index = bisect_right(self._starts, address) - 1
+        if index < 0:
+            return None
+        end = self._ends[index]
+        if end is None:
+            end = self._starts[index] + OPEN_SYMBOL_SIZE
+        if address >= end:
+            return None
+        return self._names[index], address - self._starts[index]
+
+    def describe(self, address: int) -> str:
+        """
+        Format an address as symbol+offset, e.g. "main+0x10".
+
+        Args:
+            address (int): The address to describe.
+
+        Returns:
+            str: The description, or an empty string if the address belongs to no known symbol.
+        """
+        found = self.lookup(address)
+        if found is None:
+            return ""
+        name, offset = found
+        return f"{name}+0x{offset:x}" if offset else name
+
+    def matching(self, pattern: re.Pattern) -> list[tuple[str, int]]:
+        """
+        Get all known symbols whose name contains a match of a regular expression.
+
+        Args:
+            pattern (re.Pattern): The compiled regular expression, searched anywhere in the name.
+
+        Returns:
+            list[tuple[str, int]]: The names and start addresses of the matching symbols in address order.
+        """
+        return [(name, start) for name, start in zip(self._names, self._starts) if pattern.search(name)]
+
+    def complete(self, prefix: str) -> list[str]:
+        """
+        Get all known symbol names starting with a prefix, in sorted order.
+
+        Args:
+            prefix (str): The beginning of the name.
+
+        Returns:
+            list[str]: The matching names.
+        """
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._addresses)
+        lo = bisect_left(self._sorted_names, prefix)
+        hi = lo
+        while hi < len(self._sorted_names) and self._sorted_names[hi].startswith(prefix):
+            hi += 1
+        return self._sorted_names[lo:hi]
@@ -0,0 +1,217 @@
+"""
+Module for recording instruction traces of the debuggee.
+
+This module defines the TraceRecorder class, which single-steps the debuggee with the StepSingle and
+DumpRegisters commands and records the instruction pointer (and optionally further registers) of every
+executed instruction. The values are stored in compact `array('Q')` columns (8 bytes per value) instead of
+Python objects and no widget is refreshed while tracing, so millions of instructions can be recorded.
+A finished trace can be exported to a binary file or a CSV file.
+"""
+
+import json
+import sys
+import time
+from array import array
+from typing import Optional
+
+from feedback_decoder import Feedback, OkFeedback, RegistersFeedback
+
+STEP_COMMAND = json.dumps({"status": "StepSingle"})
+DUMP_REGISTERS_COMMAND = json.dumps({"status": "DumpRegisters"})
+
+
+class TraceRecorder:
+    """
+    Records the executed instructions of the debuggee step by step.
+
+    Before every step the registers are dumped and the instruction pointer of the instruction that is executed
+    next is recorded. Tracing stops after `max_steps` instructions, when the instruction at `until` is reached
+    (it is neither recorded nor executed), when a command fails or the debuggee exits, or when it is cancelled.
+
+    Attributes:
+        process: The CoreMinerProcess used to send the commands.
+        max_steps (int): The maximum number of instructions to trace.
+        until (Optional[int]): Address at which the trace stops, or None.
+        register_names (list[str]): Additional registers recorded with every instruction.
+        rips (array): The recorded instruction pointers.
+        registers (dict[str, array]): The recorded values of the additional registers.
+        running (bool): True while the trace is being recorded.
+        elapsed (float): Seconds the recording took.
+    """
+
+    def __init__(self, process, max_steps: int, until: Optional[int] = None,
+                 register_names: Optional[list[str]] = None):
+        """
+        Initialize the TraceRecorder.
+
+        Args:
+            process: The CoreMinerProcess used to send the commands.
+            max_steps (int): The maximum number of instructions to trace.
+            until (Optional[int]): Address at which the trace stops.
+            register_names (Optional[list[str]]): Additional registers to record with every instruction.
+        """
+        self.process = process
+        self.max_steps = max_steps
+        self.until = until
+        self.register_names = register_names or []
+        self.rips = array("Q")
+        self.registers = {name: array("Q") for name in self.register_names}
+        self.running = False
+        self.started_at = 0.0
+        self.elapsed = 0.0
+        self._cancelled = False
+
+    def __len__(self) -> int:
+        return len(self.rips)
+
+    def start(self) -> None:
+        """
+        Start the recording by dumping the registers of the current instruction.
+        """
+        self.running = True
+        self.started_at = time.perf_counter()
+        self._send(DUMP_REGISTERS_COMMAND, self._on_registers)
+
+    def cancel(self) -> None:
+        """
+        Stop the recording once the command that is queued or running answered.
+        """
+        self._cancelled = True
+
+    def _send(self, command_json: str, on_feedback, state_changing: bool = False) -> None:
+        self.process.command_scheduler.put_user(
+            command_json, state_changing=state_changing, on_feedback=on_feedback, quiet=True,
+            on_dropped=self._on_dropped)
+
+    def _on_dropped(self) -> None:
+        # The queued command was flushed, the steps done so far changed the state
+        self._finish(reload_basic_info=len(self.rips) > 0, reason="the next command was dropped")
+
+    def _on_registers(self, feedback: Feedback) -> bool:
+        """
+        Record the registers of the next instruction and either step or stop.
+
+        Args:
+            feedback (Feedback): The feedback of the DumpRegisters command.
+
+        Returns:
+            bool: True if the feedback contained the registers, False otherwise.
+        """
+        if not isinstance(feedback, RegistersFeedback):
+            return self._fail(feedback)
+        registers = feedback.registers
+
+        rip = registers["rip"]
+        if rip == self.until or len(self.rips) >= self.max_steps:
+            self._finish(reload_basic_info=True)
+            return True
+        if self._cancelled:
+            self._finish(reload_basic_info=True, reason="cancelled")
+            return True
+
+        try:
+            values = [registers[name] for name in self.register_names]
+        except KeyError as e:
+            # The names are checked by the CommandParser, so the CoreMiner did not dump this register
+            self.process.data_store.set_output(f"[hh][!]: Register missing in the dump: {e.args[0]}")
+            # Keeps the reload queued by _finish
+            self._finish(reload_basic_info=True)
+            return True
+
+        self.rips.append(rip)
+        for name, value in zip(self.register_names, values):
+            self.registers[name].append(value)
+
+        self._send(STEP_COMMAND, self._on_step, state_changing=True)
+        return True
+
+    def _on_step(self, feedback: Feedback) -> bool:
+        """
+        Dump the registers again after a successful step.
+
+        Args:
+            feedback (Feedback): The feedback of the StepSingle command.
+
+        Returns:
+            bool: True if the step was successful, False otherwise.
+        """
+        if not isinstance(feedback, OkFeedback):
+            return self._fail(feedback)
+        # Memory and registers read for the user belong to the instruction before
+        self.process.state_changed()
+        if self._cancelled:
+            self._finish(reload_basic_info=True, reason="cancelled")
+            return True
+        self._send(DUMP_REGISTERS_COMMAND, self._on_registers)
+        return True
+
+    def _fail(self, feedback: Feedback) -> bool:
+        """
+        Report an unexpected feedback (an error or the exit of the debuggee) and stop the trace.
+
+        Args:
+            feedback (Feedback): The unexpected feedback.
+
+        Returns:
+            bool: The result of the FeedbackParser for the feedback.
+        """
+        executed_successfull = self.process.feedback_parser.parse_feedback(feedback)
+        self._finish(reload_basic_info=executed_successfull)
+        return executed_successfull
+
+    def _finish(self, reload_basic_info: bool, reason: str = "") -> None:
+        """
+        Stop the recording, report the trace rate and reload the basic information once.
+
+        Args:
+            reload_basic_info (bool): True if the debuggee is still alive and its state should be reloaded.
+            reason (str): Why the recording stopped early, if it was cancelled.
+        """
+        self.running = False
+        self.elapsed = time.perf_counter() - self.started_at
+        rate = len(self.rips) / self.elapsed if self.elapsed > 0 else 0.0
+        size = len(self.rips) * 8 * (1 + len(self.register_names))
+        self.process.data_store.set_output(
+            f"[hh]: Traced {len(self.rips)} instructions in {self.elapsed:.3f}s "
+            f"({rate:.0f} instructions/s, {size} bytes){f', {reason}' if reason else ''}")
+        if reload_basic_info:
+            self.process.reload_basic_info()
+
+    def columns(self) -> list[tuple[str, array]]:
+        """
+        Get the recorded columns in export order.
+
+        Returns:
+            list[tuple[str, array]]: Pairs of column name and values, starting with rip.
+        """
+        return [("rip", self.rips)] + [(name, self.registers[name]) for name in self.register_names]
+
+    def export_binary(self, path: str) -> None:
+        """
+        Write the trace to a binary file.
+
+        The file contains the columns one after the other (rip first, then the additional registers in the
+        order they were requested). Every value is an unsigned 64 bit little endian integer.
+
+        Args:
+            path (str): The file to write.
+        """
+        with open(path, "wb") as file:
+            for _, values in self.columns():
+                if sys.byteorder != "little":
+                    values = array("Q", values)
+                    values.byteswap()
+                values.tofile(file)
+
+    def export_csv(self, path: str) -> None:
+        """
+        Write the trace to a CSV file with one row per instruction and hexadecimal values.
+
+        Args:
+            path (str): The file to write.
+        """
+        columns = self.columns()
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(",".join(name for name, _ in columns) + "\n")
+            for row in zip(*(values for _, values in columns)):
+                file.write(",".join(f"0x{value:x}" for value in row) + "\n")
@@ -17,13 +17,20 @@ class HelpMenu(ModalScreen[str]):
     USAGE_TEXT = """
     run PATH \[ARGS]         - Run program at PATH with optional arguments
     c, cont                 - Continue execution
-    s, step                 - Step one instruction
-    si                      - Step into function call
-    su, sov                 - Step over function call
-    so                      - Step out of current function
+    s, step \[N]             - Step one (or N) instructions
+    si \[N]                  - Step into function call (N times)
+    su, sov \[N]             - Step over function call (N times)
+    so \[N]                  - Step out of current function (N times)
     bp, break ADDR          - Set breakpoint at address (hex)
+    bp ADDR \[if C] \[hits N] - Stop only if condition C holds (e.g. rax == 5 && \[rsp] != 0), from the Nth hit
     dbp, delbreak ADDR      - Delete breakpoint at address (hex)
+    bl, breakpoints         - List the breakpoints with origin, condition and hits
+    bpon, bpoff ADDR|all    - Set a disabled breakpoint again / delete it but keep it in the list
+    bpclear                 - Delete all breakpoints
+    bpre REGEX              - Set breakpoints on all known symbols matching REGEX
+    bpfile FILE             - Set breakpoints on the addresses in FILE, one per line
     d, dis ADDR LEN         - Disassemble LEN bytes at ADDR
+    follow BOOL             - Let the disassembly follow RIP after every stop (default: true)
     bt                      - Show backtrace
     stack                   - Show stack
     pm                      - Show process memory map
@@ -31,11 +38,21 @@ class HelpMenu(ModalScreen[str]):
     regs set REG VAL        - Set register REG to value VAL (hex)
     rmem ADDR               - Read memory at address (hex)
     wmem ADDR VAL           - Write value to memory at address (hex)
+    x, hexdump ADDR LEN     - Show LEN bytes (hex) at ADDR in the Hexdump view
+    dump REGION FILE        - Dump a region of the process map (e.g. \[heap]) into FILE
+    dump START END FILE     - Dump the memory from START to END into FILE, resuming an interrupted dump
+    search \[-x|-p] P \[REG] - Search readable memory (or region REG) for string P, hex bytes (-x) or pointer (-p)
+    cancel \[-f]             - Cancel search, dump and conditional continue, interrupt a running Continue;
+                              -f also drops the queued commands
     sym, gsym NAME          - Look up symbol by name
     var NAME                - Read variable value
     vars NAME VAL           - Write value to variable
+    trace N \[-u A] \[-r R]   - Trace up to N instructions, until address A, recording registers R (rax,rsp)
+    tsave FILE              - Save the last trace as binary file or as csv (FILE ends with .csv)
     plugins                 - Get a List of all available plugins
     plugin NAME BOOL        - Activate or deactivate a plugin
+
+    ADDR may be an expression like main+0x10, rip-8 or $rsp; Tab completes symbol and register names
     """
 
     def compose(self) -> ComposeResult:
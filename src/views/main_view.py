@@ -7,9 +7,14 @@ Users can add or remove tabs that host various widgets, enter debugger commands,
 live updates from the debuggee.
 """
 
+import asyncio
+import os
+
 from textual.screen import Screen
 from textual.app import ComposeResult
+from textual.binding import Binding
 from textual.events import Key
+from textual.widget import Widget
 from textual.containers import ScrollableContainer, VerticalScroll
 from textual.widgets import (
     Header,
@@ -25,7 +30,8 @@ from textual.widgets import (
 from views.widget_selector import WidgetSelector
 
 # Coreminer API
-from coreminer_interface import CoreMinerProcess
+from address_resolver import completion_prefix
+from coreminer_interface import CoreMinerProcess, PIPELINE_WINDOW, TRANSPORT_ASYNCIO
 
 # Central Data Store
 from data_store import DataStore
@@ -33,10 +39,20 @@ from data_store import DataStore
 # Import of custom widgets
 from widgets.raw_responses import RawResponses
 from widgets.registers import Registers
+from widgets.register_history import RegisterHistory
 from widgets.stack import Stack
 from widgets.output import Output
 from widgets.disassembly import Disassembly
 from widgets.backtrace import Backtrace
+from widgets.hexdump import Hexdump
+from widgets.memory_file import MemoryFile
+from widgets.search_results import SearchResults
+
+# Maximum number of completion candidates listed in the output
+COMPLETION_LIST_LIMIT = 50
+
+# Seconds between two checks of the command deadlines and updates of the pending-command indicator
+WATCHDOG_INTERVAL = 0.25
 
 
 class MainView(Screen):
@@ -49,14 +65,25 @@ class MainView(Screen):
     """
     CSS_PATH = "../css/main_view.tcss"
 
-    def __init__(self) -> None:
+    BINDINGS = [
+        Binding("pageup", "older_snapshot", "Earlier stop"),
+        Binding("pagedown", "newer_snapshot", "Later stop"),
+    ]
+
+    def __init__(self, transport: str = TRANSPORT_ASYNCIO, pipeline_window: int = PIPELINE_WINDOW) -> None:
         """
         Initialize the MainView.
 
         Sets up counters and mappings for tab management, initializes command history storage,
         and creates the central data store.
+
+        Args:
+            transport (str): The transport used to communicate with the CoreMiner ("asyncio" or "thread").
+            pipeline_window (int): The number of read-only commands that may be in flight at once.
         """
         super().__init__()
+        self.transport = transport
+        self.pipeline_window = pipeline_window
         # Keep your tab counters and add_tab_map from earlier
         self.tab_counters = {
             "main_tabs": 0,
@@ -71,6 +98,10 @@ class MainView(Screen):
             "medium_tabs":  "add_medium",
         }
 
+        # Widget of each added tab and the commands needed to reload the widgets
+        self.tab_widgets: dict[str, tuple[str, Widget]] = {}
+        self.reload_requests: dict[Widget, list[dict]] = {}
+
         # Command history storage
         self.command_history: list[str] = []
         self.history_index: int = 0  # Will track which command in history is displayed
@@ -118,25 +149,68 @@ class MainView(Screen):
     # ─────────────────────────────────────────────────────────────────────────
     # EVENT HANDLERS
     # ─────────────────────────────────────────────────────────────────────────
-    def on_mount(self):
+    async def on_mount(self):
         """
         Initialize CoreMiner process when the MainView is mounted.
 
-        Starts the CoreMiner process with the central data store and sets up a recurring interval
-        to poll for responses from CoreMiner.
+        Starts the CoreMiner process with the central data store. With the asyncio transport a worker awaits
+        new responses and handles them right away; with the thread transport a recurring interval is set up
+        to poll for responses from CoreMiner. Another interval watches the commands the CoreMiner did not answer.
+        """
+        self.process = CoreMinerProcess(self.data_store, transport=self.transport,
+                                        pipeline_window=self.pipeline_window)
+        self.process.reload_provider = self.visible_reload_commands
+        self.data_store.subscribe("snapshots", self.update_snapshot_indicator)
+        await self.process.start()
+        if self.process.transport == TRANSPORT_ASYNCIO:
+            self.run_worker(self.watch_coreminer_output(), exclusive=True)
+        else:
+            self.set_interval(0.1, self.check_coreminer_output)
+        self.set_interval(WATCHDOG_INTERVAL, self.check_pending_commands)
+
+    async def watch_coreminer_output(self):
+        """
+        Wait for responses of the CoreMiner and process them as soon as they arrive.
+
+        Runs as a worker on the event loop of the application and is only used with the asyncio transport.
+        If a batch used up its time budget, control is handed back to the event loop before the next batch
+        so the TUI stays responsive.
         """
-        self.process = CoreMinerProcess(self.data_store)
-        self.set_interval(0.1, self.check_coreminer_output)
+        while True:
+            await self.process.wait_for_response()
+            self.check_coreminer_output()
+            while self.process.has_pending_response():
+                await asyncio.sleep(0)
+                self.check_coreminer_output()
 
     def check_coreminer_output(self):
         """
         Polls CoreMiner for responses.
 
-        If a response is available, the method triggers an update of all widgets.
+        All waiting responses are processed as one batch; if any of them requires it, the method triggers
+        exactly one update of all widgets. Lines spilled from the ring buffers are written once per batch.
         """
         response = self.process.get_response()
         if response:
             self.update_all_widgets()
+        self.data_store.flush_spill()
+
+    def on_unmount(self):
+        """
+        Called when the MainView is removed, i.e. when HardHat quits. Closes the spill files of the data store.
+        """
+        self.data_store.close()
+
+    def check_pending_commands(self):
+        """
+        Show the command the CoreMiner is working on below the command line and report overdue commands.
+        """
+        if self.process.check_deadlines():
+            self.update_all_widgets()
+        command_input = self.query_one("#command_input", Input)
+        status = self.process.pending_status()
+        if command_input.border_subtitle != status:
+            command_input.border_subtitle = status
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """
@@ -162,9 +236,24 @@ class MainView(Screen):
         elif button_id.startswith("delete_"):
             self.delete_tab(button_id)
 
+    def on_tabbed_content_tab_activated(self, event: TabbedContent.TabActivated) -> None:
+        """
+        Reload the information of a widget that becomes visible, if it is outdated.
+
+        Widgets in hidden tabs are not reloaded after the debuggee state changed, so their data is fetched
+        when their tab is activated.
+
+        Args:
+            event (TabbedContent.TabActivated): The event containing the activated pane.
+        """
+        if event.pane.id in self.tab_widgets:
+            _, widget = self.tab_widgets[event.pane.id]
+            self.process.reload_stale(self.reload_requests.get(widget, []))
+
     def on_key(self, event: Key) -> None:
         """
-        Capture Up/Down arrow keys for the command_input to allow cycling through command history.
+        Capture Up/Down arrow keys for the command_input to allow cycling through command history, and Tab to
+        complete symbol and register names.
 
         This method only processes the keys if the command_input widget is focused.
 
@@ -190,6 +279,35 @@ class MainView(Screen):
                 command_input.value = ""
             else:
                 command_input.value = self.command_history[self.history_index]
+        elif event.key == "tab":
+            event.stop()
+            event.prevent_default()
+            self.complete_command(command_input)
+
+    def complete_command(self, command_input: Input) -> None:
+        """
+        Complete the symbol or register name at the end of the command_input.
+
+        The name is extended to the longest common prefix of all candidates; if it stays ambiguous, the candidates
+        are listed in the output.
+
+        Args:
+            command_input (Input): The command input field.
+        """
+        value = command_input.value
+        prefix = completion_prefix(value)
+        if not prefix or prefix == value.strip():
+            # Only names in the arguments are completed, not the command itself
+            return
+        candidates = self.process.address_resolver.complete(prefix)
+        if not candidates:
+            return
+        completed = os.path.commonprefix(candidates)
+        command_input.value = value[:len(value) - len(prefix)] + completed
+        command_input.cursor_position = len(command_input.value)
+        if len(candidates) > 1 and completed == prefix:
+            self.data_store.set_output("[hh]: " + "  ".join(candidates[:COMPLETION_LIST_LIMIT]))
+            self.update_all_widgets()
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         """
@@ -274,6 +392,10 @@ class MainView(Screen):
 
         # Insert before the "[+]" tab
         add_tab_id = self.add_tab_map[tabbed_content_id]
+        self.tab_widgets[new_tab_id] = (tabbed_content_id, widget)
+        for command in getattr(widget, "RELOAD_COMMANDS", []):
+            self.register_reload_request(widget, command)
+
         tabbed_content.add_pane(
             TabPane(new_tab_name, content_container, id=new_tab_id),
             before=add_tab_id,
@@ -306,10 +428,49 @@ class MainView(Screen):
         if tab_id == self.add_tab_map[tabbed_content_id]:
             return
 
+        # Forget the widget and its reload requests
+        if tab_id in self.tab_widgets:
+            _, widget = self.tab_widgets.pop(tab_id)
+            self.reload_requests.pop(widget, None)
+
         # Remove the pane
         tabbed_content = self.query_one(f"#{tabbed_content_id}", TabbedContent)
         tabbed_content.remove_pane(tab_id)
 
+    # ─────────────────────────────────────────────────────────────────────────
+    # RELOAD REQUESTS OF THE WIDGETS
+    # ─────────────────────────────────────────────────────────────────────────
+    def register_reload_request(self, widget: Widget, command: dict) -> None:
+        """
+        Register a command that has to be sent after the debuggee state changed, while the widget is visible.
+
+        Args:
+            widget (Widget): The widget that needs the result of the command.
+            command (dict): The JSON command, e.g. {"status": "GetStack"}.
+        """
+        commands = self.reload_requests.setdefault(widget, [])
+        if command not in commands:
+            commands.append(command)
+
+    def visible_reload_commands(self) -> list[dict]:
+        """
+        Collect the reload commands of all widgets that are in the active tab of their tabbed content.
+
+        Used as reload provider of the CoreMiner process, so only the displayed information is reloaded.
+
+        Returns:
+            list[dict]: The reload commands without duplicates.
+        """
+        commands = []
+        for tab_id, (tabbed_content_id, widget) in self.tab_widgets.items():
+            tabbed_content = self.query_one(f"#{tabbed_content_id}", TabbedContent)
+            if tabbed_content.active != tab_id:
+                continue
+            for command in self.reload_requests.get(widget, []):
+                if command not in commands:
+                    commands.append(command)
+        return commands
+
     # ─────────────────────────────────────────────────────────────────────────
     # FACTORY FOR WIDGETS & Udaten the Content
     # ─────────────────────────────────────────────────────────────────────────
@@ -328,6 +489,8 @@ class MainView(Screen):
             return RawResponses(self.data_store)
         elif widget_name == "Registers":
             return Registers(self.data_store)
+        elif widget_name == "RegisterHistory":
+            return RegisterHistory(self.data_store)
         elif widget_name == "Stack":
             return Stack(self.data_store)
         elif widget_name == "Output":
@@ -336,27 +499,62 @@ class MainView(Screen):
             return Disassembly(self.data_store)
         elif widget_name == "Backtrace":
             return Backtrace(self.data_store)
+        elif widget_name == "Hexdump":
+            return Hexdump(self.data_store)
+        elif widget_name == "MemoryFile":
+            return MemoryFile(self.data_store)
+        elif widget_name == "SearchResults":
+            return SearchResults(self.data_store)
         else:
             return Static(f"Unknown widget: {widget_name}")
 
     def update_all_widgets(self) -> None:
         """
-        Use queries to locate every TabPane (besides the '[+]' tab), then
-        find any child widget with an 'update_content()' method and call it.
+        Notify the widgets about the changes in the data store.
+
+        Every widget subscribes to the data store fields it displays, so only the widgets whose fields changed
+        since the last update re-render. The cost does not depend on how many tabs are open.
         """
-        for tabbed_content_id, plus_tab_id in self.add_tab_map.items():
-            # Get the TabbedContent by its ID
-            tabbed_content = self.query_one(f"#{tabbed_content_id}", expect_type=TabbedContent)
+        self.data_store.notify_subscribers()
+
+    def action_older_snapshot(self) -> None:
+        self.show_snapshot(-1)
 
-            # Query for all TabPane children in this TabbedContent
-            panes = tabbed_content.query("TabPane")
+    def action_newer_snapshot(self) -> None:
+        self.show_snapshot(1)
+
+    def show_snapshot(self, step: int) -> None:
+        """
+        Show the registers, stack and backtrace of an earlier or later stop from the snapshot log.
 
-            for pane in panes:
-                # Skip the '[+]' tab by comparing pane.id to plus_tab_id
-                if pane.id == plus_tab_id:
-                    continue
+        The state is restored from memory, nothing is sent to the CoreMiner. Moving past the latest stop stays at
+        the latest stop, which is the live state.
 
-                # Inside this tab, find any widget with an update_content() method
-                for child in pane.query():
-                    if hasattr(child, "update_content") and callable(child.update_content):
-                        child.update_content()
+        Args:
+            step (int): The number of stops to move, negative to move back.
+        """
+        snapshots = self.data_store.get_snapshots()
+        if not snapshots:
+            return
+        stop = self.data_store.snapshot_stop
+        index = len(snapshots) - 1 if stop is None else snapshots.index_of_stop(stop)
+        if index is None:
+            index = 0
+        self.data_store.restore_snapshot(max(0, min(index + step, len(snapshots) - 1)))
+        self.update_all_widgets()
+
+    def update_snapshot_indicator(self) -> None:
+        """
+        Show in the header which stop is shown if it is not the latest one.
+        """
+        stop = self.data_store.snapshot_stop
+        if stop is None:
+            self.sub_title = ""
+            return
+        snapshots = self.data_store.get_snapshots()
+        index = snapshots.index_of_stop(stop)
+        if index is None:
+            # The stop was evicted from the log meanwhile, show the live title
+            self.sub_title = ""
+            return
+        self.sub_title = f"Stop {stop} ({index + 1}/{len(snapshots)}), PageDown returns to the latest stop"
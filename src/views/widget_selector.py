@@ -55,8 +55,12 @@ class WidgetSelector(ModalScreen[str]):
         list_view.append(ListItem(Static("Output"), id="Output"))
         list_view.append(ListItem(Static("Disassembly"), id="Disassembly"))
         list_view.append(ListItem(Static("Registers"), id="Registers"))
+        list_view.append(ListItem(Static("RegisterHistory"), id="RegisterHistory"))
         list_view.append(ListItem(Static("Stack"), id="Stack"))
         list_view.append(ListItem(Static("Backtrace"), id="Backtrace"))
+        list_view.append(ListItem(Static("Hexdump"), id="Hexdump"))
+        list_view.append(ListItem(Static("MemoryFile"), id="MemoryFile"))
+        list_view.append(ListItem(Static("SearchResults"), id="SearchResults"))
         list_view.append(ListItem(Static("RawResponses"), id="RawResponses"))
 
     def on_list_view_selected(self, event: ListView.Selected) -> None:
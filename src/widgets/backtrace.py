@@ -1,10 +1,19 @@
 from textual.widgets import Static
 
-class Backtrace(Static):
+from widgets.subscriber import DataStoreSubscriber
+
+class Backtrace(DataStoreSubscriber, Static):
     """
     A widget that displays the backtrace of the debuggee.
     """
+
+    # Commands needed to reload the content of this widget after the debuggee state changed
+    RELOAD_COMMANDS = [{"status": "Backtrace"}]
     
+    SUBSCRIPTIONS = {
+        "backtrace": "update_content",
+    }
+
     def __init__(self, data_store):
         """
         Initialize the Backtrace widget.
@@ -16,14 +25,6 @@ class Backtrace(Static):
         self.data_store = data_store
         self._render_markup = False
         
-    def on_mount(self):
-        """
-        Called when the widget is mounted on the screen.
-
-        This method triggers the initial update of the widget's content by calling `update_content`.
-        """
-        self.update_content()
-
     def update_content(self):
         """
         Update the widget's content with the latest backtrace.
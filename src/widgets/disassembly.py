@@ -1,38 +1,118 @@
-from textual.widgets import Static
+from rich.segment import Segment
+from rich.style import Style
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
 
-class Disassembly(Static):
+from rip_follower import FOLLOW_RIP_COMMAND
+from widgets.subscriber import DataStoreSubscriber
+
+# Rows kept above RIP when the view scrolls to it
+RIP_CONTEXT_ROWS = 3
+
+# Width reserved for the symbol+offset annotation of a row
+SYMBOL_COL_WIDTH = 32
+
+
+class Disassembly(DataStoreSubscriber, ScrollView):
     """
     A widget that displays disassembly output from CoreMiner.
 
-    This widget retrieves disassembly data from a provided data store and updates its display accordingly.
-    Markup rendering is disabled to ensure that the raw disassembly text is shown.
+    The widget renders the DisassemblyModel of the data store row by row: only the rows inside the visible window
+    are formatted, when Textual asks for them via `render_line`. The row of the current RIP and the addresses of
+    instructions with a breakpoint are highlighted while rendering, so a new RIP only needs a repaint. The breakpoints
+    are taken from the breakpoint table, so setting or deleting one needs no new disassembly either. Rows inside
+    a known symbol are annotated with symbol+offset from the symbol index, again only while rendering.
     """
 
+    # The disassembly follows RIP, which is reloaded with the registers after the debuggee state changed
+    RELOAD_COMMANDS = [{"status": "DumpRegisters"}, FOLLOW_RIP_COMMAND]
+
+    DEFAULT_CSS = """
+    Disassembly {
+        height: 1fr;
+    }
+    """
+
+    RIP_STYLE = Style(reverse=True)
+    BREAKPOINT_STYLE = Style(color="red", bold=True)
+
+    SUBSCRIPTIONS = {
+        "disassembly": "update_content",
+        "rip": "update_rip",
+        "snapshots": "update_rip",
+        "symbols": "refresh",
+        "breakpoints": "refresh",
+    }
+
     def __init__(self, data_store):
         """
         Initialize the Disassembly widget.
 
         Args:
-            data_store: An object providing disassembly information, expected to have a method `get_disassembly`
-                        that returns the disassembly text as a string.
+            data_store: An object providing disassembly information, expected to have a method
+                        `get_disassembly_model` that returns the DisassemblyModel to display.
         """
         super().__init__()
         self.data_store = data_store
-        self._render_markup = False
-        
-    def on_mount(self):
+        self._rip_row = None
+
+    def update_content(self):
         """
-        Called when the widget is mounted on the screen.
+        Update the widget after a new DisassemblyModel was stored.
 
-        This method triggers the initial update of the widget's content.
+        Only the virtual size is updated here, the rows are formatted when they are rendered. The view scrolls to
+        the row of RIP if it is part of the new disassembly, otherwise to the top.
         """
-        self.update_content()
+        model = self.data_store.get_disassembly_model()
+        self.virtual_size = Size(model.width() + SYMBOL_COL_WIDTH, len(model))
+        self._rip_row = None
+        self.update_rip(scroll_home=True)
 
-    def update_content(self):
+    def update_rip(self, scroll_home: bool = False):
+        """
+        Move the highlight to the current RIP and scroll its row into view.
+
+        Args:
+            scroll_home (bool): Scroll to the top if RIP is not part of the disassembly.
+        """
+        model = self.data_store.get_disassembly_model()
+        rip = self.data_store.get_rip()
+        rip_row = model.index_of(rip) if isinstance(rip, int) else None
+        if rip_row is None:
+            if scroll_home:
+                self.scroll_to(y=0, animate=False)
+        elif not self.scroll_y <= rip_row < self.scroll_y + self.size.height:
+            self.scroll_to(y=max(0, rip_row - RIP_CONTEXT_ROWS), animate=False)
+        self._rip_row = rip_row
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
         """
-        Update the widget's content with the latest disassembly output.
+        Render a single visible row of the disassembly.
+
+        Args:
+            y (int): The line within the visible window of the widget.
 
-        This method retrieves disassembly data from the data store using `get_disassembly` and updates the
-        widget's display accordingly.
+        Returns:
+            Strip: The rendered row, cropped to the visible part.
         """
-        self.update(self.data_store.get_disassembly())
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+        rich_style = self.rich_style
+
+        model = self.data_store.get_disassembly_model()
+        index = scroll_y + y
+        if index >= len(model):
+            return Strip.blank(width, rich_style)
+
+        style = rich_style + self.RIP_STYLE if index == self._rip_row else rich_style
+        address = model.addresses[index]
+        has_breakpoint = self.data_store.get_breakpoints().is_active(address)
+        address_col, rest = model.row_columns(index, has_breakpoint)
+        symbol = self.data_store.get_symbols().describe(address)
+        if symbol:
+            rest += f"  <{symbol}>"
+        address_style = style + self.BREAKPOINT_STYLE if has_breakpoint else style
+        strip = Strip([Segment(address_col, address_style), Segment(rest, style)])
+        return strip.crop_extend(scroll_x, scroll_x + width, style if index == self._rip_row else rich_style)
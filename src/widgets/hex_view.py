@@ -0,0 +1,95 @@
+from typing import Callable
+
+from rich.segment import Segment
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from widgets.subscriber import DataStoreSubscriber
+
+BYTES_PER_ROW = 16
+
+# Address, two groups of eight bytes and the ASCII column
+ROW_WIDTH = 16 + 2 + BYTES_PER_ROW * 3 + 1 + 1 + BYTES_PER_ROW + 2
+
+# Printable ASCII characters are shown as they are, everything else as a dot
+ASCII_TABLE = "".join(chr(byte) if 0x20 <= byte < 0x7f else "." for byte in range(256))
+
+
+class HexView(DataStoreSubscriber, ScrollView):
+    """
+    A base widget that displays a buffer of bytes as a hex/ASCII dump.
+
+    The buffer is only sliced and formatted for the rows inside the visible window, when Textual asks for them via
+    `render_line`. Any buffer supporting `len` and slicing works, e.g. bytes or an mmap, so the size of the buffer
+    does not matter for the cost of an update or a repaint.
+
+    Subclasses set SUBSCRIPTIONS to their data store field and pass the getter of that field to `__init__`.
+    """
+
+    DEFAULT_CSS = """
+    HexView {
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, data_store, get_data: Callable[[], tuple]):
+        """
+        Initialize the HexView widget.
+
+        Args:
+            data_store: The shared data store holding the bytes that are displayed.
+            get_data (Callable[[], tuple]): Returns the address of the first byte and the buffer to display.
+        """
+        super().__init__()
+        self.data_store = data_store
+        self.get_data = get_data
+
+    def update_content(self):
+        """
+        Update the widget after a new buffer was stored. Only the virtual size is updated here.
+        """
+        _, data = self.get_data()
+        self.virtual_size = Size(ROW_WIDTH, (len(data) + BYTES_PER_ROW - 1) // BYTES_PER_ROW)
+        self.scroll_to(y=0, animate=False)
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        """
+        Render a single visible row of the dump.
+
+        Args:
+            y (int): The line within the visible window of the widget.
+
+        Returns:
+            Strip: The rendered row, cropped to the visible part.
+        """
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+        rich_style = self.rich_style
+
+        start_addr, data = self.get_data()
+        offset = (scroll_y + y) * BYTES_PER_ROW
+        if offset >= len(data):
+            return Strip.blank(width, rich_style)
+
+        line = format_row(start_addr + offset, bytes(data[offset:offset + BYTES_PER_ROW]))
+        strip = Strip([Segment(line, rich_style)], len(line))
+        return strip.crop_extend(scroll_x, scroll_x + width, rich_style)
+
+
+def format_row(address: int, row: bytes) -> str:
+    """
+    Format up to BYTES_PER_ROW bytes as one row of the dump.
+
+    Args:
+        address (int): The address of the first byte.
+        row (bytes): The bytes of the row.
+
+    Returns:
+        str: The row, e.g. "0000000000401000  48 89 e7 ...  |H..|".
+    """
+    hex_bytes = row.hex(" ")
+    half = BYTES_PER_ROW // 2 * 3
+    hex_column = f"{hex_bytes[:half]:<{half}} {hex_bytes[half:]}"
+    return f"{address:016x}  {hex_column:<{BYTES_PER_ROW * 3}}  |{row.decode('latin-1').translate(ASCII_TABLE)}|"
@@ -0,0 +1,20 @@
+from widgets.hex_view import HexView
+
+
+class Hexdump(HexView):
+    """
+    A widget that displays the memory read by the last hexdump command.
+
+    Only the visible rows are formatted, so scrolling through a large dump costs no more than a small one.
+    """
+
+    SUBSCRIPTIONS = {"hexdump": "update_content"}
+
+    def __init__(self, data_store):
+        """
+        Initialize the Hexdump widget.
+
+        Args:
+            data_store: An object that provides the memory through the `get_hexdump` method.
+        """
+        super().__init__(data_store, data_store.get_hexdump)
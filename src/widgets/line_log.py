@@ -0,0 +1,90 @@
+from rich.cells import cell_len
+from rich.control import strip_control_codes
+from rich.segment import Segment
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from widgets.subscriber import DataStoreSubscriber
+
+
+class LineLog(DataStoreSubscriber, ScrollView):
+    """
+    A base widget that displays a RingBuffer of the data store line by line.
+
+    Instead of handing the whole text to Textual on every update, the widget only remembers how many lines of the
+    buffer it has already seen. An update looks at the new lines only, adjusts the virtual size and lets Textual
+    render the lines that are inside the visible window via `render_line`. This keeps the cost of an update and of
+    a repaint constant, no matter how long the log is. While the view is scrolled to the bottom it follows new lines.
+
+    Subclasses set SUBSCRIPTIONS to their data store field and pass the buffer of that field to `__init__`.
+    """
+
+    DEFAULT_CSS = """
+    LineLog {
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, data_store, buffer):
+        """
+        Initialize the LineLog widget.
+
+        Args:
+            data_store: The shared data store holding the buffer that is displayed.
+            buffer (RingBuffer): The buffer of the data store that is displayed.
+        """
+        super().__init__()
+        self.data_store = data_store
+        self.buffer = buffer
+        self._first_index = 0
+        self._end_index = 0
+        self._max_width = 0
+
+    def update_content(self):
+        """
+        Update the widget with the lines appended to the buffer since the last update.
+
+        Only the new lines are measured. If lines were evicted from the front of the buffer while the view is not
+        following the end, the scroll position is moved up accordingly so the visible lines stay in place.
+        """
+        buffer = self.buffer
+        if buffer.end_index == self._end_index and buffer.first_index == self._first_index:
+            return
+
+        follow = self.is_vertical_scroll_end
+        for line in buffer.slice(max(self._end_index, buffer.first_index), buffer.end_index):
+            self._max_width = max(self._max_width, cell_len(line))
+
+        evicted = buffer.first_index - self._first_index
+        self._first_index = buffer.first_index
+        self._end_index = buffer.end_index
+        self.virtual_size = Size(self._max_width, len(buffer))
+
+        if follow:
+            self.scroll_end(animate=False, x_axis=False)
+        elif evicted:
+            self.scroll_to(y=max(0, self.scroll_y - evicted), animate=False)
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        """
+        Render a single visible line of the buffer.
+
+        Args:
+            y (int): The line within the visible window of the widget.
+
+        Returns:
+            Strip: The rendered line, cropped to the visible part.
+        """
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+        rich_style = self.rich_style
+
+        line = self.buffer.get(self._first_index + scroll_y + y)
+        if line is None:
+            return Strip.blank(width, rich_style)
+
+        line = strip_control_codes(line.expandtabs())
+        strip = Strip([Segment(line, rich_style)], cell_len(line))
+        return strip.crop_extend(scroll_x, scroll_x + width, rich_style)
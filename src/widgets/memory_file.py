@@ -0,0 +1,21 @@
+from widgets.hex_view import HexView
+
+
+class MemoryFile(HexView):
+    """
+    A widget that displays the file written by the last memory dump.
+
+    The file is mapped read-only, and only the visible rows are read from the mapping, so regions of hundreds of
+    megabytes can be browsed without loading them into memory.
+    """
+
+    SUBSCRIPTIONS = {"memory_file": "update_content"}
+
+    def __init__(self, data_store):
+        """
+        Initialize the MemoryFile widget.
+
+        Args:
+            data_store: An object that provides the mapped dump through the `get_memory_file` method.
+        """
+        super().__init__(data_store, data_store.get_memory_file)
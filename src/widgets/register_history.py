@@ -0,0 +1,111 @@
+from typing import Optional
+
+from rich.style import Style
+from rich.text import Text
+from textual.binding import Binding
+from textual.widgets import Static
+
+from widgets.subscriber import DataStoreSubscriber
+
+
+class RegisterHistory(DataStoreSubscriber, Static, can_focus=True):
+    """
+    A widget that displays the registers of an earlier stop from the snapshot log.
+
+    The widget follows the latest stop until it is scrubbed back: click it, then use Left/Right to move one stop
+    and Home/End to jump to the oldest and the latest stop. Registers that changed against the stop before are
+    highlighted and show their previous value. A stop is recorded when its registers are dumped, so the widget
+    reloads the registers like the Registers widget does.
+    """
+
+    BINDINGS = [
+        Binding("left", "older", "Older stop"),
+        Binding("right", "newer", "Newer stop"),
+        Binding("home", "oldest", "Oldest stop"),
+        Binding("end", "newest", "Latest stop"),
+    ]
+
+    # Commands needed to reload the content of this widget after the debuggee state changed
+    RELOAD_COMMANDS = [{"status": "DumpRegisters"}]
+
+    HEADER_STYLE = Style(bold=True)
+    CHANGED_STYLE = Style(color="yellow", bold=True)
+
+    SUBSCRIPTIONS = {
+        "snapshots": "update_content",
+    }
+
+    def __init__(self, data_store):
+        """
+        Initialize the RegisterHistory widget.
+
+        Args:
+            data_store: An object that provides the recorded stops through the `get_snapshots` method and
+                        the annotation of pointers through `describe_address`.
+        """
+        super().__init__()
+        self.data_store = data_store
+        self._render_markup = False
+        # The stop generation that is shown, None to follow the latest stop
+        self.selected_stop: Optional[int] = None
+
+    def _selected_index(self) -> int:
+        """
+        Get the index of the shown snapshot; a stop that dropped out of the history falls back to the oldest one.
+        """
+        history = self.data_store.get_snapshots()
+        if self.selected_stop is None:
+            return len(history) - 1
+        index = history.index_of_stop(self.selected_stop)
+        return 0 if index is None else index
+
+    def _select(self, index: int) -> None:
+        history = self.data_store.get_snapshots()
+        if not history:
+            return
+        index = max(0, min(index, len(history) - 1))
+        self.selected_stop = None if index == len(history) - 1 else history.stop(index)
+        self.update_content()
+
+    def action_older(self) -> None:
+        self._select(self._selected_index() - 1)
+
+    def action_newer(self) -> None:
+        self._select(self._selected_index() + 1)
+
+    def action_oldest(self) -> None:
+        self._select(0)
+
+    def action_newest(self) -> None:
+        self._select(len(self.data_store.get_snapshots()) - 1)
+
+    def update_content(self):
+        """
+        Update the widget's content with the registers of the selected stop.
+
+        The snapshot is compared with the snapshot of the stop before; changed registers are highlighted and
+        annotated with their previous value.
+        """
+        history = self.data_store.get_snapshots()
+        if not history:
+            self.update("No registers recorded yet")
+            return
+        index = self._selected_index()
+        describe_address = self.data_store.describe_address
+        values = history.state(index).registers
+        previous = history.state(index - 1).registers if index else values
+        following = "latest" if self.selected_stop is None else "Left/Right/Home/End to scrub"
+
+        text = Text(f"Stop {history.stop(index)} ({index + 1}/{len(history)}, {following})", self.HEADER_STYLE)
+        for name, value in values.items():
+            before = previous[name]
+            line = f"\n  {name}: {value:0x}"
+            description = describe_address(value)
+            if description:
+                line += f"  {description}"
+            if value != before:
+                text.append(line, self.CHANGED_STYLE)
+                text.append(f"  (was {before:0x})")
+            else:
+                text.append(line)
+        self.update(text)
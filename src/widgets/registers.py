@@ -1,34 +1,59 @@
+from rich.style import Style
+from rich.text import Text
 from textual.widgets import Static
 
-class Registers(Static):
+from widgets.subscriber import DataStoreSubscriber
+
+class Registers(DataStoreSubscriber, Static):
     """
     A widget that displays the current registers and their corresponding values of the debuggee.
+
+    Values pointing into a known symbol or into mapped memory are annotated like the words of the stack. Registers
+    that changed since the previous stop are highlighted.
     """
-    
+
+    # Commands needed to reload the content of this widget after the debuggee state changed
+    RELOAD_COMMANDS = [{"status": "DumpRegisters"}]
+
+    CHANGED_STYLE = Style(color="yellow", bold=True)
+
+    SUBSCRIPTIONS = {
+        "registers": "update_content",
+        "snapshots": "update_content",
+        "symbols": "update_content",
+        "memory_map": "update_content",
+    }
+
     def __init__(self, data_store):
         """
         Initialize the Registers widget.
 
         Args:
-            data_store: An object that provides register data through the `get_registers` method.
+            data_store: An object that provides register data through the `get_register_values` method, the
+                        registers changed since the previous stop through `get_changed_registers` and the
+                        annotation of pointers through `describe_address`.
         """
         super().__init__()
         self.data_store = data_store
         self._render_markup = False
-        
-    def on_mount(self):
-        """
-        Called when the widget is mounted on the screen.
-
-        This method triggers the initial update of the widget's content by calling `update_content`.
-        """
-        self.update_content()
 
     def update_content(self):
         """
         Update the widget's content with the latest register values.
 
-        This method retrieves register data from the data store using the `get_registers` method
-        and updates the widget's display with this information.
+        This method retrieves register data from the data store using the `get_register_values` method,
+        annotates the values that point into a symbol or a mapped region, highlights the registers that changed
+        since the previous stop and updates the widget's display.
         """
-        self.update(self.data_store.get_registers())
+        describe_address = self.data_store.describe_address
+        changed = self.data_store.get_changed_registers()
+        text = Text()
+        for name, value in self.data_store.get_register_values().items():
+            if text:
+                text.append("\n")
+            line = f"  {name}: {value:0x}"
+            description = describe_address(value)
+            if description:
+                line += f"  {description}"
+            text.append(line, self.CHANGED_STYLE if name in changed else None)
+        self.update(text)
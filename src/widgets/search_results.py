@@ -0,0 +1,76 @@
+from rich.segment import Segment
+from rich.style import Style
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from widgets.subscriber import DataStoreSubscriber
+
+# Width reserved for a result row: the address and its annotation
+ROW_WIDTH = 80
+
+
+class SearchResults(DataStoreSubscriber, ScrollView):
+    """
+    A widget that displays the results of the last memory search while the search is running.
+
+    The first row shows the pattern and the progress of the search, every other row one hit with the symbol or
+    memory region it lies in. Only the visible rows are formatted, so new hits only cost a repaint.
+    """
+
+    DEFAULT_CSS = """
+    SearchResults {
+        height: 1fr;
+    }
+    """
+
+    STATUS_STYLE = Style(bold=True)
+
+    SUBSCRIPTIONS = {
+        "search": "update_content",
+    }
+
+    def __init__(self, data_store):
+        """
+        Initialize the SearchResults widget.
+
+        Args:
+            data_store: An object that provides the results through the `get_search_results` method and the
+                        annotation of addresses through `describe_address`.
+        """
+        super().__init__()
+        self.data_store = data_store
+
+    def update_content(self):
+        """
+        Update the virtual size to the number of results; the rows are formatted when they are rendered.
+        """
+        _, results = self.data_store.get_search_results()
+        self.virtual_size = Size(ROW_WIDTH, len(results) + 1)
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        """
+        Render a single visible row of the results.
+
+        Args:
+            y (int): The line within the visible window of the widget.
+
+        Returns:
+            Strip: The rendered row, cropped to the visible part.
+        """
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.size.width
+        rich_style = self.rich_style
+
+        status, results = self.data_store.get_search_results()
+        index = scroll_y + y
+        if index == 0:
+            strip = Strip([Segment(status, rich_style + self.STATUS_STYLE)])
+        elif index <= len(results):
+            address = results[index - 1]
+            line = f"  {address:016x}  {self.data_store.describe_address(address)}"
+            strip = Strip([Segment(line, rich_style)])
+        else:
+            return Strip.blank(width, rich_style)
+        return strip.crop_extend(scroll_x, scroll_x + width, rich_style)
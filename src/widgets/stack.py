@@ -1,37 +1,52 @@
 from textual.widgets import Static
 
-class Stack(Static):
+from widgets.subscriber import DataStoreSubscriber
+
+class Stack(DataStoreSubscriber, Static):
     """
     A widget that displays the current stack of the debuggee.
 
     This widget retrieves stack data from a provided data store and updates its display with the latest
-    stack information.
+    stack information. Words pointing into a known symbol are annotated with symbol+offset, other words pointing
+    into mapped memory with their region.
     """
+
+    # Commands needed to reload the content of this widget after the debuggee state changed
+    RELOAD_COMMANDS = [{"status": "GetStack"}]
     
+    SUBSCRIPTIONS = {
+        "stack": "update_content",
+        "symbols": "update_content",
+        "memory_map": "update_content",
+    }
+
     def __init__(self, data_store):
         """
         Initialize the Stack widget.
 
         Args:
-            data_store: An object that provides stack data through the `get_stack` method.
+            data_store: An object that provides stack data through the `get_stack_words` method and the
+                        annotation of pointers through `describe_address`.
         """
         super().__init__()
         self.data_store = data_store
         self._render_markup = False
         
-    def on_mount(self):
-        """
-        Called when the widget is mounted on the screen.
-
-        This method triggers the initial update of the widget's content by calling `update_content`.
-        """
-        self.update_content()
-
     def update_content(self):
         """
         Update the widget's content with the current stack information.
 
-        This method retrieves stack data from the data store using the `get_stack` method
-        and updates the widget's display with the retrieved information.
+        This method retrieves stack data from the data store using the `get_stack_words` method, formats every
+        word with its address and the symbol or region it points into, and updates the widget's display.
         """
-        self.update(self.data_store.get_stack())
+        start_addr, words = self.data_store.get_stack_words()
+        describe_address = self.data_store.describe_address
+        lines = []
+        for word in words:
+            line = f"  {start_addr:016x}: {word:016x}"
+            description = describe_address(word)
+            if description:
+                line += f"  {description}"
+            lines.append(line)
+            start_addr += 8
+        self.update("\n".join(lines))
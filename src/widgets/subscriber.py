@@ -0,0 +1,19 @@
+class DataStoreSubscriber:
+    """
+    A mixin for widgets that display fields of the data store.
+
+    SUBSCRIPTIONS maps every data store field the widget displays to the name of the method that is called when the
+    field changed. The methods are subscribed when the widget is mounted, after which `update_content` is called
+    once for the initial content, and unsubscribed again when the widget is removed from the screen.
+    """
+
+    SUBSCRIPTIONS: dict[str, str] = {}
+
+    def on_mount(self):
+        for field, method in self.SUBSCRIPTIONS.items():
+            self.data_store.subscribe(field, getattr(self, method))
+        self.update_content()
+
+    def on_unmount(self):
+        for field, method in self.SUBSCRIPTIONS.items():
+            self.data_store.unsubscribe(field, getattr(self, method))
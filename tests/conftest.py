@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The modules of HardHat import each other by their plain names, as when it is started from src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
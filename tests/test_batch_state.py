@@ -0,0 +1,85 @@
+import json
+
+from auto_continue import AutoContinue
+from breakpoint_condition import ConditionalBreakpoint
+from command_scheduler import command_keyword
+from coreminer_interface import TRANSPORT_THREAD, CoreMinerProcess
+from data_store import DataStore
+from feedback_decoder import decode_line
+from memory_cache import MemoryRead
+
+STEP = {"status": "StepSingle"}
+TRACE = {"count": 10, "until": None, "registers": []}
+
+
+def feedback(payload):
+    return decode_line(json.dumps({"feedback": payload}))
+
+
+def send_next(process: CoreMinerProcess) -> str:
+    return command_keyword(process._take_next_command())
+
+
+def answer(process: CoreMinerProcess, *items) -> None:
+    for item in items:
+        process.queue_feedback.put(item)
+    process.get_response()
+
+
+def read_word(process: CoreMinerProcess, address: int) -> list:
+    done = []
+    MemoryRead(process, address, 8, done.append).run()
+    return done
+
+
+def cache_word(process: CoreMinerProcess, address: int) -> None:
+    read_word(process, address)
+    assert send_next(process) == "ReadMem"
+    answer(process, feedback({"Word": 1}))
+    assert read_word(process, address)
+
+
+def test_step_batch_invalidates_memory_read_before_a_step():
+    process = CoreMinerProcess(DataStore(), transport=TRANSPORT_THREAD)
+    cache_word(process, 0x7000)
+    process.registers_generation = process.stop_generation
+    assert process.address_resolver.registers_fresh()
+    process._handle_repeat([STEP, 3])
+    assert send_next(process) == "StepSingle"
+    answer(process, feedback("Ok"))
+
+    # The word cached before the step is read again between the steps
+    assert read_word(process, 0x7000) == []
+    assert send_next(process) == "StepSingle"
+    answer(process, feedback("Ok"))
+    assert send_next(process) == "ReadMem"
+    assert not process.address_resolver.registers_fresh()
+
+
+def test_auto_continue_invalidates_memory_read_before_a_continue():
+    process = CoreMinerProcess(DataStore(), transport=TRANSPORT_THREAD)
+    process.data_store.get_breakpoints().add(0x1000, conditional=ConditionalBreakpoint(0x1000, hits=3))
+    cache_word(process, 0x7000)
+    AutoContinue(process).start()
+    assert send_next(process) == "Continue"
+    answer(process, feedback("Ok"))
+
+    assert read_word(process, 0x7000) == []
+    assert send_next(process) == "DumpRegisters"
+    answer(process, feedback({"Registers": {"rip": 0x1000}}))
+    assert send_next(process) == "ReadMem"
+
+
+def test_trace_invalidates_memory_read_before_a_step():
+    process = CoreMinerProcess(DataStore(), transport=TRANSPORT_THREAD)
+    cache_word(process, 0x7000)
+    process._handle_trace(TRACE)
+    assert send_next(process) == "DumpRegisters"
+    answer(process, feedback({"Registers": {"rip": 0x1000}}))
+    assert send_next(process) == "StepSingle"
+    answer(process, feedback("Ok"))
+
+    assert read_word(process, 0x7000) == []
+    assert send_next(process) == "DumpRegisters"
+    answer(process, feedback({"Registers": {"rip": 0x1004}}))
+    assert send_next(process) == "ReadMem"
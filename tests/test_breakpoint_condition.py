@@ -0,0 +1,77 @@
+import pytest
+
+from breakpoint_condition import ConditionalBreakpoint, Condition, MissingWord
+from breakpoint_table import BreakpointTable
+
+REGISTERS = {"rax": 5, "rbx": 3, "rsp": 0x7000}
+
+
+def evaluate(text: str, memory=None) -> bool:
+    return Condition(text).evaluate(REGISTERS, memory or {})
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Numbers are hex
+    ("rax + 10 == 15", True),
+    ("rax * 2 + 1 == b", True),
+    ("1 << 2 < 5", True),
+    # Bitwise operators bind looser than comparisons, as in C
+    ("rax & 2 == 2", True),
+    ("(rax & 2) == 2", False),
+    ("rax | 2 ^ 3 == 5", True),
+    ("rax < 6 == 1", True),
+    ("rax == 5 && rbx != 0 || 0", True),
+    ("rax == 4 || rbx == 3 && 0", False),
+    ("!rax || -1 == ffffffffffffffff", True),
+    ("$rax == 5 and not 0", True),
+])
+def test_precedence(text, expected):
+    assert evaluate(text) is expected
+
+
+def test_reads_memory():
+    condition = Condition("[rsp+8] != 0")
+    assert condition.reads_memory
+    assert condition.registers == {"rsp"}
+    with pytest.raises(MissingWord) as missing:
+        condition.evaluate(REGISTERS, {})
+    assert missing.value.address == 0x7008
+    assert condition.evaluate(REGISTERS, {0x7008: 1})
+
+
+def test_symbols_need_a_resolver():
+    with pytest.raises(ValueError):
+        Condition("main == 0")
+    assert Condition("main == 401000", resolve_symbol=lambda name: 0x401000).evaluate({}, {})
+
+
+@pytest.mark.parametrize("text", ["", "rax ==", "(rax", "rax rbx", "$foo == 1", "rax # 1"])
+def test_malformed_conditions(text):
+    with pytest.raises(ValueError):
+        Condition(text)
+
+
+def test_division_by_zero():
+    with pytest.raises(ZeroDivisionError):
+        evaluate("rax / 0")
+
+
+def test_describe():
+    assert ConditionalBreakpoint(0x1000, Condition("rax == 5"), hits=3).describe() == "if rax == 5, hits 3"
+    assert ConditionalBreakpoint(0x1000).describe() == ""
+
+
+def test_has_conditions_counts_enabled_breakpoints():
+    table = BreakpointTable()
+    table.add(0x1000, conditional=ConditionalBreakpoint(0x1000, hits=2))
+    table.add(0x2000)
+    assert table.has_conditions()
+    table.set_enabled(0x1000, False)
+    assert not table.has_conditions()
+    assert table.conditional_at(0x1000) is None
+    table.set_enabled(0x1000, True)
+    assert table.has_conditions()
+    table.set_enabled(0x1000, False)
+    table.remove(0x1000)
+    table.set_enabled(0x2000, False)
+    assert not table.has_conditions()
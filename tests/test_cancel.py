@@ -0,0 +1,108 @@
+import json
+
+from breakpoint_batch import BreakpointBatch
+from command_scheduler import command_keyword
+from coreminer_interface import TRANSPORT_THREAD, CoreMinerProcess
+from data_store import DataStore
+from feedback_decoder import decode_line
+from memory_cache import MemoryRead
+
+STEP = {"status": "StepSingle"}
+TRACE = {"count": 10, "until": None, "registers": []}
+
+
+def feedback(payload):
+    return decode_line(json.dumps({"feedback": payload}))
+
+
+def registers(rip: int):
+    return feedback({"Registers": {"rip": rip}})
+
+
+def send_next(process: CoreMinerProcess) -> str:
+    return command_keyword(process._take_next_command())
+
+
+def answer(process: CoreMinerProcess, *items) -> None:
+    for item in items:
+        process.queue_feedback.put(item)
+    process.get_response()
+
+
+def new_process() -> CoreMinerProcess:
+    return CoreMinerProcess(DataStore(), transport=TRANSPORT_THREAD)
+
+
+def output(process: CoreMinerProcess) -> str:
+    return process.data_store.get_output_buffer().text()
+
+
+def test_cancel_stops_a_step_batch():
+    process = new_process()
+    process._handle_repeat([STEP, 100])
+    assert send_next(process) == "StepSingle"
+    process._handle_cancel({"flush": False})
+    answer(process, feedback("Ok"))
+    assert not process.step_batch.running
+    assert process.step_batch.done == 1
+    assert "1/100 steps" in output(process)
+
+
+def test_cancel_stops_a_trace():
+    process = new_process()
+    process._handle_trace(TRACE)
+    assert send_next(process) == "DumpRegisters"
+    answer(process, registers(0x1000))
+    assert send_next(process) == "StepSingle"
+    process._handle_cancel({"flush": False})
+    answer(process, feedback("Ok"))
+    assert not process.trace_recorder.running
+    assert len(process.trace_recorder) == 1
+
+
+def test_flush_finishes_the_trace_waiting_for_a_dropped_command():
+    process = new_process()
+    process._handle_trace(TRACE)
+    send_next(process)
+    answer(process, registers(0x1000))
+    # The StepSingle is still queued
+    process._handle_cancel({"flush": True})
+    assert not process.trace_recorder.running
+    assert "Traced 1 instructions" in output(process)
+
+    process._handle_trace(TRACE)
+    assert process.trace_recorder.running
+    assert "already being recorded" not in output(process)
+
+
+def test_flush_finishes_a_step_batch():
+    process = new_process()
+    process._handle_repeat([STEP, 100])
+    process._handle_cancel({"flush": True})
+    assert not process.step_batch.running
+    assert "0/100 steps" in output(process)
+
+
+def test_flush_finishes_a_memory_read():
+    process = new_process()
+    done = []
+    MemoryRead(process, 0x7000, 0x20, done.append, window=4).run()
+    assert send_next(process) == "ReadMem"
+    process._handle_cancel({"flush": True})
+    assert len(done) == 1
+    assert done[0].error_address == 0x7008
+    # The answer of the read in flight is ignored
+    answer(process, feedback({"Word": 1}))
+    assert len(done) == 1
+
+
+def test_flush_reports_a_breakpoint_batch():
+    process = new_process()
+    added = []
+    BreakpointBatch(process, "SetBreakpoint", [0x1000, 0x2000, 0x3000], "Set", added.append).start()
+    assert send_next(process) == "SetBreakpoint"
+    answer(process, feedback("Ok"))
+    process._handle_cancel({"flush": True})
+    assert added == [0x1000]
+    assert "Set 1 of 3 breakpoints" in output(process)
+    assert "2 failed" in output(process)
@@ -0,0 +1,76 @@
+import json
+
+from command_scheduler import CommandScheduler, command_keyword
+
+REGISTERS = json.dumps({"status": "DumpRegisters"})
+STACK = json.dumps({"status": "GetStack"})
+CONTINUE = json.dumps({"status": "Continue"})
+READ_MEM = json.dumps({"status": {"ReadMem": 0x401000}})
+
+
+def test_command_keyword():
+    assert command_keyword(CONTINUE) == "Continue"
+    assert command_keyword(READ_MEM) == "ReadMem"
+    assert command_keyword(json.dumps({"status": {}})) == ""
+
+
+def test_user_commands_before_refreshes():
+    scheduler = CommandScheduler()
+    scheduler.put_refresh(REGISTERS)
+    scheduler.put_user(READ_MEM)
+    assert scheduler.get().command_json == READ_MEM
+    scheduled = scheduler.get()
+    assert scheduled.command_json == REGISTERS and scheduled.refresh
+    assert scheduler.get() is None
+    assert scheduler.empty()
+
+
+def test_identical_refreshes_are_merged():
+    scheduler = CommandScheduler()
+    scheduler.put_refresh(REGISTERS)
+    scheduler.put_refresh(STACK)
+    scheduler.put_refresh(REGISTERS)
+    assert len(scheduler) == 2
+    assert scheduler.merged_refreshes == 1
+    scheduler.get()
+    # Once sent, the same refresh may be queued again
+    scheduler.put_refresh(REGISTERS)
+    assert len(scheduler) == 2
+
+
+def test_state_changing_command_drops_refreshes():
+    scheduler = CommandScheduler()
+    scheduler.put_refresh(REGISTERS)
+    scheduler.put_refresh(STACK)
+    scheduler.put_user(CONTINUE, state_changing=True)
+    assert len(scheduler) == 1
+    assert scheduler.dropped_refreshes == 2
+    scheduler.put_refresh(REGISTERS)
+    assert len(scheduler) == 2
+
+
+def test_read_only_get_keeps_order():
+    scheduler = CommandScheduler()
+    scheduler.put_user(READ_MEM)
+    scheduler.put_user(CONTINUE, state_changing=True)
+    first = scheduler.get(read_only=True)
+    assert first.read_only and first.keyword == "ReadMem"
+    assert scheduler.get(read_only=True) is None
+    assert not scheduler.get().read_only
+
+
+def test_stop_generation_is_recorded():
+    scheduler = CommandScheduler()
+    scheduler.stop_generation = 4
+    scheduler.put_user(READ_MEM)
+    assert scheduler.get().stop_generation == 4
+
+
+def test_clear():
+    scheduler = CommandScheduler()
+    scheduler.put_user(READ_MEM)
+    scheduler.put_refresh(REGISTERS)
+    scheduler.clear()
+    assert scheduler.empty()
+    scheduler.put_refresh(REGISTERS)
+    assert len(scheduler) == 1
@@ -0,0 +1,56 @@
+import json
+
+from feedback_decoder import (BacktraceFeedback, ErrorFeedback, OkFeedback, RegistersFeedback, StackFeedback,
+                              UnknownFeedback, WordFeedback, decode_feedback, decode_line)
+
+
+def line(feedback) -> str:
+    return json.dumps({"feedback": feedback})
+
+
+def test_ok():
+    assert isinstance(decode_line(line("Ok")), OkFeedback)
+
+
+def test_error():
+    feedback = decode_line(line({"Error": {"error_type": "Io", "message": "unreadable"}}))
+    assert isinstance(feedback, ErrorFeedback)
+    assert feedback.error["message"] == "unreadable"
+
+
+def test_registers_keep_their_order():
+    feedback = decode_line(line({"Registers": {"rip": 0x401000, "rax": 5}}))
+    assert isinstance(feedback, RegistersFeedback)
+    assert list(feedback.registers.items()) == [("rip", 0x401000), ("rax", 5)]
+
+
+def test_stack():
+    feedback = decode_line(line({"Stack": {"start_addr": 0x7000, "words": [1, 2]}}))
+    assert isinstance(feedback, StackFeedback)
+    assert (feedback.start_addr, feedback.words) == (0x7000, [1, 2])
+
+
+def test_word_and_raw_line():
+    raw = line({"Word": 42})
+    feedback = decode_line(raw)
+    assert isinstance(feedback, WordFeedback)
+    assert feedback.word == 42
+    assert feedback.raw == raw
+
+
+def test_backtrace():
+    feedback = decode_feedback({"feedback": {"Backtrace": {"frames": []}}})
+    assert isinstance(feedback, BacktraceFeedback)
+    assert feedback.frames == []
+
+
+def test_unknown_and_malformed_feedback():
+    unknown = decode_line(line({"Teleport": 1}))
+    assert isinstance(unknown, UnknownFeedback)
+    assert isinstance(decode_line(line({"Stack": {"words": []}})), UnknownFeedback)
+
+
+def test_debuggee_output_is_no_feedback():
+    assert decode_line("hello") is None
+    assert decode_line("{not json") is None
+    assert decode_line(json.dumps({"other": 1})) is None
@@ -0,0 +1,51 @@
+from memory_cache import PAGE_SIZE, WORD_SIZE, MemoryCache
+
+
+def test_missing_words_are_aligned():
+    cache = MemoryCache()
+    assert cache.missing_words(0x1004, 0x1010) == [0x1000, 0x1008]
+    cache.store_word(0x1000, 1)
+    assert cache.missing_words(0x1000, 0x1018) == [0x1008, 0x1010]
+
+
+def test_read_is_little_endian():
+    cache = MemoryCache()
+    cache.store_word(0x1000, 0x0807060504030201)
+    assert cache.read(0x1000, 8) == bytes(range(1, 9))
+    assert cache.read(0x1002, 4) == bytes((3, 4, 5, 6))
+
+
+def test_read_stops_at_first_missing_word():
+    cache = MemoryCache()
+    cache.store_word(0x1000, 0)
+    cache.store_word(0x1010, 0)
+    assert len(cache.read(0x1000, 0x18)) == WORD_SIZE
+    assert cache.read(0x2000, 8) == b""
+
+
+def test_read_across_pages():
+    cache = MemoryCache()
+    start = PAGE_SIZE - WORD_SIZE
+    cache.store_word(start, -1)
+    cache.store_word(PAGE_SIZE, 0)
+    assert cache.read(start, 2 * WORD_SIZE) == b"\xff" * WORD_SIZE + b"\x00" * WORD_SIZE
+
+
+def test_sync_drops_pages_of_previous_stop():
+    cache = MemoryCache()
+    cache.sync(1)
+    cache.store_word(0x1000, 1)
+    cache.sync(1)
+    assert len(cache) == 1
+    cache.sync(2)
+    assert len(cache) == 0
+    assert cache.generation == 2
+
+
+def test_oldest_page_is_evicted():
+    cache = MemoryCache(max_pages=2)
+    for page in range(3):
+        cache.store_word(page * PAGE_SIZE, page)
+    assert len(cache) == 2
+    assert cache.missing_words(0, WORD_SIZE) == [0]
+    assert cache.missing_words(2 * PAGE_SIZE, 2 * PAGE_SIZE + WORD_SIZE) == []
@@ -0,0 +1,83 @@
+import json
+
+from command_scheduler import command_keyword
+from coreminer_interface import TRANSPORT_THREAD, CoreMinerProcess
+from data_store import DataStore
+from feedback_decoder import decode_line
+from memory_cache import MemoryRead
+
+WINDOW = 4
+STACK = json.dumps({"status": "GetStack"})
+
+
+def word(value: int):
+    return decode_line(json.dumps({"feedback": {"Word": value}}))
+
+
+def error():
+    return decode_line(json.dumps({"feedback": {"Error": {"error_type": "Io", "message": "unreadable"}}}))
+
+
+def send_all(process: CoreMinerProcess) -> list[str]:
+    # What the writer thread does: send every command that may be in flight now
+    sent = []
+    command = process._take_next_command()
+    while command is not None:
+        sent.append(command_keyword(command))
+        command = process._take_next_command()
+    return sent
+
+
+def answer(process: CoreMinerProcess, *feedback) -> None:
+    for item in feedback:
+        process.queue_feedback.put(item)
+    process.get_response()
+
+
+def test_read_only_commands_share_the_window():
+    process = CoreMinerProcess(DataStore(), transport=TRANSPORT_THREAD, pipeline_window=WINDOW)
+    done = []
+    MemoryRead(process, 0x7000, 0x30, done.append, window=8).run()
+    assert send_all(process) == ["ReadMem"] * WINDOW
+    answer(process, *(word(address) for address in range(WINDOW)))
+    assert send_all(process) == ["ReadMem"] * 2
+    answer(process, word(4), word(5))
+    assert len(done) == 1
+    assert done[0].error_address is None
+    assert len(done[0].data) == 0x30
+
+
+def test_failed_read_ignores_answers_in_flight():
+    process = CoreMinerProcess(DataStore(), transport=TRANSPORT_THREAD, pipeline_window=WINDOW)
+    done = []
+    MemoryRead(process, 0x7000, 0x40, done.append, window=8).run()
+    assert send_all(process) == ["ReadMem"] * WINDOW
+
+    answer(process, word(1), error())
+    assert len(done) == 1
+    assert done[0].error_address == 0x7008
+    assert len(done[0].data) == 8
+    # The failure dropped the ReadMem commands that were not sent yet
+    assert process.command_scheduler.empty()
+
+    # A command queued after the failure survives the answers of the commands still in flight
+    process.command_scheduler.put_user(STACK)
+    answer(process, error(), word(4))
+    assert len(done) == 1
+    assert not process.in_flight
+    assert send_all(process) == ["GetStack"]
+
+
+def test_later_failure_clears_the_queue_again():
+    process = CoreMinerProcess(DataStore(), transport=TRANSPORT_THREAD, pipeline_window=WINDOW)
+    MemoryRead(process, 0x7000, 0x10, lambda read: None).run()
+    send_all(process)
+    answer(process, error(), error())
+    assert not process.in_flight
+
+    process.command_scheduler.put_user(STACK)
+    process.command_scheduler.put_user(STACK)
+    send_all(process)
+    process.command_scheduler.put_user(STACK)
+    answer(process, error())
+    assert process.command_scheduler.empty()
@@ -0,0 +1,62 @@
+import pytest
+
+from ring_buffer import RingBuffer
+
+
+def test_append_splits_lines():
+    buffer = RingBuffer()
+    buffer.append("a\nb")
+    buffer.append("c")
+    assert len(buffer) == 3
+    assert buffer.text() == "a\nb\nc"
+    assert buffer.end_index == 3
+
+
+def test_line_cap_evicts_oldest():
+    buffer = RingBuffer(max_lines=3)
+    for line in "abcde":
+        buffer.append(line)
+    assert buffer.first_index == 2
+    assert buffer.end_index == 5
+    assert buffer.get(1) is None
+    assert buffer.get(2) == "c"
+    assert buffer.slice(0, 10) == ["c", "d", "e"]
+    assert buffer.tail(2) == ["d", "e"]
+
+
+def test_byte_cap_keeps_newest_line():
+    buffer = RingBuffer(max_bytes=9)
+    buffer.append("abc")
+    buffer.append("defg")
+    assert buffer.text() == "abc\ndefg"
+    buffer.append("0123456789")
+    assert buffer.text() == "0123456789"
+    assert buffer.size == 11
+
+
+def test_clear_keeps_counting():
+    buffer = RingBuffer()
+    buffer.append("a\nb")
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.first_index == buffer.end_index == 2
+    buffer.append("c")
+    assert buffer.get(2) == "c"
+
+
+def test_invalid_line_cap():
+    with pytest.raises(ValueError):
+        RingBuffer(max_lines=0)
+
+
+def test_evicted_lines_are_spilled(tmp_path):
+    path = tmp_path / "spill.txt"
+    buffer = RingBuffer(max_lines=2, spill_path=str(path))
+    for line in "abcd":
+        buffer.append(line)
+    buffer.flush()
+    assert path.read_text() == "a\nb\n"
+    buffer.close()
+    buffer.append("e")
+    buffer.close()
+    assert path.read_text() == "a\nb\nc\n"
@@ -0,0 +1,44 @@
+from coreminer_interface import TRANSPORT_THREAD, CoreMinerProcess
+from data_store import DataStore
+from rip_follower import FOLLOW_RIP_COMMAND
+
+REGISTERS = {"status": "DumpRegisters"}
+
+
+def queued_keywords(process: CoreMinerProcess) -> list[str]:
+    keywords = []
+    scheduled = process.command_scheduler.get()
+    while scheduled is not None:
+        keywords.append(scheduled.keyword)
+        scheduled = process.command_scheduler.get()
+    return keywords
+
+
+def stop_at(process: CoreMinerProcess, rip: int, reload_commands: list[dict]) -> list[str]:
+    # A stop reloads the visible widgets, then the registers arrive
+    process.reload_provider = lambda: reload_commands
+    process.reload_basic_info()
+    process.registers_generation = process.stop_generation
+    process.data_store.set_rip(rip)
+    process.rip_follower.check()
+    return queued_keywords(process)
+
+
+def test_follows_rip_while_the_disassembly_is_visible():
+    process = CoreMinerProcess(DataStore(), transport=TRANSPORT_THREAD)
+    assert stop_at(process, 0x401000, [REGISTERS, FOLLOW_RIP_COMMAND]) == ["DumpRegisters", "DisassembleAt"]
+
+
+def test_no_prefetch_without_a_visible_disassembly():
+    process = CoreMinerProcess(DataStore(), transport=TRANSPORT_THREAD)
+    assert stop_at(process, 0x401000, [REGISTERS]) == ["DumpRegisters"]
+
+    # Showing the disassembly follows the RIP of the current stop without reloading the registers again
+    process.reload_stale([FOLLOW_RIP_COMMAND])
+    assert queued_keywords(process) == ["DisassembleAt"]
+
+
+def test_follow_false_overrides_a_visible_disassembly():
+    process = CoreMinerProcess(DataStore(), transport=TRANSPORT_THREAD)
+    process._handle_follow(False)
+    assert stop_at(process, 0x401000, [REGISTERS, FOLLOW_RIP_COMMAND]) == ["DumpRegisters"]
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from command_scheduler import command_keyword
+from coreminer_interface import TRANSPORT_THREAD, CoreMinerProcess
+from data_store import DataStore
+from feedback_decoder import decode_line
+from snapshot_log import SnapshotLog
+
+
+def record_stops(log: SnapshotLog, count: int) -> None:
+    for stop in range(count):
+        log.record(stop, {"rip": 0x1000 + stop, "rax": stop // 2}, 0x7000 - 8 * stop, [stop, 1, 2],
+                   f"frame {stop // 3}")
+
+
+def test_states_are_decoded_from_deltas():
+    log = SnapshotLog(keyframe_interval=4)
+    record_stops(log, 10)
+    assert len(log) == 10
+    for index in range(10):
+        state = log.state(index)
+        assert state.stop == index
+        assert state.registers == {"rip": 0x1000 + index, "rax": index // 2}
+        assert (state.stack_start, state.stack_words) == (0x7000 - 8 * index, [index, 1, 2])
+        assert state.backtrace == f"frame {index // 3}"
+
+
+def test_same_stop_replaces_snapshot():
+    log = SnapshotLog()
+    record_stops(log, 3)
+    log.record(2, {"rip": 0x2000, "rax": 9}, 0x7000, [], "")
+    assert len(log) == 3
+    assert log.state(2).registers == {"rip": 0x2000, "rax": 9}
+    assert log.state(1).registers == {"rip": 0x1001, "rax": 0}
+
+
+def test_capacity_drops_oldest():
+    log = SnapshotLog(capacity=4, keyframe_interval=8)
+    record_stops(log, 7)
+    assert len(log) == 4
+    assert log.stop(0) == 3
+    assert log.state(0).registers == {"rip": 0x1003, "rax": 1}
+    assert log.index_of_stop(2) is None
+    assert log.index_of_stop(5) == 2
+
+
+def test_new_register_layout_clears_log():
+    log = SnapshotLog()
+    record_stops(log, 3)
+    log.record(3, {"eip": 1}, 0, [], "")
+    assert len(log) == 1
+
+
+def test_invalid_index():
+    log = SnapshotLog()
+    with pytest.raises(IndexError):
+        log.state(0)
+
+
+def test_browsing_records_only_live_state():
+    data_store = DataStore()
+    for stop in (1, 2):
+        data_store.set_registers({"rip": 0x10 * stop})
+        data_store.record_snapshot(stop)
+    rip_generation = data_store.get_generation("rip")
+    data_store.restore_snapshot(0)
+    assert data_store.snapshot_stop == 1
+    assert data_store.get_rip() == 0x10
+    # A restored RIP is not followed in the disassembly
+    assert data_store.get_generation("rip") == rip_generation
+    data_store.record_snapshot(3)
+    assert len(data_store.get_snapshots()) == 2
+    data_store.return_to_live()
+    assert data_store.snapshot_stop is None
+    assert data_store.get_register_values() == {"rip": 0x20}
+
+
+def test_resolving_a_register_while_browsing_returns_to_live():
+    data_store = DataStore()
+    process = CoreMinerProcess(data_store, transport=TRANSPORT_THREAD)
+    for stop in (1, 2):
+        data_store.set_registers({"rip": 0x10 * stop, "rsp": 0x7000 - 0x10 * stop})
+        data_store.record_snapshot(stop)
+    process.stop_generation = process.command_scheduler.stop_generation = process.registers_generation = 2
+    data_store.restore_snapshot(0)
+
+    process.parse_command("rmem $rsp")
+    assert command_keyword(process._take_next_command()) == "DumpRegisters"
+    process.queue_feedback.put(decode_line(json.dumps({"feedback": {"Registers": {"rip": 0x20, "rsp": 0x6fe0}}})))
+    process.get_response()
+
+    assert data_store.snapshot_stop is None
+    assert json.loads(process._take_next_command()) == {"status": {"ReadMem": 0x6fe0}}
+
+
+def test_recording_a_stop_again_keeps_the_keyframe_interval():
+    log = SnapshotLog(keyframe_interval=4)
+    for stop in range(20):
+        # Registers, stack and backtrace each record the same stop
+        for backtrace in ("", "main", f"main {stop}"):
+            log.record(stop, {"rip": 0x1000 + stop}, 0x7000, [stop], backtrace)
+    assert [snapshot.keyframe for snapshot in log._snapshots] == [stop % 5 == 0 for stop in range(20)]
+    assert log.state(18) == (18, {"rip": 0x1000 + 18}, 0x7000, [18], "main 18")
+
+
+def test_changed_registers_follow_the_shown_stop():
+    data_store = DataStore()
+    for stop, rax in ((1, 5), (2, 5), (3, 7)):
+        data_store.set_registers({"rip": 0x10 * stop, "rax": rax})
+        data_store.record_snapshot(stop)
+    assert data_store.get_snapshots().changed(0) == [False, False]
+    assert data_store.get_changed_registers() == {"rip", "rax"}
+    data_store.restore_snapshot(1)
+    assert data_store.get_changed_registers() == {"rip"}
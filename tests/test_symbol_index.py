@@ -0,0 +1,72 @@
+import re
+
+from feedback_decoder import Frame, Symbol
+from symbol_index import OPEN_SYMBOL_SIZE, SymbolIndex
+
+
+def test_lookup_inside_range():
+    index = SymbolIndex()
+    index.add("main", 0x1000, 0x1040)
+    assert index.lookup(0x1010) == ("main", 0x10)
+    assert index.lookup(0x1040) is None
+    assert index.lookup(0xfff) is None
+    assert index.describe(0x1000) == "main"
+    assert index.describe(0x1010) == "main+0x10"
+    assert index.describe(0x2000) == ""
+
+
+def test_open_symbol_reaches_at_most_open_size():
+    index = SymbolIndex()
+    index.add_frames([Frame({"name": "f", "start_addr": 0x1000})])
+    assert index.lookup(0x1000 + OPEN_SYMBOL_SIZE - 1) == ("f", OPEN_SYMBOL_SIZE - 1)
+    assert index.lookup(0x1000 + OPEN_SYMBOL_SIZE) is None
+
+
+def test_nested_symbols():
+    index = SymbolIndex()
+    index.add_symbols([Symbol({"name": "outer", "low_addr": 0x1000, "high_addr": 0x1100,
+                               "children": [{"name": "inner", "low_addr": 0x2000, "high_addr": 0x2010}]})])
+    assert index.address_of("outer") == 0x1000
+    assert index.address_of("inner") == 0x2000
+
+
+def test_same_address_replaces_symbol():
+    index = SymbolIndex()
+    index.add("old", 0x1000, 0x1040)
+    index.add("new", 0x1000)
+    assert len(index) == 1
+    assert index.address_of("old") is None
+    # The known range is kept for a symbol without one
+    assert index.lookup(0x1030) == ("new", 0x30)
+
+
+def test_moved_name_drops_previous_entry():
+    index = SymbolIndex()
+    index.add("f", 0x1000, 0x1020)
+    index.add("f", 0x2000, 0x2020)
+    index.add("g", 0x1000, 0x1020)
+    assert len(index) == 2
+    assert index.address_of("f") == 0x2000
+    assert index.address_of("g") == 0x1000
+    assert index.describe(0x2010) == "f+0x10"
+    assert index.describe(0x1010) == "g+0x10"
+
+
+def test_generation_only_changes_with_the_index():
+    index = SymbolIndex()
+    index.add("main", 0x1000, 0x1040)
+    generation = index.generation
+    index.add("main", 0x1000, 0x1040)
+    assert index.generation == generation
+    index.clear()
+    assert index.generation == generation + 1
+    assert len(index) == 0
+
+
+def test_matching_and_complete():
+    index = SymbolIndex()
+    for name, start in (("main", 0x1000), ("malloc", 0x3000), ("free", 0x2000)):
+        index.add(name, start, start + 0x10)
+    assert index.matching(re.compile("ma")) == [("main", 0x1000), ("malloc", 0x3000)]
+    assert index.complete("ma") == ["main", "malloc"]
+    assert index.complete("x") == []